@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+BM25 Engine Benchmark
+Compares langchain's BM25Retriever with the in-house NumPy BM25 engine on a
+synthetic Zipf-distributed corpus (build time and per-query latency).
+
+Note: the legacy retriever scores every chunk in Python; at 1M chunks its build
+and queries take minutes. Use --legacy-max to cap the sizes it runs on.
+"""
+
+import sys
+import os
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+import argparse
+import statistics
+import time
+from typing import List
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.services.sparse.bm25_engine import BM25Index, BM25SparseRetriever
+
+
+def make_corpus(n_chunks: int, *, vocab_size: int, words_per_chunk: int, seed: int):
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f"w{i}" for i in range(vocab_size)])
+    ranks = rng.zipf(1.2, size=n_chunks * words_per_chunk) % vocab_size
+    words = vocab[ranks].reshape(n_chunks, words_per_chunk)
+    return [" ".join(row) for row in words]
+
+
+def make_queries(n_queries: int, *, vocab_size: int, seed: int) -> List[str]:
+    rng = np.random.default_rng(seed + 1)
+    return [
+        " ".join(f"w{int(x)}" for x in rng.integers(0, vocab_size // 10, size=4))
+        for _ in range(n_queries)
+    ]
+
+
+def time_queries(retriever, queries: List[str]) -> float:
+    latencies = []
+    for q in queries:
+        start = time.perf_counter()
+        retriever.invoke(q)
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--vocab-size", type=int, default=50_000)
+    parser.add_argument("--words-per-chunk", type=int, default=60)
+    parser.add_argument("--legacy-max", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print("=== BM25: langchain BM25Retriever vs NumPy engine ===")
+    for n in args.sizes:
+        texts = make_corpus(
+            n,
+            vocab_size=args.vocab_size,
+            words_per_chunk=args.words_per_chunk,
+            seed=args.seed,
+        )
+        queries = make_queries(args.queries, vocab_size=args.vocab_size, seed=args.seed)
+        print(f"\n--- {n} chunks ---")
+
+        start = time.perf_counter()
+        index = BM25Index.from_texts(texts)
+        engine_build = time.perf_counter() - start
+        engine_query = time_queries(BM25SparseRetriever(index=index, k=args.k), queries)
+        print(f"engine : build {engine_build:8.2f}s  p50 query {engine_query * 1000:9.2f}ms")
+
+        if n > args.legacy_max:
+            print("legacy : skipped (--legacy-max)")
+            continue
+
+        from langchain_community.retrievers import BM25Retriever
+
+        docs = [Document(page_content=t) for t in texts]
+        start = time.perf_counter()
+        legacy = BM25Retriever.from_documents(docs, k=args.k)
+        legacy_build = time.perf_counter() - start
+        legacy_query = time_queries(legacy, queries)
+        print(f"legacy : build {legacy_build:8.2f}s  p50 query {legacy_query * 1000:9.2f}ms")
+        if engine_query > 0:
+            print(f"speedup: {legacy_query / engine_query:.1f}x per query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Checkpoint Throughput Benchmark
+Measures AsyncPostgresSaver throughput with N concurrent threads, each doing
+put + get_tuple cycles on its own thread_id (what a chat step does), for:
+
+- single : AsyncPostgresSaver.from_conn_string (one shared connection, the
+           previous runtime setup)
+- pool   : PooledAsyncPostgresSaver on the runtime's AsyncConnectionPool
+
+Requires a reachable Postgres (AWS_DB_URL or --db-url). Benchmark threads use
+a "bench-" prefix and are deleted afterwards.
+"""
+
+import sys
+import os
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+
+from src.db.checkpointer import (
+    PooledAsyncPostgresSaver,
+    checkpointer_pool_stats,
+    create_checkpointer_pool,
+)
+from src.db.url import get_libpq_url
+
+
+def make_checkpoint(step: int, messages: int):
+    checkpoint = empty_checkpoint()
+    history = []
+    for i in range(messages):
+        history.append(HumanMessage(content=f"question {i} " * 10))
+        history.append(AIMessage(content=f"answer {i} " * 40))
+    checkpoint["channel_values"] = {"messages": history}
+    checkpoint["channel_versions"] = {"messages": step}
+    return checkpoint
+
+
+async def run_worker(saver, thread_id: str, cycles: int, messages: int, latencies):
+    config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    for step in range(cycles):
+        start = time.perf_counter()
+        config = await saver.aput(
+            config, make_checkpoint(step + 1, messages), {"step": step}, {}
+        )
+        await saver.aget_tuple(config)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def measure(saver, concurrency: int, cycles: int, messages: int, prefix: str):
+    latencies = []
+    threads = [f"{prefix}-{concurrency}-{i}" for i in range(concurrency)]
+    start = time.perf_counter()
+    await asyncio.gather(
+        *[run_worker(saver, t, cycles, messages, latencies) for t in threads]
+    )
+    elapsed = time.perf_counter() - start
+    for thread_id in threads:
+        await saver.adelete_thread(thread_id)
+    latencies.sort()
+    return {
+        "ops_per_s": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+    }
+
+
+def report(name: str, concurrency: int, result: dict, extra: str = ""):
+    print(
+        f"{name:<6} threads={concurrency:<3} "
+        f"{result['ops_per_s']:8.1f} cycles/s  "
+        f"p50 {result['p50_ms']:7.2f}ms  p95 {result['p95_ms']:7.2f}ms{extra}"
+    )
+
+
+async def main_async(args):
+    conninfo = args.db_url or get_libpq_url()
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+
+    print("=== Checkpoint throughput: single connection vs pool ===")
+    print(f"cycles/thread={args.cycles}  messages/checkpoint={args.messages * 2}\n")
+
+    async with AsyncPostgresSaver.from_conn_string(conninfo) as saver:
+        await saver.setup()
+        for concurrency in args.concurrency:
+            result = await measure(saver, concurrency, args.cycles, args.messages, prefix)
+            report("single", concurrency, result)
+
+    pool = await create_checkpointer_pool(
+        conninfo, min_size=args.pool_min, max_size=args.pool_max
+    )
+    try:
+        saver = PooledAsyncPostgresSaver(conn=pool)
+        print()
+        for concurrency in args.concurrency:
+            result = await measure(saver, concurrency, args.cycles, args.messages, prefix)
+            stats = checkpointer_pool_stats(pool)
+            report(
+                "pool",
+                concurrency,
+                result,
+                f"  size={stats.get('pool_size')} "
+                f"waited={stats.get('requests_waiting', 0)}",
+            )
+    finally:
+        await pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db-url", default=None, help="libpq URL (default: AWS_DB_URL)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument(
+        "--messages", type=int, default=10, help="conversation turns per checkpoint"
+    )
+    parser.add_argument("--pool-min", type=int, default=2)
+    parser.add_argument("--pool-max", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Graph Durability Benchmark
+Runs a RAG-shaped turn through the graph topology with stub nodes, comparing:
+
+- separate : tools -> extract_context -> source_router -> generate_answer
+- fused    : tools -> post_tools -> generate_answer
+
+under each checkpoint durability mode (sync / async / exit). Reports checkpoint
+writes (aput) and pending-write calls (aput_writes) per turn, plus latency per
+turn. A counting MemorySaver adds --write-latency-ms to every write to stand in
+for a Postgres round trip.
+"""
+
+import sys
+import os
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, StateGraph
+
+from src.graph.nodes.extract_context import extract_context
+from src.graph.nodes.post_tools import post_tools
+from src.graph.routing.source_router import source_router
+from src.graph.state import CustomMessagesState
+
+
+class CountingSaver(MemorySaver):
+    def __init__(self, write_latency_s: float):
+        super().__init__()
+        self.write_latency_s = write_latency_s
+        self.n_puts = 0
+        self.n_put_writes = 0
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        self.n_puts += 1
+        await asyncio.sleep(self.write_latency_s)
+        return await super().aput(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        self.n_put_writes += 1
+        await asyncio.sleep(self.write_latency_s)
+        return await super().aput_writes(config, writes, task_id, task_path)
+
+
+async def topic_guardrail(state):
+    return {"blocked_by_guardrail": False}
+
+
+async def generate_answer_or_rag(state):
+    last = state["messages"][-1]
+    return {
+        "messages": [
+            AIMessage(
+                content="",
+                tool_calls=[
+                    {"name": "retrieve_rag_docs", "args": {"query": last.content}, "id": "t1"}
+                ],
+            )
+        ]
+    }
+
+
+async def tools(state):
+    return {
+        "messages": [
+            ToolMessage(
+                content="retrieved context " * 100,
+                tool_call_id="t1",
+                name="retrieve_rag_docs",
+            )
+        ]
+    }
+
+
+async def generate_answer(state):
+    return {"messages": [AIMessage(content="answer")]}
+
+
+def build(fused: bool, saver):
+    graph = StateGraph(CustomMessagesState)
+    graph.add_node("topic_guardrail", topic_guardrail)
+    graph.add_node("generate_answer_or_rag", generate_answer_or_rag)
+    graph.add_node("tools", tools)
+    graph.add_node("generate_answer", generate_answer)
+    graph.add_edge(START, "topic_guardrail")
+    graph.add_edge("topic_guardrail", "generate_answer_or_rag")
+    graph.add_edge("generate_answer_or_rag", "tools")
+    if fused:
+        graph.add_node("post_tools", post_tools)
+        graph.add_edge("tools", "post_tools")
+        graph.add_edge("post_tools", "generate_answer")
+    else:
+        graph.add_node("extract_context", extract_context)
+        graph.add_node("source_router", source_router)
+        graph.add_edge("tools", "extract_context")
+        graph.add_edge("extract_context", "source_router")
+        graph.add_edge("source_router", "generate_answer")
+    graph.add_edge("generate_answer", END)
+    return graph.compile(checkpointer=saver)
+
+
+async def measure(fused: bool, durability: str, turns: int, write_latency_s: float):
+    saver = CountingSaver(write_latency_s)
+    app = build(fused, saver)
+    config = {"configurable": {"thread_id": f"bench-{fused}-{durability}"}}
+    latencies = []
+    for i in range(turns):
+        start = time.perf_counter()
+        async for _ in app.astream(
+            {"messages": [HumanMessage(content=f"question {i}")]},
+            config=config,
+            durability=durability,
+        ):
+            pass
+        latencies.append((time.perf_counter() - start) * 1000)
+    return {
+        "puts": saver.n_puts / turns,
+        "put_writes": saver.n_put_writes / turns,
+        "p50_ms": statistics.median(latencies),
+    }
+
+
+async def main_async(args):
+    print("=== Checkpoint writes and latency per turn ===")
+    print(f"turns={args.turns}  write latency={args.write_latency_ms}ms\n")
+    print(f"{'graph':<9} {'durability':<10} {'aput':>6} {'aput_writes':>12} {'p50':>10}")
+    for durability in ("sync", "async", "exit"):
+        for fused in (False, True):
+            r = await measure(fused, durability, args.turns, args.write_latency_ms / 1000)
+            print(
+                f"{'fused' if fused else 'separate':<9} {durability:<10} "
+                f"{r['puts']:6.1f} {r['put_writes']:12.1f} {r['p50_ms']:8.2f}ms"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--write-latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
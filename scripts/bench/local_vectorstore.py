@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Local Vector Store Benchmark
+Compares LangChain's InMemoryVectorStore with the NumPy LocalVectorIndex on
+random embeddings (query latency, single and batched), per storage dtype.
+Embeddings are precomputed so only the search itself is measured.
+"""
+
+import sys
+import os
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from src.services.vectorstores.local_service import DTYPES, LocalVectorIndex
+
+
+class _PrecomputedEmbeddings(Embeddings):
+    def __init__(self, vectors):
+        self._vectors = iter(vectors.tolist())
+
+    def embed_documents(self, texts):
+        return [next(self._vectors) for _ in texts]
+
+    def embed_query(self, text):
+        raise NotImplementedError
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--legacy-max", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print("=== Dense search: InMemoryVectorStore vs LocalVectorIndex ===")
+    for n in args.sizes:
+        vectors = rng.standard_normal((n, args.dim), dtype=np.float32)
+        queries = rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+        ids = [str(i) for i in range(n)]
+        print(f"\n--- {n} vectors x {args.dim} dims ---")
+
+        for dtype in DTYPES:
+            index = LocalVectorIndex(dtype=dtype)
+            index.upsert(ids, vectors, [""] * n, [{}] * n)
+            latencies = []
+            for q in queries:
+                start = time.perf_counter()
+                index.search(q, args.k)
+                latencies.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            index.search(queries, args.k)
+            batched = (time.perf_counter() - start) / len(queries)
+            print(
+                f"local[{dtype:7}]: p50 {statistics.median(latencies) * 1000:8.2f}ms"
+                f"  batched {batched * 1000:8.2f}ms/query"
+            )
+
+        if n > args.legacy_max:
+            print("in-memory      : skipped (--legacy-max)")
+            continue
+
+        from langchain_core.vectorstores import InMemoryVectorStore
+
+        store = InMemoryVectorStore(_PrecomputedEmbeddings(vectors))
+        store.add_documents([Document(page_content="") for _ in range(n)])
+        latencies = []
+        for q in queries:
+            start = time.perf_counter()
+            store.similarity_search_by_vector(q.tolist(), k=args.k)
+            latencies.append(time.perf_counter() - start)
+        print(f"in-memory      : p50 {statistics.median(latencies) * 1000:8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
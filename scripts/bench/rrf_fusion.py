@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+RRF Fusion Microbenchmark
+Compares the legacy quadratic RRF against the single-pass, chunk-aware fusion
+at 10/100/1000 candidates per run. No network access required.
+"""
+
+import sys
+import os
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+import argparse
+import random
+import timeit
+from typing import List
+
+from langchain_core.documents import Document
+
+from src.graph.retrievers.fusion import weighted_rrf
+
+
+def legacy_rrf(
+    dense_docs: List[Document], sparse_docs: List[Document], k: int = 60
+) -> List[Document]:
+    """Previous implementation, kept here for comparison only."""
+    scores = {}
+    runs = [dense_docs, sparse_docs]
+    for run in runs:
+        for rank, doc in enumerate(run):
+            doc_id = doc.metadata.get("id") or doc.metadata.get("doc_id") or id(doc)
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+    ordered_docs: List[Document] = []
+    seen = set()
+    for doc_id, _ in sorted(scores.items(), key=lambda x: x[1], reverse=True):
+        for run in runs:
+            for doc in run:
+                if (
+                    doc.metadata.get("id") or doc.metadata.get("doc_id") or id(doc)
+                ) == doc_id and doc_id not in seen:
+                    ordered_docs.append(doc)
+                    seen.add(doc_id)
+                    break
+            if doc_id in seen:
+                break
+    return ordered_docs
+
+
+def make_runs(n: int, overlap: float, seed: int = 0):
+    """Build two runs of n chunks each; `overlap` share the same chunk identity.
+
+    Each candidate gets a distinct (doc_id, etag, chunk_number), so the legacy
+    doc_id keying is exercised with per-chunk identities (its best case).
+    """
+    rng = random.Random(seed)
+
+    def chunk(i: int) -> Document:
+        return Document(
+            page_content=f"chunk {i}",
+            metadata={"doc_id": f"doc-{i}", "etag": "e", "chunk_number": i},
+        )
+
+    dense = [chunk(i) for i in range(n)]
+    shared = int(n * overlap)
+    sparse = [chunk(i) for i in rng.sample(range(n), shared)]
+    sparse += [chunk(n + i) for i in range(n - shared)]
+    rng.shuffle(sparse)
+    return dense, sparse
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--overlap", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print("=== RRF fusion cost per call ===")
+    print(f"{'candidates/run':>15} {'legacy (ms)':>12} {'single-pass (ms)':>17} {'speedup':>8}")
+    for n in args.sizes:
+        dense, sparse = make_runs(n, args.overlap)
+        number = max(1, 2000 // n)
+        legacy = (
+            min(
+                timeit.repeat(
+                    lambda: legacy_rrf(dense, sparse),
+                    number=number,
+                    repeat=args.repeat,
+                )
+            )
+            / number
+        )
+        fused = (
+            min(
+                timeit.repeat(
+                    lambda: weighted_rrf([dense, sparse]),
+                    number=number,
+                    repeat=args.repeat,
+                )
+            )
+            / number
+        )
+        speedup = legacy / fused if fused > 0 else 0.0
+        print(
+            f"{n:>15} {legacy * 1000:>12.3f} {fused * 1000:>17.3f} {speedup:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Speculative Routing Benchmark
+Simulates chat turns where a topic guardrail check (--guardrail-ms) precedes a
+routing model call (--llm-ms), with --block-rate of messages blocked. Compares
+running them one after the other with ``speculate`` (both started together,
+the model call cancelled when blocked), and reports per-turn latency, latency
+saved, and wasted model calls.
+"""
+
+import sys
+import os
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from src.graph.speculation import SpeculationMetrics, speculate
+
+
+async def run(args, speculative: bool):
+    rng = random.Random(args.seed)
+    metrics = SpeculationMetrics()
+    latencies = []
+    model_calls = 0
+
+    for _ in range(args.turns):
+        blocked = rng.random() < args.block_rate
+
+        async def guardrail():
+            await asyncio.sleep(args.guardrail_ms / 1000)
+            return blocked
+
+        async def route():
+            nonlocal model_calls
+            model_calls += 1
+            await asyncio.sleep(args.llm_ms / 1000)
+            return "answer"
+
+        started = time.perf_counter()
+        if speculative:
+            await speculate(guardrail, route, lambda b: not b, metrics=metrics)
+        elif not await guardrail():
+            await route()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    return latencies, model_calls, metrics.snapshot()
+
+
+async def main_async(args):
+    print("=== Speculative routing ===")
+    print(
+        f"turns={args.turns}  guardrail={args.guardrail_ms}ms  llm={args.llm_ms}ms  "
+        f"block rate={args.block_rate:.0%}\n"
+    )
+    for speculative in (False, True):
+        latencies, calls, snapshot = await run(args, speculative)
+        label = "speculative" if speculative else "sequential"
+        print(
+            f"{label:<12} p50 {statistics.median(latencies):8.2f}ms  "
+            f"mean {statistics.mean(latencies):8.2f}ms  model calls started {calls}"
+        )
+        if speculative:
+            print(
+                f"{'':<12} saved/turn {snapshot['latency_saved_ms_avg']}ms  "
+                f"wasted calls {snapshot['wasted_calls']} "
+                f"({snapshot['wasted_calls_cancelled']} cancelled in flight)"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--guardrail-ms", type=float, default=40.0)
+    parser.add_argument("--llm-ms", type=float, default=400.0)
+    parser.add_argument("--block-rate", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tool Node Output Benchmark
+Compares returning the full message history from the tool node (legacy)
+with returning only the new ToolMessages, on threads with hundreds of
+messages: add_messages reducer time and serialized size of the node update
+(what the checkpointer writes for the step).
+"""
+
+import sys
+import os
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+import argparse
+import statistics
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.graph.message import add_messages
+
+
+def make_history(n_turns: int):
+    messages = []
+    for i in range(n_turns):
+        messages.append(HumanMessage(content=f"question {i} " * 20, id=f"h{i}"))
+        messages.append(AIMessage(content=f"answer {i} " * 60, id=f"a{i}"))
+    messages.append(
+        AIMessage(
+            content="",
+            id="call",
+            tool_calls=[{"name": "retrieve_rag_docs", "args": {"query": "q"}, "id": "t1"}],
+        )
+    )
+    return messages
+
+
+def median_ms(fn, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, nargs="+", default=[50, 250, 500])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    serde = JsonPlusSerializer()
+    print("=== Tool node update: full history vs delta ===")
+    for turns in args.turns:
+        history = make_history(turns)
+        tool_msg = ToolMessage(
+            content="retrieved context " * 50, tool_call_id="t1", name="retrieve_rag_docs"
+        )
+        full_update = history + [tool_msg]
+        delta_update = [tool_msg]
+
+        full_ms = median_ms(lambda: add_messages(history, full_update), args.repeats)
+        delta_ms = median_ms(lambda: add_messages(history, delta_update), args.repeats)
+        full_bytes = len(serde.dumps_typed({"messages": full_update})[1])
+        delta_bytes = len(serde.dumps_typed({"messages": delta_update})[1])
+
+        print(f"\n--- {len(history)} messages ---")
+        print(f"full : reducer {full_ms:8.3f}ms  update {full_bytes / 1024:9.1f} KiB")
+        print(f"delta: reducer {delta_ms:8.3f}ms  update {delta_bytes / 1024:9.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,16 @@ from fastapi import APIRouter, Request, HTTPException, status
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-import json
+from src.app.features.chat.metrics import get_chat_metrics
+from src.app.features.chat.streaming import stream_graph_events
+from src.app.features.chat.thread_locks import get_thread_lock_registry
+from src.graph.runtime import get_checkpoint_durability, get_checkpoint_pool_stats
+from src.db.checkpoint_retention import get_retention_metrics
+from src.graph.guardrails.topic_restriction import get_guardrail_stats
+from src.graph.speculation import get_speculation_metrics
+from src.graph.retrievers.batch_voyage_compressor import get_rerank_cache
+from src.graph.retrievers.provider import retrieval_cache
+from src.services.vectorstores.backend import get_embedding_cache_stats
 
 
 class ChatMessage(BaseModel):
@@ -76,7 +85,11 @@ async def stream_chat(request: Request, body: ChatRequest):
 
     Notes:
     - This endpoint streams events with media type `text/event-stream`.
+    - Answer tokens arrive as `event: token`, finished nodes as compact
+      `event: node` summaries, between `event: start` and `event: end`.
     - The server uses the provided `session_id` to maintain conversation state.
+    - If the client disconnects, the graph run is cancelled.
+    - Concurrent requests for the same `session_id` are run one at a time.
     - Only the latest message may be forwarded to the runtime when appropriate.
     """
     if (
@@ -92,15 +105,21 @@ async def stream_chat(request: Request, body: ChatRequest):
     }
     config = {"configurable": {"thread_id": body.session_id}}
 
+    graph_app = request.app.state.graph_app
+
     async def event_generator():
         # Initial comment to establish SSE
         yield "event: start\n\n"
-        async for chunk in request.app.state.graph_app.astream(payload, config=config):
-            try:
-                data = json.dumps(chunk, default=str)
-            except Exception:
-                data = str(chunk)
-            yield f"data: {data}\n\n"
+        async for frame in stream_graph_events(
+            graph_app,
+            payload,
+            config,
+            request.is_disconnected,
+            # One run per session at a time; later requests queue behind it
+            lock=get_thread_lock_registry().hold(body.session_id),
+            durability=get_checkpoint_durability(),
+        ):
+            yield frame
         # Explicit end event
         yield "event: end\n\n"
 
@@ -112,3 +131,28 @@ async def stream_chat(request: Request, body: ChatRequest):
             "Connection": "keep-alive",
         },
     )
+
+
+@router.get(
+    "/chat/metrics",
+    summary="Chat run counters",
+    tags=["chat"],
+)
+async def chat_metrics():
+    """Returns counters for chat runs, including runs cancelled by client disconnects,
+    an estimate of the answer tokens those cancellations saved, per-session
+    queueing (depth and wait time), retrieval/rerank/embedding cache hit rates,
+    checkpointer pool utilization, checkpoint retention (rows deleted, table
+    sizes), topic guardrail tiers and batching, and speculative routing (latency
+    saved, wasted model calls)."""
+    return {
+        **get_chat_metrics().snapshot(),
+        "thread_locks": get_thread_lock_registry().stats(),
+        "retrieval_cache": retrieval_cache.stats(),
+        "rerank_cache": get_rerank_cache().stats(),
+        "embedding_cache": get_embedding_cache_stats(),
+        "checkpoint_pool": get_checkpoint_pool_stats(),
+        "checkpoint_retention": get_retention_metrics().snapshot(),
+        "guardrail": get_guardrail_stats(),
+        "speculation": get_speculation_metrics().snapshot(),
+    }
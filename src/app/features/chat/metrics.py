@@ -0,0 +1,83 @@
+"""
+Process-wide counters for /chat runs.
+
+A run is cancelled when its SSE client disconnects before the graph finishes.
+The tokens saved by cancelling are estimated from the average number of answer
+tokens streamed by completed runs, minus what the cancelled run had already
+streamed. OpenAI streams roughly one token per chunk, so token frames are
+counted as tokens.
+"""
+
+from __future__ import annotations
+
+import threading
+
+
+class ChatRunMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = 0
+            self.completed = 0
+            self.failed = 0
+            self.cancelled = 0
+            self.cancelled_before_first_token = 0
+            self.completed_tokens = 0
+            self.estimated_tokens_saved = 0
+
+    def record_started(self) -> None:
+        with self._lock:
+            self.started += 1
+
+    def record_completed(self, tokens: int) -> None:
+        with self._lock:
+            self.completed += 1
+            self.completed_tokens += tokens
+
+    def record_failed(self) -> None:
+        with self._lock:
+            self.failed += 1
+
+    def record_cancelled(self, tokens: int) -> int:
+        """Record a cancelled run that had streamed ``tokens``; returns the estimate saved."""
+        with self._lock:
+            self.cancelled += 1
+            if tokens == 0:
+                self.cancelled_before_first_token += 1
+            average = self.completed_tokens / self.completed if self.completed else 0.0
+            saved = max(int(round(average)) - tokens, 0)
+            self.estimated_tokens_saved += saved
+            return saved
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "runs_started": self.started,
+                "runs_completed": self.completed,
+                "runs_failed": self.failed,
+                "runs_cancelled": self.cancelled,
+                "runs_cancelled_before_first_token": self.cancelled_before_first_token,
+                "in_flight": self.started
+                - self.completed
+                - self.failed
+                - self.cancelled,
+                "avg_answer_tokens": (
+                    round(self.completed_tokens / self.completed, 1)
+                    if self.completed
+                    else 0.0
+                ),
+                "estimated_tokens_saved": self.estimated_tokens_saved,
+            }
+
+
+_chat_metrics = ChatRunMetrics()
+
+
+def get_chat_metrics() -> ChatRunMetrics:
+    return _chat_metrics
+
+
+__all__ = ["ChatRunMetrics", "get_chat_metrics"]
@@ -0,0 +1,240 @@
+"""
+Server-Sent Events encoding for the chat endpoint.
+
+The graph is streamed with ``stream_mode=["messages", "updates", "custom"]``:
+
+- ``messages`` parts carry LLM tokens. Only text from the answering nodes is
+  forwarded, as ``event: token`` with ``{"node", "text"}``.
+- ``updates`` parts become one compact ``event: node`` per finished node. The
+  payload lists the message types, tool calls, tool statuses and scalar state
+  fields it wrote, never message bodies or tool outputs.
+- ``custom`` parts (``get_stream_writer()`` in a node) are forwarded as-is as
+  ``event: progress``.
+
+``CHAT_STREAM_MODE=updates`` restores the previous behaviour of dumping each
+node's state update as a ``data:`` line.
+
+The graph runs in its own task, so a client that disconnects while no frames
+are flowing (retrieval, reranking, tool calls) is still noticed within
+``CHAT_DISCONNECT_POLL_SECONDS``. The task is then cancelled, which cancels the
+running nodes and their in-flight async HTTP calls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import os
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterator,
+    Optional,
+)
+
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+
+from src.app.features.chat.metrics import ChatRunMetrics, get_chat_metrics
+from src.env import float_env
+
+try:  # orjson is several times faster; fall back to the stdlib when missing
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+STREAM_MODES = ["messages", "updates", "custom"]
+
+# Nodes whose model output is the user-facing answer
+ANSWER_NODES = frozenset(
+    {"generate_answer", "generate_answer_or_rag", "speculative_routing", "guardrail_response"}
+)
+
+
+def get_chat_stream_mode() -> str:
+    mode = os.getenv("CHAT_STREAM_MODE", "tokens").strip().lower()
+    return mode if mode in ("tokens", "updates") else "tokens"
+
+
+def get_disconnect_poll_seconds() -> float:
+    return max(float_env("CHAT_DISCONNECT_POLL_SECONDS", 0.5), 0.05)
+
+
+def dumps(obj: Any) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=str).decode("utf-8")
+        except TypeError:
+            # e.g. non-string dict keys or integers beyond 64 bits
+            pass
+    return json.dumps(obj, default=str, separators=(",", ":"), ensure_ascii=False)
+
+
+def sse(data: Any, event: Optional[str] = None) -> str:
+    payload = data if isinstance(data, str) else dumps(data)
+    head = f"event: {event}\n" if event else ""
+    return f"{head}data: {payload}\n\n"
+
+
+def _text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        # Content blocks: keep text parts only
+        return "".join(
+            part if isinstance(part, str) else part.get("text", "")
+            for part in content
+            if isinstance(part, str) or (isinstance(part, dict) and part.get("type") == "text")
+        )
+    return ""
+
+
+def _summarize_message(message: Any) -> dict:
+    if not isinstance(message, BaseMessage):
+        return {"type": type(message).__name__}
+    summary: dict = {"type": message.type}
+    if isinstance(message, AIMessage) and message.tool_calls:
+        summary["tool_calls"] = [call.get("name") for call in message.tool_calls]
+    if isinstance(message, ToolMessage):
+        summary["name"] = message.name
+        summary["status"] = message.status
+    return summary
+
+
+def summarize_update(node: str, update: Any) -> dict:
+    """Compact description of one node's state update."""
+    summary: dict = {"node": node}
+    if not isinstance(update, dict):
+        return summary
+    for key, value in update.items():
+        if key == "messages":
+            messages = value if isinstance(value, list) else [value]
+            summary["messages"] = [_summarize_message(m) for m in messages]
+        elif value is None or isinstance(value, (bool, int, float, str)):
+            summary[key] = value
+        elif isinstance(value, (list, tuple)):
+            summary[key] = {"count": len(value)}
+    return summary
+
+
+def encode_part(mode: str, chunk: Any) -> Iterator[str]:
+    """Yield the SSE frames for one ``(mode, chunk)`` part of ``astream``."""
+    if mode == "messages":
+        message, metadata = chunk
+        node = (metadata or {}).get("langgraph_node")
+        if node not in ANSWER_NODES or not isinstance(message, AIMessage):
+            return
+        text = _text(message.content)
+        if text:
+            yield sse({"node": node, "text": text}, event="token")
+    elif mode == "updates":
+        if not isinstance(chunk, dict):
+            return
+        for node, update in chunk.items():
+            yield sse(summarize_update(node, update), event="node")
+    elif mode == "custom":
+        yield sse(chunk, event="progress")
+
+
+async def _iter_frames(
+    graph_app, payload: dict, config: dict, durability: Optional[str]
+) -> AsyncIterator[str]:
+    if get_chat_stream_mode() == "updates":
+        async for chunk in graph_app.astream(
+            payload, config=config, durability=durability
+        ):
+            yield sse(chunk)
+    else:
+        async for mode, chunk in graph_app.astream(
+            payload, config=config, stream_mode=STREAM_MODES, durability=durability
+        ):
+            for frame in encode_part(mode, chunk):
+                yield frame
+
+
+_DONE = object()
+
+
+async def stream_graph_events(
+    graph_app,
+    payload: dict,
+    config: dict,
+    is_disconnected: Callable[[], Awaitable[bool]],
+    *,
+    poll_seconds: Optional[float] = None,
+    metrics: Optional[ChatRunMetrics] = None,
+    lock: Optional[AsyncContextManager] = None,
+    durability: Optional[str] = None,
+) -> AsyncIterator[str]:
+    """Yield SSE frames for one graph run, cancelling it if the client goes away.
+
+    ``lock`` is held around the whole run (see ``thread_locks``); a run that is
+    cancelled while queued behind it never starts. ``durability`` is passed to
+    ``astream`` (``None`` keeps LangGraph's default).
+    """
+    metrics = metrics or get_chat_metrics()
+    poll = poll_seconds if poll_seconds is not None else get_disconnect_poll_seconds()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def produce():
+        try:
+            async with lock or contextlib.nullcontext():
+                async for frame in _iter_frames(graph_app, payload, config, durability):
+                    await queue.put(frame)
+        except Exception as e:
+            await queue.put(e)
+        await queue.put(_DONE)
+
+    metrics.record_started()
+    producer = asyncio.create_task(produce())
+    tokens = 0
+    finished = False
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), poll)
+            except asyncio.TimeoutError:
+                if await is_disconnected():
+                    return
+                continue
+            if item is _DONE:
+                finished = True
+                metrics.record_completed(tokens)
+                return
+            if isinstance(item, Exception):
+                finished = True
+                metrics.record_failed()
+                print(f"Chat stream failed: {item}")
+                yield sse({"type": type(item).__name__, "detail": str(item)}, event="error")
+                return
+            if item.startswith("event: token"):
+                tokens += 1
+            yield item
+    finally:
+        # Disconnect noticed by polling, or the server cancelled/closed this generator
+        if not finished:
+            producer.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await producer
+            saved = metrics.record_cancelled(tokens)
+            print(
+                f"Chat run cancelled: client disconnected after {tokens} tokens "
+                f"(~{saved} tokens saved)"
+            )
+
+
+__all__ = [
+    "ANSWER_NODES",
+    "STREAM_MODES",
+    "dumps",
+    "encode_part",
+    "get_chat_stream_mode",
+    "get_disconnect_poll_seconds",
+    "sse",
+    "stream_graph_events",
+    "summarize_update",
+]
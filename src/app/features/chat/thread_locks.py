@@ -0,0 +1,176 @@
+"""
+Per-thread serialization of chat runs.
+
+Two runs on the same ``thread_id`` (the chat ``session_id``) would read the same
+checkpoint and write conflicting successors. The registry below queues them so
+that only one graph run per thread is active at a time, while runs on different
+threads proceed concurrently.
+
+Modes (``CHAT_THREAD_LOCK_MODE``):
+
+- ``local`` (default): an ``asyncio.Lock`` per thread, created on demand and
+  dropped once nobody holds or waits for it. Enough for a single worker process.
+- ``advisory``: the local lock plus a Postgres session-level advisory lock keyed
+  on the thread id, for deployments with several workers sharing the database.
+  The local lock is taken first, so each worker holds at most one advisory-lock
+  connection per thread.
+- ``off``: no serialization.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+
+def get_thread_lock_mode() -> str:
+    mode = os.getenv("CHAT_THREAD_LOCK_MODE", "local").strip().lower()
+    return mode if mode in ("local", "advisory", "off") else "local"
+
+
+def advisory_key(thread_id: str) -> int:
+    """Signed 64-bit advisory-lock key for a thread id."""
+    digest = hashlib.blake2b(
+        f"chat-thread:{thread_id}".encode("utf-8"), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+@asynccontextmanager
+async def postgres_advisory_lock(thread_id: str) -> AsyncIterator[None]:
+    import psycopg
+
+    from src.db.url import get_libpq_url
+
+    key = advisory_key(thread_id)
+    # Session-level lock: closing the connection releases it even if unlock fails
+    async with await psycopg.AsyncConnection.connect(
+        get_libpq_url(), autocommit=True
+    ) as conn:
+        await conn.execute("SELECT pg_advisory_lock(%s)", (key,))
+        try:
+            yield
+        finally:
+            try:
+                await conn.execute("SELECT pg_advisory_unlock(%s)", (key,))
+            except Exception:
+                pass
+
+
+class _Entry:
+    __slots__ = ("lock", "users")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+
+class ThreadLockRegistry:
+    def __init__(self, mode: str = "local", advisory_lock=postgres_advisory_lock):
+        self.mode = mode
+        self._advisory_lock = advisory_lock
+        self._entries: Dict[str, _Entry] = {}
+        self.acquisitions = 0
+        self.contended = 0
+        self.waiting = 0
+        self.max_queue_depth = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.advisory_failures = 0
+
+    def queue_depth(self, thread_id: str) -> int:
+        """Runs holding or waiting for ``thread_id``."""
+        entry = self._entries.get(thread_id)
+        return entry.users if entry else 0
+
+    def _record_wait(self, wait_ms: float, contended: bool) -> None:
+        self.acquisitions += 1
+        self.contended += int(contended)
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+    @asynccontextmanager
+    async def hold(self, thread_id: str) -> AsyncIterator[None]:
+        if self.mode == "off":
+            yield
+            return
+        entry = self._entries.get(thread_id)
+        if entry is None:
+            entry = self._entries[thread_id] = _Entry()
+        entry.users += 1
+        self.max_queue_depth = max(self.max_queue_depth, entry.users)
+        contended = entry.users > 1
+        started = time.perf_counter()
+        self.waiting += 1
+        acquired = False
+        try:
+            async with entry.lock:
+                acquired = True
+                self.waiting -= 1
+                if self.mode == "advisory":
+                    async with self._hold_advisory(thread_id, started, contended):
+                        yield
+                else:
+                    self._record_wait((time.perf_counter() - started) * 1000, contended)
+                    yield
+        finally:
+            if not acquired:
+                # Cancelled while queued
+                self.waiting -= 1
+            entry.users -= 1
+            if entry.users == 0:
+                self._entries.pop(thread_id, None)
+
+    @asynccontextmanager
+    async def _hold_advisory(
+        self, thread_id: str, started: float, contended: bool
+    ) -> AsyncIterator[None]:
+        async with AsyncExitStack() as stack:
+            try:
+                await stack.enter_async_context(self._advisory_lock(thread_id))
+            except Exception as e:
+                # Serialize within this worker at least; never fail the chat request
+                self.advisory_failures += 1
+                print(f"Warning: advisory lock for thread {thread_id} unavailable: {e}")
+            self._record_wait((time.perf_counter() - started) * 1000, contended)
+            yield
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "active_threads": len(self._entries),
+            "waiting": self.waiting,
+            "max_queue_depth": self.max_queue_depth,
+            "acquisitions": self.acquisitions,
+            "contended": self.contended,
+            "avg_wait_ms": (
+                round(self.total_wait_ms / self.acquisitions, 2)
+                if self.acquisitions
+                else 0.0
+            ),
+            "max_wait_ms": round(self.max_wait_ms, 2),
+            "advisory_failures": self.advisory_failures,
+        }
+
+
+_thread_locks: Optional[ThreadLockRegistry] = None
+
+
+def get_thread_lock_registry() -> ThreadLockRegistry:
+    global _thread_locks
+    if _thread_locks is None:
+        _thread_locks = ThreadLockRegistry(mode=get_thread_lock_mode())
+    return _thread_locks
+
+
+__all__ = [
+    "ThreadLockRegistry",
+    "advisory_key",
+    "get_thread_lock_mode",
+    "get_thread_lock_registry",
+    "postgres_advisory_lock",
+]
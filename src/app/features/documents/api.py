@@ -12,6 +12,7 @@ from typing import Optional
 import asyncio
 from src.settings import settings
 from src.services.vectorstores.pinecone_service import get_pinecone_service
+from src.services.vectorstores.backend import get_vector_store_service
 from src.app.features.documents.schemas import (
     Document,
     DeleteResult,
@@ -96,9 +97,7 @@ async def list_documents_sync():
     """
     statuses = []
     for key, etag, count_doc, count_both in await svc_list_sync_statuses():
-        from src.services.vectorstores.pinecone_service import get_pinecone_service
-
-        status = get_pinecone_service().get_sync_status(key, etag)
+        status = get_vector_store_service().get_sync_status(key, etag)
         statuses.append(
             SyncStatus(
                 key=key,
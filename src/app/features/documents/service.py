@@ -13,7 +13,9 @@ from src.services.s3_service import (
 from src.settings import settings
 from .schemas import Document, DeleteResult
 from src.graph.ingestion.splitter import split_text
-from src.services.vectorstores.pinecone_service import get_pinecone_service
+from src.services.vectorstores.backend import get_vector_store_service
+from src.services.sparse.bm25_service import peek_bm25_service
+from src.services.corpus_version import bump_corpus_version
 
 
 def document_from_head(key: str, include_url: bool = False) -> Document:
@@ -35,22 +37,71 @@ def document_from_head(key: str, include_url: bool = False) -> Document:
     )
 
 
-def _ingest_key_into_pinecone(key: str, etag: str) -> None:
+def _split_s3_object(key: str, etag: str) -> list:
     raw_bytes = get_object_bytes_from_s3(settings.AWS_S3_RAG_DOCUMENTS_BUCKET, key)
     try:
         text = raw_bytes.decode("utf-8")
     except UnicodeDecodeError:
         text = raw_bytes.decode("utf-8", errors="ignore")
     if not text.strip():
+        return []
+    return split_text(text=text, doc_id=key, etag=etag)
+
+
+def _ingest_key_into_pinecone(key: str, etag: str) -> None:
+    # One split: Pinecone and BM25 index the same chunk Documents
+    docs = _split_s3_object(key, etag)
+    if not docs:
         return
-    docs = split_text(text=text, doc_id=key, etag=etag)
-    service = get_pinecone_service()
-    service.upsert_documents(docs)
+    service = get_vector_store_service()
+    try:
+        service.upsert_documents(docs, ids=[d.metadata["chunk_id"] for d in docs])
+        _upsert_key_into_bm25(key, etag, docs)
+    finally:
+        # Invalidate cached retrieval results even after a partial failure
+        bump_corpus_version()
 
 
 def _delete_key_from_pinecone(key: str) -> None:
-    service = get_pinecone_service()
-    service.delete_by_doc_id(key)
+    service = get_vector_store_service()
+    try:
+        service.delete_by_doc_id(key)
+    finally:
+        # BM25 must stop serving the object even if the vector delete failed
+        try:
+            _delete_key_from_bm25(key)
+        finally:
+            bump_corpus_version()
+
+
+def _upsert_key_into_bm25(key: str, etag: str, docs: list) -> None:
+    # Best-effort: only patch an index that is already loaded; a fresh process
+    # validates the persisted index against the S3 manifest on startup anyway
+    bm25 = peek_bm25_service()
+    if bm25 is None:
+        return
+    try:
+        bm25.upsert_document(key, etag, docs)
+    except Exception as exc:
+        print(f"Warning: BM25 update failed for {key}: {exc}")
+
+
+def _reindex_key_into_bm25(key: str, etag: str) -> None:
+    # The vectors are current but BM25 missed this version (e.g. a failed update)
+    try:
+        _upsert_key_into_bm25(key, etag, _split_s3_object(key, etag))
+    finally:
+        bump_corpus_version()
+
+
+def _delete_key_from_bm25(key: str) -> None:
+    bm25 = peek_bm25_service()
+    if bm25 is None:
+        return
+    try:
+        bm25.remove_document(key)
+    except Exception as exc:
+        print(f"Warning: BM25 removal failed for {key}: {exc}")
 
 
 async def list_documents(include_url: bool) -> list[Document]:
@@ -83,7 +134,7 @@ async def get_document_sync_status(key: str) -> tuple[str, int, int, str]:
         head_object_from_s3, settings.AWS_S3_RAG_DOCUMENTS_BUCKET, key
     )
     etag = head.get("ETag", "").strip('"')
-    service = get_pinecone_service()
+    service = get_vector_store_service()
     count_doc, count_both = await asyncio.to_thread(
         service.get_vector_counts, key, etag
     )
@@ -96,7 +147,7 @@ async def list_sync_statuses() -> list[tuple[str, str, int, int]]:
     contents = await asyncio.to_thread(
         get_s3_bucket_contents, settings.AWS_S3_RAG_DOCUMENTS_BUCKET
     )
-    service = get_pinecone_service()
+    service = get_vector_store_service()
     results: list[tuple[str, str, int, int]] = []
     for obj in contents:
         key = obj["Key"]
@@ -206,13 +257,17 @@ async def sync_documents(*, debug: bool = False) -> dict:
     )
     s3_docs = {obj["Key"]: obj.get("ETag", "").strip('"') for obj in s3_contents}
 
-    pinecone_service = get_pinecone_service()
+    pinecone_service = get_vector_store_service()
     (
         pinecone_doc_ids,
         doc_id_to_count,
         doc_id_etag_to_count,
     ) = await asyncio.to_thread(pinecone_service.compute_index_snapshot)
 
+    # Etags held by the loaded BM25 index (None if not loaded or not persisted)
+    bm25 = peek_bm25_service()
+    bm25_etags = bm25.get_indexed_etags() if bm25 is not None else None
+
     if debug:
         debug_logs.append(f"Found {len(s3_docs)} documents in S3.")
         debug_logs.append(f"Found {len(pinecone_doc_ids)} unique doc_ids in Pinecone.")
@@ -246,6 +301,9 @@ async def sync_documents(*, debug: bool = False) -> dict:
                 await asyncio.to_thread(_ingest_key_into_pinecone, key, etag)
                 updated += 1
             elif status == "in_sync":
+                # Unchanged etags are skipped; only patch BM25 if it lags behind
+                if bm25_etags is not None and bm25_etags.get(key) != etag:
+                    await asyncio.to_thread(_reindex_key_into_bm25, key, etag)
                 synced += 1
         except Exception as e:
             error_msg = f"Error processing {key}: {str(e)}"
@@ -268,6 +326,11 @@ async def sync_documents(*, debug: bool = False) -> dict:
             if debug:
                 debug_logs.append(error_msg)
 
+    # Write the local vector store once for the whole sync (no-op for Pinecone)
+    flush = getattr(pinecone_service, "flush", None)
+    if flush is not None:
+        await asyncio.to_thread(flush)
+
     # 4. Final summary
     if debug:
         final_doc_ids, _, _ = await asyncio.to_thread(
@@ -24,6 +24,16 @@ async def list_product_categories(db: AsyncSession) -> List[dict]:
     return [{"category": category, "count": int(count)} for category, count in rows]
 
 
+async def list_catalog_terms(db: AsyncSession) -> List[str]:
+    """Return the distinct names, models, aliases and categories in the catalog."""
+    query = select(Product.name, Product.model, Product.category, Product.aliases)
+    terms = set()
+    for name, model, category, aliases in (await db.execute(query)).all():
+        terms.update(t for t in (name, model, category) if t)
+        terms.update(a for a in (aliases or []) if isinstance(a, str) and a)
+    return sorted(terms)
+
+
 def _product_to_out(product: Product) -> ProductOut:
     return ProductOut(
         id=product.id,
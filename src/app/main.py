@@ -2,35 +2,62 @@
 from dotenv import load_dotenv
 
 load_dotenv(override=True)
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from src.graph.runtime import build_app, cleanup, build_app_async, acleanup
+from src.graph.runtime import (
+    build_app,
+    cleanup,
+    build_app_async,
+    acleanup,
+    get_checkpoint_pool,
+)
+from src.db.checkpoint_retention import get_prune_interval_seconds, retention_loop
+from src.graph.retrievers.batch_voyage_compressor import aclose_voyage_sessions
+from src.graph.retrievers.provider import warmup_retrieval_stack
 
 # Temporarily disable problematic routers
 # from src.app.features.documents.api import router as documents_router
 from src.app.features.products.api import router as products_router
 from src.app.features.documents.api import router as documents_router
 from src.app.core.guardrails_setup import initialize_guardrails
+from src.graph.guardrails.topic_restriction import refresh_catalog_vocabulary
 from src.app.features.chat.api import router as chat_router
 from src.db.automigrate import apply_migrations_safely, ensure_products_table_exists
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await initialize_guardrails()
+    # Guardrails install and retrieval stack (Pinecone, BM25, Voyage) warm up concurrently
+    await asyncio.gather(initialize_guardrails(), warmup_retrieval_stack())
 
     # Apply DB migrations automatically before building the app
     apply_migrations_safely()
     ensure_products_table_exists()
 
+    # Catalog names/models feed the guardrail's lexical fast path
+    await refresh_catalog_vocabulary()
+
     # Prefer async builder (AsyncPostgresSaver) with fallback to sync
     app.state.graph_app = await build_app_async()
+
+    # Prune old checkpoints in the background (Postgres checkpointer only)
+    retention_task = None
+    interval = get_prune_interval_seconds()
+    if get_checkpoint_pool() is not None and interval > 0:
+        retention_task = asyncio.create_task(
+            retention_loop(get_checkpoint_pool(), interval)
+        )
     yield
+    if retention_task is not None:
+        retention_task.cancel()
+        await asyncio.gather(retention_task, return_exceptions=True)
     # Clean up database connection on shutdown
     await acleanup()
     cleanup()
+    await aclose_voyage_sessions()
 
 
 app = FastAPI(lifespan=lifespan)
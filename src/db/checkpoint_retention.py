@@ -0,0 +1,351 @@
+"""
+Retention for the LangGraph Postgres checkpoint tables.
+
+Every superstep writes a checkpoint (plus its channel blobs and pending
+writes), and the saver never deletes any. This module prunes them in two
+passes, each in batches of ``batch_size`` threads with one transaction per
+batch:
+
+1. Idle threads: threads whose newest checkpoint (``checkpoint->>'ts'``) is
+   older than ``idle_ttl_seconds`` are deleted entirely.
+2. Keep last N: for every ``(thread_id, checkpoint_ns)`` with more than
+   ``keep_last`` checkpoints, the older ones are deleted, together with their
+   pending writes and the blobs no remaining checkpoint references.
+
+It runs as a background task in the app (``CHECKPOINT_PRUNE_INTERVAL_SECONDS``)
+or from the command line::
+
+    python -m src.db.checkpoint_retention --keep-last 50 --ttl-days 30 --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from dataclasses import asdict, dataclass, fields
+from typing import List, Optional, Sequence
+
+from src.env import float_env, int_env
+
+
+TABLES = ("checkpoints", "checkpoint_blobs", "checkpoint_writes")
+
+_SELECT_IDLE_THREADS = """
+SELECT thread_id
+FROM checkpoints
+GROUP BY thread_id
+HAVING max((checkpoint->>'ts')::timestamptz) < now() - make_interval(secs => %(ttl)s)
+LIMIT %(limit)s
+"""
+
+_SELECT_OVERFULL_THREADS = """
+SELECT thread_id, checkpoint_ns
+FROM checkpoints
+GROUP BY thread_id, checkpoint_ns
+HAVING count(*) > %(keep)s
+LIMIT %(limit)s
+"""
+
+_DELETE_OLD_CHECKPOINTS = """
+WITH ranked AS (
+    SELECT thread_id, checkpoint_ns, checkpoint_id,
+           row_number() OVER (
+               PARTITION BY thread_id, checkpoint_ns ORDER BY checkpoint_id DESC
+           ) AS rn
+    FROM checkpoints
+    WHERE thread_id = ANY(%(threads)s)
+)
+DELETE FROM checkpoints c
+USING ranked r
+WHERE r.rn > %(keep)s
+  AND c.thread_id = r.thread_id
+  AND c.checkpoint_ns = r.checkpoint_ns
+  AND c.checkpoint_id = r.checkpoint_id
+"""
+
+_DELETE_ORPHAN_WRITES = """
+DELETE FROM checkpoint_writes w
+WHERE w.thread_id = ANY(%(threads)s)
+  AND NOT EXISTS (
+      SELECT 1 FROM checkpoints c
+      WHERE c.thread_id = w.thread_id
+        AND c.checkpoint_ns = w.checkpoint_ns
+        AND c.checkpoint_id = w.checkpoint_id
+  )
+"""
+
+# Blobs are shared across checkpoints through checkpoint->'channel_versions'.
+# The saver writes a step's blobs before its checkpoint row, so only blobs
+# older than the newest referenced version of their channel are orphans;
+# versions are zero-padded, so text order is version order.
+_DELETE_ORPHAN_BLOBS = """
+DELETE FROM checkpoint_blobs b
+WHERE b.thread_id = ANY(%(threads)s)
+  AND NOT EXISTS (
+      SELECT 1 FROM checkpoints c
+      WHERE c.thread_id = b.thread_id
+        AND c.checkpoint_ns = b.checkpoint_ns
+        AND c.checkpoint->'channel_versions'->>b.channel = b.version
+  )
+  AND b.version < (
+      SELECT max(c.checkpoint->'channel_versions'->>b.channel)
+      FROM checkpoints c
+      WHERE c.thread_id = b.thread_id AND c.checkpoint_ns = b.checkpoint_ns
+  )
+"""
+
+
+@dataclass
+class RetentionPolicy:
+    keep_last: int = 50
+    # 0 disables idle-thread deletion
+    idle_ttl_seconds: float = 30 * 86400
+    batch_size: int = 200
+
+    @classmethod
+    def from_env(cls) -> "RetentionPolicy":
+        return cls(
+            keep_last=max(int_env("CHECKPOINT_KEEP_LAST", 50), 1),
+            idle_ttl_seconds=max(float_env("CHECKPOINT_THREAD_TTL_DAYS", 30), 0) * 86400,
+            batch_size=max(int_env("CHECKPOINT_PRUNE_BATCH_SIZE", 200), 1),
+        )
+
+
+@dataclass
+class PruneResult:
+    threads_deleted: int = 0
+    checkpoints_deleted: int = 0
+    writes_deleted: int = 0
+    blobs_deleted: int = 0
+    batches: int = 0
+    duration_ms: float = 0.0
+
+    def add(self, other: "PruneResult") -> None:
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
+    @property
+    def rows_deleted(self) -> int:
+        return self.checkpoints_deleted + self.writes_deleted + self.blobs_deleted
+
+
+async def _execute(conn, query: str, params: dict) -> int:
+    cur = await conn.execute(query, params)
+    return max(cur.rowcount, 0)
+
+
+async def _fetch(conn, query: str, params: dict) -> List[tuple]:
+    cur = await conn.execute(query, params)
+    rows = await cur.fetchall()
+    # Works with tuple rows and the saver's dict rows alike
+    return [tuple(r.values()) if isinstance(r, dict) else tuple(r) for r in rows]
+
+
+async def _delete_threads(conn, thread_ids: Sequence[str]) -> PruneResult:
+    params = {"threads": list(thread_ids)}
+    result = PruneResult(threads_deleted=len(thread_ids), batches=1)
+    result.writes_deleted = await _execute(
+        conn, "DELETE FROM checkpoint_writes WHERE thread_id = ANY(%(threads)s)", params
+    )
+    result.blobs_deleted = await _execute(
+        conn, "DELETE FROM checkpoint_blobs WHERE thread_id = ANY(%(threads)s)", params
+    )
+    result.checkpoints_deleted = await _execute(
+        conn, "DELETE FROM checkpoints WHERE thread_id = ANY(%(threads)s)", params
+    )
+    return result
+
+
+async def _trim_threads(conn, thread_ids: Sequence[str], keep_last: int) -> PruneResult:
+    # Ranking is per (thread_id, checkpoint_ns), so every namespace keeps its last N
+    threads = sorted(set(thread_ids))
+    result = PruneResult(batches=1)
+    result.checkpoints_deleted = await _execute(
+        conn, _DELETE_OLD_CHECKPOINTS, {"threads": threads, "keep": keep_last}
+    )
+    result.writes_deleted = await _execute(conn, _DELETE_ORPHAN_WRITES, {"threads": threads})
+    result.blobs_deleted = await _execute(conn, _DELETE_ORPHAN_BLOBS, {"threads": threads})
+    return result
+
+
+async def _prune(conn, policy: RetentionPolicy, pause_seconds: float) -> PruneResult:
+    total = PruneResult()
+    if policy.idle_ttl_seconds > 0:
+        while True:
+            async with conn.transaction():
+                rows = await _fetch(
+                    conn,
+                    _SELECT_IDLE_THREADS,
+                    {"ttl": policy.idle_ttl_seconds, "limit": policy.batch_size},
+                )
+                if not rows:
+                    break
+                total.add(await _delete_threads(conn, [r[0] for r in rows]))
+            if len(rows) < policy.batch_size:
+                break
+            await asyncio.sleep(pause_seconds)
+
+    while True:
+        async with conn.transaction():
+            rows = await _fetch(
+                conn,
+                _SELECT_OVERFULL_THREADS,
+                {"keep": policy.keep_last, "limit": policy.batch_size},
+            )
+            if not rows:
+                break
+            total.add(await _trim_threads(conn, [r[0] for r in rows], policy.keep_last))
+        if len(rows) < policy.batch_size:
+            break
+        await asyncio.sleep(pause_seconds)
+    return total
+
+
+async def prune_checkpoints(
+    conn,
+    policy: Optional[RetentionPolicy] = None,
+    *,
+    dry_run: bool = False,
+    pause_seconds: float = 0.0,
+) -> PruneResult:
+    """Apply ``policy`` on an autocommit connection and return what was deleted.
+
+    With ``dry_run`` everything runs inside one transaction that is rolled
+    back, so the counts are exact but nothing is deleted.
+    """
+    policy = policy or RetentionPolicy.from_env()
+    started = time.perf_counter()
+    if dry_run:
+        async with conn.transaction(force_rollback=True):
+            result = await _prune(conn, policy, 0.0)
+    else:
+        result = await _prune(conn, policy, pause_seconds)
+    result.duration_ms = (time.perf_counter() - started) * 1000
+    return result
+
+
+async def table_sizes(conn) -> dict:
+    """Total on-disk size (bytes, including indexes and TOAST) of each table."""
+    sizes = {}
+    for table in TABLES:
+        rows = await _fetch(
+            conn, "SELECT pg_total_relation_size(to_regclass(%(t)s))", {"t": table}
+        )
+        sizes[table] = rows[0][0] if rows and rows[0][0] is not None else 0
+    return sizes
+
+
+class RetentionMetrics:
+    def __init__(self):
+        self.runs = 0
+        self.failures = 0
+        self.totals = PruneResult()
+        self.last_result: Optional[PruneResult] = None
+        self.last_run_at: Optional[float] = None
+        self.table_sizes: dict = {}
+
+    def record(self, result: PruneResult, sizes: Optional[dict] = None) -> None:
+        self.runs += 1
+        self.totals.add(result)
+        self.last_result = result
+        self.last_run_at = time.time()
+        if sizes is not None:
+            self.table_sizes = sizes
+
+    def snapshot(self) -> dict:
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_run_at": self.last_run_at,
+            "last_run": asdict(self.last_result) if self.last_result else None,
+            "totals": {**asdict(self.totals), "rows_deleted": self.totals.rows_deleted},
+            "table_sizes_bytes": self.table_sizes,
+        }
+
+
+_retention_metrics = RetentionMetrics()
+
+
+def get_retention_metrics() -> RetentionMetrics:
+    return _retention_metrics
+
+
+async def run_retention_once(pool, policy: Optional[RetentionPolicy] = None) -> PruneResult:
+    """Prune using a connection from ``pool`` and record the outcome."""
+    metrics = get_retention_metrics()
+    try:
+        async with pool.connection() as conn:
+            result = await prune_checkpoints(conn, policy, pause_seconds=0.05)
+            sizes = await table_sizes(conn)
+    except Exception:
+        metrics.failures += 1
+        raise
+    metrics.record(result, sizes)
+    return result
+
+
+async def retention_loop(pool, interval_seconds: float, policy: Optional[RetentionPolicy] = None):
+    """Background task: prune every ``interval_seconds`` until cancelled."""
+    while True:
+        try:
+            result = await run_retention_once(pool, policy)
+            if result.rows_deleted:
+                print(
+                    f"🧹 Checkpoint retention: {result.threads_deleted} idle threads, "
+                    f"{result.rows_deleted} rows deleted in {result.duration_ms:.0f}ms"
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️  Checkpoint retention failed: {e}")
+        await asyncio.sleep(interval_seconds)
+
+
+def get_prune_interval_seconds() -> float:
+    """Seconds between background runs; 0 disables the background task."""
+    return max(float_env("CHECKPOINT_PRUNE_INTERVAL_SECONDS", 3600), 0)
+
+
+async def _main_async(args) -> None:
+    import psycopg
+
+    from src.db.url import get_libpq_url
+
+    defaults = RetentionPolicy.from_env()
+    policy = RetentionPolicy(
+        keep_last=args.keep_last if args.keep_last is not None else defaults.keep_last,
+        idle_ttl_seconds=(
+            args.ttl_days * 86400 if args.ttl_days is not None else defaults.idle_ttl_seconds
+        ),
+        batch_size=args.batch_size if args.batch_size is not None else defaults.batch_size,
+    )
+    async with await psycopg.AsyncConnection.connect(
+        args.db_url or get_libpq_url(), autocommit=True
+    ) as conn:
+        before = await table_sizes(conn)
+        result = await prune_checkpoints(conn, policy, dry_run=args.dry_run)
+        after = await table_sizes(conn)
+
+    label = "Would delete" if args.dry_run else "Deleted"
+    print(
+        f"{label}: {result.threads_deleted} idle threads, "
+        f"{result.checkpoints_deleted} checkpoints, {result.writes_deleted} writes, "
+        f"{result.blobs_deleted} blobs ({result.batches} batches, {result.duration_ms:.0f}ms)"
+    )
+    for table in TABLES:
+        print(f"  {table:<18} {before[table] / 1024**2:9.1f} MiB -> {after[table] / 1024**2:9.1f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prune LangGraph checkpoints.")
+    parser.add_argument("--keep-last", type=int, default=None)
+    parser.add_argument("--ttl-days", type=float, default=None, help="0 keeps idle threads")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--db-url", default=None, help="libpq URL (default: AWS_DB_URL)")
+    parser.add_argument("--dry-run", action="store_true")
+    asyncio.run(_main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,13 @@
 # src/db/checkpointer.py
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+from typing import Optional
+
 from langgraph.checkpoint.postgres import PostgresSaver
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+
+from src.env import bool_env, float_env, int_env
 
 from .url import get_libpq_url
 
@@ -13,3 +19,93 @@ def create_checkpointer_context():
     for the lifetime of the app.
     """
     return PostgresSaver.from_conn_string(get_libpq_url())
+
+
+def get_checkpoint_pool_settings() -> dict:
+    min_size = max(int_env("CHECKPOINT_POOL_MIN_SIZE", 2), 0)
+    max_size = max(int_env("CHECKPOINT_POOL_MAX_SIZE", 20), min_size, 1)
+    return {
+        "min_size": min_size,
+        "max_size": max_size,
+        "timeout": float_env("CHECKPOINT_POOL_TIMEOUT_SECONDS", 10.0),
+        "max_idle": float_env("CHECKPOINT_POOL_MAX_IDLE_SECONDS", 300.0),
+        "check": bool_env("CHECKPOINT_POOL_CHECK", True),
+    }
+
+
+async def create_checkpointer_pool(conninfo: Optional[str] = None, **overrides):
+    """Open an ``AsyncConnectionPool`` suitable for ``AsyncPostgresSaver``.
+
+    Connections use the same settings as ``AsyncPostgresSaver.from_conn_string``
+    (autocommit, no prepared statements, dict rows). With ``check`` enabled, a
+    connection is pinged before it is handed out, so connections dropped by the
+    server or a proxy are replaced instead of failing a checkpoint write.
+    """
+    from psycopg.rows import dict_row
+    from psycopg_pool import AsyncConnectionPool
+
+    options = {**get_checkpoint_pool_settings(), **overrides}
+    pool = AsyncConnectionPool(
+        conninfo or get_libpq_url(),
+        min_size=options["min_size"],
+        max_size=options["max_size"],
+        timeout=options["timeout"],
+        max_idle=options["max_idle"],
+        check=AsyncConnectionPool.check_connection if options["check"] else None,
+        kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+        name="checkpointer",
+        open=False,
+    )
+    try:
+        await pool.open(wait=True, timeout=options["timeout"])
+    except Exception:
+        await pool.close()
+        raise
+    return pool
+
+
+def checkpointer_pool_stats(pool) -> dict:
+    """Point-in-time utilization of a checkpointer pool (without resetting counters)."""
+    stats = dict(pool.get_stats())
+    size = stats.get("pool_size", 0)
+    available = stats.get("pool_available", 0)
+    stats["in_use"] = size - available
+    stats["utilization"] = round((size - available) / pool.max_size, 3)
+    return stats
+
+
+class PooledAsyncPostgresSaver(AsyncPostgresSaver):
+    """``AsyncPostgresSaver`` that lets pooled connections work concurrently.
+
+    The base class guards every cursor with one instance-wide ``asyncio.Lock``,
+    which is needed for a single shared connection but serializes all
+    checkpoint reads and writes even when ``conn`` is a pool. Each pool checkout
+    is exclusive to its coroutine, so the lock is skipped for pools.
+    """
+
+    @asynccontextmanager
+    async def _cursor(self, *, pipeline: bool = False):
+        from psycopg.rows import dict_row
+        from psycopg_pool import AsyncConnectionPool
+
+        if not isinstance(self.conn, AsyncConnectionPool):
+            async with super()._cursor(pipeline=pipeline) as cur:
+                yield cur
+            return
+
+        async with self.conn.connection() as conn:
+            if pipeline and self.supports_pipeline:
+                async with (
+                    conn.pipeline(),
+                    conn.cursor(binary=True, row_factory=dict_row) as cur,
+                ):
+                    yield cur
+            elif pipeline:
+                async with (
+                    conn.transaction(),
+                    conn.cursor(binary=True, row_factory=dict_row) as cur,
+                ):
+                    yield cur
+            else:
+                async with conn.cursor(binary=True, row_factory=dict_row) as cur:
+                    yield cur
@@ -0,0 +1,29 @@
+# src/env.py
+import os
+
+
+def int_env(name: str, default: int) -> int:
+    """Integer from the environment; ``default`` when unset or malformed."""
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def float_env(name: str, default: float) -> float:
+    """Float from the environment; ``default`` when unset or malformed."""
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def bool_env(name: str, default: bool) -> bool:
+    """Flag from the environment: ``1``, ``true`` or ``yes`` (any case) enable it."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes")
+
+
+__all__ = ["bool_env", "float_env", "int_env"]
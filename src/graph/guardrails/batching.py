@@ -0,0 +1,117 @@
+"""
+Micro-batching of guardrail classifications off the event loop.
+
+Callers ``await batcher.classify(text)``. Texts from concurrent requests are
+queued and handed, as one list, to a blocking ``classify_batch(texts)`` that
+runs in a dedicated thread pool. A batch is sent when it reaches
+``max_batch_size`` or when its first text has waited ``max_wait_ms``, whichever
+comes first. The event loop never runs classifier code itself.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence
+
+
+class GuardrailBatcher:
+    def __init__(
+        self,
+        classify_batch: Callable[[Sequence[str]], List[Optional[bool]]],
+        *,
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+        executor: Optional[Executor] = None,
+        workers: int = 1,
+    ):
+        self.classify_batch = classify_batch
+        self.max_batch_size = max(max_batch_size, 1)
+        self.max_wait = max(max_wait_ms, 0.0) / 1000
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=max(workers, 1), thread_name_prefix="guardrail"
+        )
+        self._pending: list = []
+        self._full: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Stats
+        self.batches = 0
+        self.items = 0
+        self.max_batch_seen = 0
+        self.total_queue_ms = 0.0
+        self.max_queue_ms = 0.0
+        self.total_classify_ms = 0.0
+        self.errors = 0
+
+    async def classify(self, text: str) -> Optional[bool]:
+        """True when ``text`` is allowed, None when it could not be classified."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future, time.perf_counter()))
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._full = asyncio.Event()
+            self._worker = loop.create_task(self._drain())
+        elif len(self._pending) >= self.max_batch_size:
+            self._full.set()
+        return await future
+
+    async def _drain(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            if len(self._pending) < self.max_batch_size and self.max_wait > 0:
+                self._full.clear()
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.max_wait)
+                except asyncio.TimeoutError:
+                    pass
+            batch = self._pending[: self.max_batch_size]
+            del self._pending[: self.max_batch_size]
+            # Callers that gave up (e.g. client disconnected) are not classified
+            batch = [item for item in batch if not item[1].done()]
+            if not batch:
+                continue
+
+            started = time.perf_counter()
+            for _, _, enqueued in batch:
+                waited = (started - enqueued) * 1000
+                self.total_queue_ms += waited
+                self.max_queue_ms = max(self.max_queue_ms, waited)
+            self.batches += 1
+            self.items += len(batch)
+            self.max_batch_seen = max(self.max_batch_seen, len(batch))
+
+            try:
+                verdicts = await loop.run_in_executor(
+                    self._executor, self.classify_batch, [text for text, _, _ in batch]
+                )
+            except Exception as e:
+                self.errors += 1
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            finally:
+                self.total_classify_ms += (time.perf_counter() - started) * 1000
+
+            for (_, future, _), verdict in zip(batch, verdicts):
+                if not future.done():
+                    future.set_result(None if verdict is None else bool(verdict))
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "pending": len(self._pending),
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_seen,
+            "avg_queue_ms": round(self.total_queue_ms / self.items, 2) if self.items else 0.0,
+            "max_queue_ms": round(self.max_queue_ms, 2),
+            "avg_classify_ms": (
+                round(self.total_classify_ms / self.batches, 2) if self.batches else 0.0
+            ),
+            "errors": self.errors,
+        }
+
+
+__all__ = ["GuardrailBatcher"]
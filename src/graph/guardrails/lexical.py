@@ -0,0 +1,151 @@
+"""
+Lexical fast path for the topic guardrail.
+
+A message is accepted without running the classifier only when the evidence is
+strong:
+
+- it is a bare greeting, or
+- it is very short (``short_words``) and names a PC-hardware term, or
+- it names at least ``min_hits`` distinct PC-hardware terms.
+
+Terms are specific to the domain (GPU, PSU, motherboard, BIOS, warranty, ...)
+or come from the catalog, where only multi-word names and model numbers are
+used. Everyday words that also name store topics ("order", "return",
+"mouse", "monitor") are not evidence on their own. Messages that try to
+override instructions never take the fast path. The matcher only ever
+accepts: everything else falls through to the cache and classifier tiers.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from typing import Iterable, List, Optional, Pattern, Set
+
+DEFAULT_TERMS: List[str] = [
+    # Components
+    "gpu",
+    "graphics card",
+    "video card",
+    "cpu",
+    "motherboard",
+    "mainboard",
+    "psu",
+    "power supply",
+    "ddr4",
+    "ddr5",
+    "ssd",
+    "hdd",
+    "nvme",
+    "hard drive",
+    "cpu cooler",
+    "thermal paste",
+    "pcie",
+    # Support
+    "bios",
+    "uefi",
+    "gpu driver",
+    "overclock",
+    "hdmi",
+    "displayport",
+    "pc build",
+    "build service",
+    "prebuilt",
+    # Policies
+    "warranty",
+    "rma",
+]
+
+DEFAULT_PATTERNS: List[str] = [
+    # Model numbers: RTX 4070, RX 7800, i7-13700K, Ryzen
+    r"\b(rtx|gtx|rx)\s?\d{3,4}\b",
+    r"\bi[3579]-\d{4,5}[a-z]{0,2}\b",
+    r"\b(ryzen|threadripper)\b",
+]
+
+GREETING_PATTERN = (
+    r"^\s*(hi|hello|hey|good (morning|afternoon|evening)|thanks|thank you)[\s!.,]*$"
+)
+
+# Instruction-override phrasing: always left to the classifier
+OVERRIDE_PATTERN = (
+    r"\b(ignore|disregard|forget)\b.{0,40}\b(instructions?|rules|prompt|above)\b"
+    r"|\bsystem prompt\b|\byou are now\b|\bjailbreak\b|\bpretend\b"
+)
+
+
+def _clean_terms(terms: Iterable[str]) -> List[str]:
+    # Very short terms ("x", "ab") match too much text to count as evidence
+    return sorted(
+        {t.strip().lower() for t in terms if isinstance(t, str) and len(t.strip()) >= 3}
+    )
+
+
+def _specific_catalog_terms(terms: Iterable[str]) -> List[str]:
+    # Single plain words ("Cases", "Mouse") are everyday vocabulary; keep
+    # multi-word names and anything with a digit (model numbers)
+    return [t for t in _clean_terms(terms) if " " in t or any(c.isdigit() for c in t)]
+
+
+def _term_regex(terms: Iterable[str]) -> Optional[Pattern]:
+    cleaned = sorted(_clean_terms(terms), key=len, reverse=True)
+    if not cleaned:
+        return None
+    # Longest first so "graphics card" wins over shorter overlaps; optional plural
+    alternation = "|".join(re.escape(t) for t in cleaned)
+    return re.compile(rf"(?<!\w)(?:{alternation})(?:s|es)?(?!\w)", re.IGNORECASE)
+
+
+class LexicalTopicMatcher:
+    def __init__(
+        self,
+        terms: Iterable[str] = DEFAULT_TERMS,
+        patterns: Iterable[str] = DEFAULT_PATTERNS,
+        *,
+        short_words: int = 6,
+        min_hits: int = 2,
+        max_words: int = 40,
+    ):
+        self._patterns = [re.compile(p, re.IGNORECASE) for p in patterns]
+        self._term_re = _term_regex(terms)
+        self._catalog: Optional[Pattern] = None
+        self._greeting = re.compile(GREETING_PATTERN, re.IGNORECASE)
+        self._override = re.compile(OVERRIDE_PATTERN, re.IGNORECASE | re.DOTALL)
+        self._lock = threading.Lock()
+        self.short_words = short_words
+        self.min_hits = max(min_hits, 1)
+        self.max_words = max_words
+        self.catalog_terms = 0
+
+    def set_catalog_terms(self, terms: Iterable[str]) -> None:
+        """Replace the catalog vocabulary; only multi-word names and model numbers are kept."""
+        terms = _specific_catalog_terms(terms)
+        compiled = _term_regex(terms)
+        with self._lock:
+            self._catalog = compiled
+            self.catalog_terms = len(terms)
+
+    def hits(self, text: str) -> Set[str]:
+        """Distinct domain terms and model numbers found in ``text``."""
+        found: Set[str] = set()
+        for regex in [*self._patterns, self._term_re, self._catalog]:
+            if regex is not None:
+                found.update(m.group(0).strip().lower() for m in regex.finditer(text))
+        return found
+
+    def match(self, text: str) -> Optional[str]:
+        """The evidence that marks ``text`` as clearly on-topic, if any."""
+        if not text or self._override.search(text):
+            return None
+        if self._greeting.match(text):
+            return text.strip()
+        words = len(text.split())
+        if words > self.max_words:
+            return None
+        found = self.hits(text)
+        if len(found) >= self.min_hits or (found and words <= self.short_words):
+            return ", ".join(sorted(found))
+        return None
+
+
+__all__ = ["DEFAULT_PATTERNS", "DEFAULT_TERMS", "LexicalTopicMatcher"]
@@ -1,8 +1,14 @@
-from typing import List
+from typing import List, Optional, Sequence
 from guardrails import Guard
+from guardrails.errors import ValidationError
 from guardrails.hub import RestrictToTopic
 from langchain_core.messages import HumanMessage
 from src.graph.state import CustomMessagesState
+from src.graph.guardrails.batching import GuardrailBatcher
+from src.graph.guardrails.lexical import LexicalTopicMatcher
+from src.graph.guardrails.verdict_cache import GuardrailVerdictCache, guardrail_version
+from src.services.cache.ttl_lru import TTLLRUCache
+from src.env import bool_env, float_env, int_env
 import re
 
 # Configure allowed topics for the assistant
@@ -23,38 +29,137 @@ INVALID_TOPICS: List[str] = [
     "human body",
 ]
 
+MODEL_THRESHOLD = 0.5
+MODEL_NAME = "facebook/bart-large-mnli"
+
 # Initialize a Guard with a topic restriction validator
 # Best practice: use deterministic classification; do not rely on LLM to "fix" user input
 _guard = Guard().use(
     RestrictToTopic(
         valid_topics=ALLOWED_TOPICS,
         disable_classifier=False,
+        model=MODEL_NAME,
         disable_llm=True,
         on_fail="exception",
-        model_threshold=0.5,
+        model_threshold=MODEL_THRESHOLD,
     )
 )
 
 
-def topic_guardrail(state: CustomMessagesState) -> CustomMessagesState:
-    """Validate the latest user message is within allowed topics.
+def _validate_one(text: str) -> Optional[bool]:
+    """The validator's own verdict, or None when the check itself failed."""
+    try:
+        _guard.validate(text)
+        return True
+    except ValidationError:
+        return False
+    except Exception as e:
+        print(f"Warning: topic validation failed: {e}")
+        return None
 
-    - If valid: pass-through and allow the graph to continue.
-    - If invalid: set `blocked_by_guardrail`.
+
+def classify_topics(texts: Sequence[str]) -> List[Optional[bool]]:
+    """Blocking batch classification; runs on the guardrail worker thread.
+
+    Each text goes through the same ``Guard.validate`` check as an unbatched
+    call, so batching only changes where the work runs, never the verdict.
     """
-    if not state.get("messages"):
-        return {}
+    return [_validate_one(text) for text in texts]
+
+
+_batcher: Optional[GuardrailBatcher] = None
+
+
+def get_guardrail_batcher() -> GuardrailBatcher:
+    global _batcher
+    if _batcher is None:
+        _batcher = GuardrailBatcher(
+            classify_topics,
+            max_batch_size=int_env("GUARDRAIL_BATCH_MAX_SIZE", 16),
+            max_wait_ms=float_env("GUARDRAIL_BATCH_MAX_WAIT_MS", 5),
+            workers=int_env("GUARDRAIL_WORKERS", 1),
+        )
+    return _batcher
+
+
+_verdict_cache: Optional[GuardrailVerdictCache] = None
+
+
+def get_guardrail_verdict_cache() -> GuardrailVerdictCache:
+    """Process-wide verdict cache (GUARDRAIL_CACHE_SIZE=0 disables it)."""
+    global _verdict_cache
+    if _verdict_cache is None:
+        ttl = float_env("GUARDRAIL_CACHE_TTL_SECONDS", 3600)
+        _verdict_cache = GuardrailVerdictCache(
+            TTLLRUCache(
+                maxsize=int_env("GUARDRAIL_CACHE_SIZE", 2048),
+                ttl_seconds=ttl if ttl > 0 else None,
+            ),
+            guardrail_version(ALLOWED_TOPICS, INVALID_TOPICS, MODEL_THRESHOLD, MODEL_NAME),
+        )
+    return _verdict_cache
+
+
+def lexical_fast_path_enabled() -> bool:
+    return bool_env("GUARDRAIL_LEXICAL_FAST_PATH", True)
+
+
+_lexical_matcher: Optional[LexicalTopicMatcher] = None
+
+
+def get_lexical_matcher() -> LexicalTopicMatcher:
+    global _lexical_matcher
+    if _lexical_matcher is None:
+        _lexical_matcher = LexicalTopicMatcher(
+            short_words=int_env("GUARDRAIL_LEXICAL_SHORT_WORDS", 6),
+            min_hits=int_env("GUARDRAIL_LEXICAL_MIN_HITS", 2),
+            max_words=int_env("GUARDRAIL_LEXICAL_MAX_WORDS", 40),
+        )
+    return _lexical_matcher
+
 
+async def refresh_catalog_vocabulary() -> int:
+    """Load product names, models, aliases and categories into the lexical tier."""
+    from src.app.features.products.service import list_catalog_terms
+    from src.db.session import get_async_db
+
+    try:
+        async with get_async_db() as db:
+            terms = await list_catalog_terms(db)
+    except Exception as e:
+        print(f"Warning: could not load catalog vocabulary for the guardrail: {e}")
+        return 0
+    get_lexical_matcher().set_catalog_terms(terms)
+    return len(terms)
+
+
+# Which tier decided each request
+_tier_decisions = {"lexical": 0, "cache": 0, "classifier": 0, "error": 0}
+
+
+def get_guardrail_stats() -> dict:
+    decided = sum(_tier_decisions.values())
+    return {
+        "tiers": {
+            **_tier_decisions,
+            "lexical_rate": round(_tier_decisions["lexical"] / decided, 4) if decided else 0.0,
+            "catalog_terms": get_lexical_matcher().catalog_terms,
+        },
+        "cache": get_guardrail_verdict_cache().stats(),
+        "batching": get_guardrail_batcher().stats(),
+    }
+
+
+def _latest_user_text(messages) -> str:
     # Prefer the last HumanMessage; fall back to the last message content
-    messages = state["messages"]
-    user_text = None
     for message in reversed(messages):
         if isinstance(message, HumanMessage):
-            user_text = message.content
-            break
-    if user_text is None:
-        user_text = messages[-1].content
+            return message.content
+    return messages[-1].content
+
 
+def sanitize_user_text(user_text) -> str:
+    """Strip transcript-like role markers, keeping the part authored by the user."""
     # Sanitize transcript-like content that includes role markers
     # Extract the portion likely authored by the human user
     lowered = str(user_text).lower()
@@ -66,15 +171,51 @@ def topic_guardrail(state: CustomMessagesState) -> CustomMessagesState:
             if candidate:
                 user_text = candidate
     # Remove obvious role markers and extra whitespace
-    user_text = re.sub(
+    return re.sub(
         r"\b(human|ai|assistant|system)\b[:\s]*",
         "",
         str(user_text),
         flags=re.IGNORECASE,
     ).strip()
 
-    try:
-        _guard.validate(user_text)
+
+async def topic_guardrail(state: CustomMessagesState) -> CustomMessagesState:
+    """Validate the latest user message is within allowed topics.
+
+    - If valid: pass-through and allow the graph to continue.
+    - If invalid: set `blocked_by_guardrail`.
+
+    Tiers, cheapest first:
+    1. Lexical: greetings, very short messages naming a PC-hardware term and
+       messages naming several of them are allowed outright (see
+       ``lexical``). This tier never blocks.
+    2. Verdict cache for repeated messages.
+    3. Classifier on the guardrail worker thread, batched with concurrent
+       requests (see ``batching``).
+    """
+    if not state.get("messages"):
+        return {}
+
+    user_text = sanitize_user_text(_latest_user_text(state["messages"]))
+
+    if lexical_fast_path_enabled() and get_lexical_matcher().match(user_text):
+        _tier_decisions["lexical"] += 1
         return {"blocked_by_guardrail": False}
+
+    cache = get_guardrail_verdict_cache()
+    allowed = cache.get(user_text)
+    if allowed is not None:
+        _tier_decisions["cache"] += 1
+        return {"blocked_by_guardrail": not allowed}
+
+    try:
+        allowed = await get_guardrail_batcher().classify(user_text)
     except Exception:
+        allowed = None
+    if allowed is None:
+        # Classifier failures block, but are not cached
+        _tier_decisions["error"] += 1
         return {"blocked_by_guardrail": True}
+    _tier_decisions["classifier"] += 1
+    cache.set(user_text, allowed)
+    return {"blocked_by_guardrail": not allowed}
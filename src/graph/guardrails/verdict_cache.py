@@ -0,0 +1,61 @@
+"""
+Cache of topic guardrail verdicts.
+
+Keys are the normalized form of the sanitized user text (role markers already
+stripped by the guardrail), prefixed with a version derived from the validator
+configuration: allowed/invalid topics, model threshold and classifier model.
+Changing any of them never serves a verdict computed under the old
+configuration. Only real verdicts are stored; a failed check (``None``) is
+never cached.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Optional, Sequence
+
+from src.services.cache.keys import normalize_query
+from src.services.cache.ttl_lru import TTLLRUCache
+
+
+def guardrail_version(
+    valid_topics: Sequence[str],
+    invalid_topics: Sequence[str],
+    threshold: float,
+    model: str,
+) -> str:
+    raw = json.dumps(
+        {
+            "valid": sorted(valid_topics),
+            "invalid": sorted(invalid_topics),
+            "threshold": threshold,
+            "model": model,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+class GuardrailVerdictCache:
+    def __init__(self, cache: TTLLRUCache, version: str):
+        self.cache = cache
+        self.version = version
+
+    def _key(self, text: str) -> tuple:
+        return (self.version, normalize_query(text))
+
+    def get(self, text: str) -> Optional[bool]:
+        if not self.cache.enabled:
+            return None
+        return self.cache.get(self._key(text))
+
+    def set(self, text: str, allowed: Optional[bool]) -> None:
+        if allowed is not None and self.cache.enabled:
+            self.cache.set(self._key(text), bool(allowed))
+
+    def stats(self) -> dict:
+        return {**self.cache.stats(), "version": self.version}
+
+
+__all__ = ["GuardrailVerdictCache", "guardrail_version"]
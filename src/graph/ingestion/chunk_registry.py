@@ -0,0 +1,115 @@
+"""
+Single chunking pipeline shared by the dense (Pinecone) and sparse (BM25) indexes.
+
+Every S3 object is tokenized once and cut into windows of ``CHUNK_SIZE``
+tokens overlapping by ``CHUNK_OVERLAP`` (500/100). Each window becomes a
+``ChunkRecord`` with a stable ``chunk_id``, character offsets and its token
+count, which is the window length, so chunks are never re-tokenized.
+Ingestion hands the same Documents to Pinecone and BM25, so a chunk has the
+same identity in either retrieval leg and fusion can merge them. Records are
+not retained after ingestion: the indexes hold the only copy of the chunk text.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List
+
+from langchain_core.documents import Document
+
+from src.graph.ingestion.splitter import CHUNK_OVERLAP, CHUNK_SIZE
+
+# Same encoding as RecursiveCharacterTextSplitter.from_tiktoken_encoder's default
+_TOKEN_ENCODING = "gpt2"
+
+
+def make_chunk_id(doc_id: str, etag: str, chunk_number: int) -> str:
+    """Deterministic chunk id (also used as the Pinecone vector id)."""
+    raw = f"{doc_id}\x00{etag}\x00{chunk_number}".encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    import tiktoken
+
+    return tiktoken.get_encoding(_TOKEN_ENCODING)
+
+
+@dataclass(frozen=True)
+class ChunkRecord:
+    chunk_id: str
+    doc_id: str
+    etag: str
+    chunk_number: int
+    start: int
+    end: int
+    token_count: int
+    text: str
+
+    def to_document(self) -> Document:
+        return Document(
+            page_content=self.text,
+            metadata={
+                "chunk_id": self.chunk_id,
+                "doc_id": self.doc_id,
+                "etag": self.etag,
+                "chunk_number": self.chunk_number,
+                "start_index": self.start,
+                "token_count": self.token_count,
+            },
+        )
+
+
+def chunk_text(
+    text: str,
+    doc_id: str,
+    etag: str,
+    *,
+    chunk_size: int = CHUNK_SIZE,
+    chunk_overlap: int = CHUNK_OVERLAP,
+    encoding=None,
+) -> List[ChunkRecord]:
+    """Split ``text`` into chunk records (chunk numbers start at 1)."""
+    encoding = encoding or _encoding()
+    ids = encoding.encode(text, disallowed_special=())
+    if not ids:
+        return []
+    # Character offset of every token, from the single tokenization above
+    _, offsets = encoding.decode_with_offsets(ids)
+    offsets.append(len(text))
+
+    step = max(chunk_size - chunk_overlap, 1)
+    records: List[ChunkRecord] = []
+    first = 0
+    while True:
+        last = min(first + chunk_size, len(ids))
+        raw = text[offsets[first] : offsets[last]]
+        chunk = raw.strip()
+        if chunk:
+            start = offsets[first] + (len(raw) - len(raw.lstrip()))
+            number = len(records) + 1
+            records.append(
+                ChunkRecord(
+                    chunk_id=make_chunk_id(doc_id, etag, number),
+                    doc_id=doc_id,
+                    etag=etag,
+                    chunk_number=number,
+                    start=start,
+                    end=start + len(chunk),
+                    token_count=last - first,
+                    text=chunk,
+                )
+            )
+        if last == len(ids):
+            return records
+        first += step
+
+
+__all__ = [
+    "ChunkRecord",
+    "chunk_text",
+    "make_chunk_id",
+]
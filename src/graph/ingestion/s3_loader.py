@@ -1,11 +1,16 @@
 # loaders.py
-from langchain_community.document_loaders import S3DirectoryLoader
 import os
 from dotenv import load_dotenv
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from src.graph.ingestion.chunk_registry import chunk_text
 
 
 def load_s3_documents():
+    """Chunk every object of the RAG bucket with the shared chunking pipeline.
+
+    Uses the same splitter, chunk ids and metadata (doc_id = S3 key, etag,
+    chunk_number) as the Pinecone ingestion path.
+    """
     load_dotenv()
     AWS_ACCESS_ID = os.getenv("AWS_ACCESS_KEY_ID")
     AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
@@ -14,28 +19,19 @@ def load_s3_documents():
     if not all([AWS_ACCESS_ID, AWS_SECRET_ACCESS_KEY, AWS_S3_RAG_DOCUMENTS_BUCKET]):
         raise ValueError("Missing required AWS environment variables")
 
-    loader = S3DirectoryLoader(
-        AWS_S3_RAG_DOCUMENTS_BUCKET,
-        aws_access_key_id=AWS_ACCESS_ID,
-        aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-    )
-
-    docs = loader.load()
-    docs_list = []
-
-    # Handle both single documents and lists of documents
-    if isinstance(docs, list):
-        for document in docs:
-            docs_list.append(document)
-    else:
-        docs_list.append(docs)
+    from src.services.s3_service import get_object_bytes_from_s3, get_s3_etag_manifest
 
-    print(f"Number of documents loaded: {len(docs_list)}")
+    manifest = get_s3_etag_manifest(AWS_S3_RAG_DOCUMENTS_BUCKET)
+    print(f"Number of documents loaded: {len(manifest)}")
 
-    text_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
-        chunk_size=100, chunk_overlap=50
-    )
-    doc_splits = text_splitter.split_documents(docs_list)
+    doc_splits = []
+    for key, etag in manifest.items():
+        raw_bytes = get_object_bytes_from_s3(AWS_S3_RAG_DOCUMENTS_BUCKET, key)
+        text = raw_bytes.decode("utf-8", errors="ignore")
+        if not text.strip():
+            continue
+        records = chunk_text(text, key, etag)
+        doc_splits.extend(record.to_document() for record in records)
     return doc_splits
 
 
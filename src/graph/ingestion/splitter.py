@@ -1,5 +1,4 @@
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_core.documents import Document
 
 CHUNK_SIZE = 500
 CHUNK_OVERLAP = 100
@@ -12,11 +11,7 @@ def get_text_splitter():
 
 
 def split_text(text: str, doc_id: str, etag: str):
-    splitter = get_text_splitter()
-    chunks = splitter.split_text(text)
-    return [
-        Document(
-            page_content=c, metadata={"doc_id": doc_id, "etag": etag, "chunk_number": i}
-        )
-        for i, c in enumerate(chunks, 1)
-    ]
+    from src.graph.ingestion.chunk_registry import chunk_text
+
+    records = chunk_text(text, doc_id, etag)
+    return [record.to_document() for record in records]
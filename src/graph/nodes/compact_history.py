@@ -0,0 +1,159 @@
+"""
+History compaction for the routing model's input.
+
+Without compaction, the prompt ``generate_answer_or_rag`` sends grows with
+every turn. Before the model call it compacts its copy of the history:
+
+- Tool outputs from turns older than the last ``HISTORY_KEEP_TOOL_TURNS`` are
+  replaced by a one-line stub. The ToolMessage itself, its id and
+  ``tool_call_id`` stay, so every tool call still has its answer.
+- Only the newest ``HISTORY_MAX_TURNS`` turns are kept, and older turns are
+  dropped until the remaining ones fit ``HISTORY_MAX_TOKENS`` (tiktoken counts).
+  The current turn is always kept. A turn starts at a user message, so tool
+  calls are never split from their results.
+- System messages are never removed.
+
+Only the model input is compacted. The thread state and its checkpoints keep
+every message, so checkpoint retention never loses history that was only
+hidden from the model.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from functools import lru_cache
+from typing import Any, Callable, List
+
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+)
+
+from src.env import bool_env, int_env
+
+STUB_PREFIX = "[compacted]"
+
+# Per-message framing overhead in chat-completion prompts
+_MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def history_compaction_enabled() -> bool:
+    return bool_env("HISTORY_COMPACTION", True)
+
+
+@lru_cache(maxsize=4)
+def _encoding(name: str):
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(name)
+    except Exception as e:
+        print(f"Warning: tiktoken encoding {name} unavailable, estimating tokens: {e}")
+        return None
+
+
+def count_text_tokens(text: str) -> int:
+    encoding = _encoding(os.getenv("HISTORY_TOKEN_ENCODING", "o200k_base"))
+    if encoding is None:
+        # ~4 characters per token
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _content_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    return json.dumps(content, default=str)
+
+
+def count_message_tokens(
+    message: BaseMessage, counter: Callable[[str], int] = count_text_tokens
+) -> int:
+    tokens = _MESSAGE_OVERHEAD_TOKENS + counter(_content_text(message.content))
+    if isinstance(message, AIMessage) and message.tool_calls:
+        tokens += counter(json.dumps(message.tool_calls, default=str))
+    return tokens
+
+
+def split_turns(messages: List[BaseMessage]) -> List[List[BaseMessage]]:
+    """Group messages into turns, each starting at a user message."""
+    turns: List[List[BaseMessage]] = []
+    for message in messages:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+def _stub(message: ToolMessage) -> ToolMessage:
+    name = message.name or "tool"
+    return message.model_copy(
+        update={
+            "content": f"{STUB_PREFIX} {name} output from an earlier turn "
+            "was removed to save context."
+        }
+    )
+
+
+def compact_messages(
+    messages: List[BaseMessage],
+    *,
+    max_turns: int,
+    max_tokens: int,
+    keep_tool_turns: int,
+    counter: Callable[[str], int] = count_text_tokens,
+) -> List[BaseMessage]:
+    """Return the compacted copy of ``messages``; the input is not modified."""
+    turns = split_turns(list(messages))
+    if not turns:
+        return []
+
+    # Walk back from the newest turn; the current turn is always kept. Only
+    # kept turns are stubbed and tokenized, so the cost is bounded by the
+    # window rather than by the length of the thread.
+    stub_before = len(turns) - keep_tool_turns
+    kept: List[List[BaseMessage]] = []
+    budget = max_tokens
+    for i in range(len(turns) - 1, -1, -1):
+        if kept and len(kept) >= max_turns:
+            break
+        turn = turns[i]
+        if i < stub_before:
+            turn = [_stub(m) if isinstance(m, ToolMessage) else m for m in turn]
+        cost = sum(count_message_tokens(m, counter) for m in turn)
+        if kept and cost > budget:
+            break
+        kept.append(turn)
+        budget -= cost
+
+    first_kept = len(turns) - len(kept)
+    compacted: List[BaseMessage] = [
+        m for turn in turns[:first_kept] for m in turn if isinstance(m, SystemMessage)
+    ]
+    for turn in reversed(kept):
+        compacted.extend(turn)
+    return compacted
+
+
+def compact_model_input(messages: List[BaseMessage]) -> List[BaseMessage]:
+    """The history to send to the routing model, bounded per the HISTORY_* settings."""
+    if not history_compaction_enabled():
+        return list(messages)
+    return compact_messages(
+        messages,
+        max_turns=max(int_env("HISTORY_MAX_TURNS", 8), 1),
+        max_tokens=int_env("HISTORY_MAX_TOKENS", 6000),
+        keep_tool_turns=max(int_env("HISTORY_KEEP_TOOL_TURNS", 1), 1),
+    )
+
+
+__all__ = [
+    "compact_messages",
+    "compact_model_input",
+    "count_message_tokens",
+    "split_turns",
+]
@@ -5,6 +5,7 @@ from src.graph.tools.hybrid_retriever import retriever_tool
 from dotenv import load_dotenv
 
 from src.graph.state import CustomMessagesState
+from src.graph.nodes.compact_history import compact_model_input
 from src.graph.tools.query_products import query_products_tool
 from src.graph.tools.list_product_categories import list_product_categories_tool
 
@@ -37,17 +38,19 @@ async def generate_answer_or_rag(state: CustomMessagesState) -> CustomMessagesSt
         "- 'What is your return policy?' -> CALL 'retrieve_rag_docs'.\n\n"
         "After retrieving, write a concise answer grounded in the retrieved snippets."
     )
+    # Compacted copy of the history; the thread state keeps every message
+    messages = compact_model_input(state["messages"])
     if "has_been_rewritten" in state and state["has_been_rewritten"]:
         response = await response_model.bind_tools(
             [retriever_tool, query_products_tool, list_product_categories_tool]
         ).ainvoke(
-            state["messages"],
+            messages,
         )
 
         has_been_rewritten = state["has_been_rewritten"]
     else:
         response = await response_model.bind_tools(
             [retriever_tool, query_products_tool, list_product_categories_tool]
-        ).ainvoke([SystemMessage(content=prompt)] + state["messages"])
+        ).ainvoke([SystemMessage(content=prompt)] + messages)
         has_been_rewritten = False
     return {"messages": [response], "has_been_rewritten": has_been_rewritten}
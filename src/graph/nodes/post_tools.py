@@ -0,0 +1,17 @@
+from src.graph.state import CustomMessagesState
+from src.graph.nodes.compact_history import split_turns
+from src.graph.nodes.extract_context import extract_context
+from src.graph.routing.source_router import source_router
+
+
+def post_tools(state: CustomMessagesState) -> CustomMessagesState:
+    """Run extract_context and source_router as one step after the tools.
+
+    Both are pure functions of the message list, so fusing them saves a
+    superstep (and its checkpoint write) per turn. They only see the current
+    turn, so context and sources from earlier turns' tool calls do not leak
+    into this answer.
+    """
+    turns = split_turns(list(state["messages"]))
+    turn = {"messages": turns[-1] if turns else []}
+    return {**extract_context(turn), **source_router(turn)}
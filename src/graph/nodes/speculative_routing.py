@@ -0,0 +1,34 @@
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langchain_core.runnables.config import merge_configs
+from langgraph.constants import TAG_NOSTREAM
+
+from src.graph.state import CustomMessagesState
+from src.graph.guardrails.topic_restriction import topic_guardrail
+from src.graph.nodes.generate_answer_or_rag import generate_answer_or_rag
+from src.graph.speculation import speculate
+
+
+async def speculative_routing(
+    state: CustomMessagesState, config: RunnableConfig
+) -> CustomMessagesState:
+    """topic_guardrail and generate_answer_or_rag in one step,
+    with the routing model call started before the guardrail has decided.
+
+    Blocked messages cancel the model call. Its tokens are not streamed while
+    the verdict is pending (``nostream``); the finished message is emitted once
+    the node returns, so a blocked message never leaks a partial answer.
+    """
+    route = RunnableLambda(generate_answer_or_rag, name="generate_answer_or_rag")
+    route_config = merge_configs(config, {"tags": [TAG_NOSTREAM]})
+
+    verdict, answer = await speculate(
+        lambda: topic_guardrail(state),
+        lambda: route.ainvoke(state, config=route_config),
+        lambda verdict: not verdict.get("blocked_by_guardrail"),
+    )
+    if answer is None:
+        return verdict
+    return {**verdict, **answer}
+
+
+__all__ = ["speculative_routing"]
@@ -0,0 +1,98 @@
+import asyncio
+import time
+
+from langchain_core.messages import ToolMessage
+
+from src.env import float_env, int_env
+from src.graph.retrievers.timing_tracker import track_component_timing
+
+
+def _tool_name(tool):
+    return getattr(tool, "name", None) or getattr(tool, "__name__", None)
+
+
+def _tool_content(result) -> str:
+    # Normalize result to string content for ToolMessage
+    if isinstance(result, (list, dict)):
+        from json import dumps
+
+        return dumps(result)
+    return str(result)
+
+
+async def _invoke_tool(tool, tool_args):
+    if hasattr(tool, "ainvoke"):
+        return await tool.ainvoke(tool_args)
+    # Plain callables (used as stand-ins in tests/scripts) run off the loop
+    return await asyncio.to_thread(tool, **tool_args)
+
+
+def tool_node(tools_list, *, max_concurrency=None, timeouts=None):
+    """Custom tool node to replace langgraph.prebuilt.ToolNode.
+
+    Tool calls of one AI message run concurrently (at most `max_concurrency`
+    at a time, TOOL_MAX_CONCURRENCY), each bounded by its timeout (`timeouts`
+    per tool name, else TOOL_TIMEOUT_SECONDS). Results keep the order of the
+    tool calls; failures and timeouts become error ToolMessages so the model
+    can still answer. Per-call latency is recorded in the timing tracker and
+    in the message's response_metadata.
+
+    Only the new ToolMessages are returned: the `add_messages` reducer appends
+    them, so the node's cost and checkpoint write do not grow with history.
+    """
+    tools_by_name = {_tool_name(t): t for t in tools_list}
+    if max_concurrency is None:
+        max_concurrency = int_env("TOOL_MAX_CONCURRENCY", 4)
+    default_timeout = float_env("TOOL_TIMEOUT_SECONDS", 30)
+    timeouts = dict(timeouts or {})
+
+    async def run_tools(state):
+        """Execute tools based on the last message's tool calls"""
+        last_message = state["messages"][-1]
+        if not hasattr(last_message, "tool_calls") or not last_message.tool_calls:
+            return {}
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def run_one(tool_call):
+            tool_name = tool_call["name"]
+            tool_args = tool_call.get("args", {})
+            tool_id = tool_call.get("id") or tool_name
+            tool = tools_by_name[tool_name]
+            timeout = timeouts.get(tool_name, default_timeout)
+            metadata = {"tool_call_id": tool_id}
+            status = "success"
+            async with semaphore:
+                start = time.perf_counter()
+                with track_component_timing("tool_node", tool_name, metadata):
+                    try:
+                        result = await asyncio.wait_for(
+                            _invoke_tool(tool, tool_args), timeout=timeout or None
+                        )
+                        content = _tool_content(result)
+                    except asyncio.TimeoutError:
+                        status = "error"
+                        content = f"Error: tool '{tool_name}' timed out after {timeout:g}s"
+                    except Exception as exc:
+                        status = "error"
+                        content = f"Error: tool '{tool_name}' failed: {exc}"
+                    metadata["status"] = status
+                latency_ms = round((time.perf_counter() - start) * 1000, 1)
+            return ToolMessage(
+                tool_call_id=tool_id,
+                # Tool name lets source_router tell product-DB from document results
+                name=tool_name,
+                content=content,
+                status=status,
+                response_metadata={"latency_ms": latency_ms},
+            )
+
+        # Unknown tools are skipped, as before
+        calls = [tc for tc in last_message.tool_calls if tc["name"] in tools_by_name]
+        # gather() preserves call order, so results stay aligned with tool_call_ids
+        tool_results_messages = list(await asyncio.gather(*(run_one(tc) for tc in calls)))
+
+        # Delta only: add_messages appends these to the thread history
+        return {"messages": tool_results_messages}
+
+    return run_tools
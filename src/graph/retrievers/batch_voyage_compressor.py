@@ -7,20 +7,82 @@ into a single VoyageAI API call instead of individual calls.
 Performance improvement: ~8x faster based on testing!
 """
 
-from typing import List, Any, Optional
+from typing import List, Any, Optional, Sequence, Tuple
 from langchain_core.documents import Document
 from langchain_core.callbacks import CallbackManagerForRetrieverRun
 from langchain.retrievers.document_compressors.base import BaseDocumentCompressor
-from voyageai import Client
+import voyageai
+from voyageai import AsyncClient, Client
 from pydantic import Field, PrivateAttr
+import asyncio
+import hashlib
 import os
-import time
 import logging
+import weakref
 
-from src.graph.tracing.langsmith_spans import voyage_rerank
+import aiohttp
+
+from src.env import float_env, int_env
+from src.graph.retrievers.fusion import chunk_key
+from src.graph.tracing.langsmith_spans import avoyage_rerank, voyage_rerank
+from src.services.cache.keys import normalize_query
+from src.services.cache.ttl_lru import TTLLRUCache
 
 logger = logging.getLogger(__name__)
 
+# Per event loop: (shared aiohttp session, rerank concurrency limiter).
+# aiohttp sessions and asyncio semaphores are bound to the loop they were
+# created on, so each loop (e.g. the FastAPI loop vs. a script's asyncio.run)
+# gets its own pair.
+_loop_resources: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[aiohttp.ClientSession, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_loop_resources() -> Tuple[aiohttp.ClientSession, asyncio.Semaphore]:
+    loop = asyncio.get_running_loop()
+    resources = _loop_resources.get(loop)
+    if resources is None or resources[0].closed:
+        connector = aiohttp.TCPConnector(
+            limit=int_env("VOYAGE_HTTP_POOL_SIZE", 32),
+            keepalive_timeout=30,
+        )
+        resources = (
+            aiohttp.ClientSession(connector=connector),
+            asyncio.Semaphore(int_env("VOYAGE_RERANK_MAX_CONCURRENCY", 16)),
+        )
+        _loop_resources[loop] = resources
+    return resources
+
+
+async def aclose_voyage_sessions() -> None:
+    """Close the shared Voyage HTTP session of the running loop (app shutdown)."""
+    resources = _loop_resources.pop(asyncio.get_running_loop(), None)
+    if resources is not None and not resources[0].closed:
+        await resources[0].close()
+
+
+_rerank_cache: Optional[TTLLRUCache] = None
+
+
+def get_rerank_cache() -> TTLLRUCache:
+    """Process-wide rerank cache (RERANK_CACHE_SIZE=0 disables it)."""
+    global _rerank_cache
+    if _rerank_cache is None:
+        ttl = float_env("RERANK_CACHE_TTL_SECONDS", 600)
+        _rerank_cache = TTLLRUCache(
+            maxsize=int_env("RERANK_CACHE_SIZE", 1024),
+            ttl_seconds=ttl if ttl > 0 else None,
+        )
+    return _rerank_cache
+
+
+def _candidate_hash(doc: Document) -> str:
+    # Chunk identity includes doc_id/etag, so a re-synced document yields new
+    # hashes and bypasses entries computed for its previous version
+    raw = f"{chunk_key(doc)!r}\x00{doc.page_content}".encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()
+
 
 class BatchVoyageCompressor(BaseDocumentCompressor):
     """Batch compressor using VoyageAI reranking API"""
@@ -30,6 +92,7 @@ class BatchVoyageCompressor(BaseDocumentCompressor):
     voyage_api_key: Optional[str] = Field(default=None)
 
     _client: Client = PrivateAttr()
+    _async_client: AsyncClient = PrivateAttr()
 
     def __init__(
         self,
@@ -51,6 +114,69 @@ class BatchVoyageCompressor(BaseDocumentCompressor):
             )
 
         self._client = Client(api_key=self.voyage_api_key)
+        self._async_client = AsyncClient(api_key=self.voyage_api_key)
+
+    def _cache_key(self, query: str, hashes: Sequence[str]) -> tuple:
+        top_k = min(self.top_k, len(hashes))
+        return (normalize_query(query), self.model, top_k, tuple(sorted(hashes)))
+
+    def _cached_results(
+        self, query: str, hashes: Sequence[str]
+    ) -> Optional[List[Tuple[int, float]]]:
+        cache = get_rerank_cache()
+        if not cache.enabled:
+            return None
+        ranked = cache.get(self._cache_key(query, hashes))
+        if ranked is None:
+            return None
+        position = {h: i for i, h in enumerate(hashes)}
+        return [(position[h], score) for h, score in ranked]
+
+    def _store_results(
+        self, query: str, hashes: Sequence[str], results: List[Tuple[int, float]]
+    ) -> None:
+        cache = get_rerank_cache()
+        if cache.enabled:
+            cache.set(
+                self._cache_key(query, hashes),
+                tuple((hashes[i], score) for i, score in results),
+            )
+
+    def _apply_rerank(
+        self,
+        documents: List[Document],
+        results: List[Tuple[int, float]],
+        input_count: int,
+    ) -> List[Document]:
+        # Sort documents by rerank score
+        reranked_docs = []
+        for index, relevance_score in results:
+            original_doc = documents[index]
+            # Add rerank score to metadata
+            updated_metadata = original_doc.metadata.copy()
+            updated_metadata["voyage_relevance_score"] = relevance_score
+
+            reranked_doc = Document(
+                page_content=original_doc.page_content, metadata=updated_metadata
+            )
+            reranked_docs.append(reranked_doc)
+
+        # Add metadata for LangSmith visibility
+        if reranked_docs:
+            reranked_docs[0].metadata.update(
+                {
+                    "reranking_info": {
+                        "model": self.model,
+                        "input_count": input_count,
+                        "output_count": len(reranked_docs),
+                        "compression_ratio": round(
+                            len(reranked_docs) / input_count, 2
+                        ),
+                    }
+                }
+            )
+
+        return reranked_docs
 
     def compress_documents(
         self,
@@ -73,6 +199,11 @@ class BatchVoyageCompressor(BaseDocumentCompressor):
             logger.info(f"VoyageCompressor: Single document, skipping rerank - 0.000s")
             return documents
 
+        hashes = [_candidate_hash(doc) for doc in documents]
+        cached = self._cached_results(query, hashes)
+        if cached is not None:
+            return self._apply_rerank(documents, cached, input_count)
+
         # Extract document texts
         doc_texts = [doc.page_content for doc in documents]
 
@@ -85,36 +216,9 @@ class BatchVoyageCompressor(BaseDocumentCompressor):
                 model=self.model,
                 top_k=min(self.top_k, len(documents)),
             )
-
-            # Sort documents by rerank score
-            reranked_docs = []
-            for result in response.results:
-                original_doc = documents[result.index]
-                # Add rerank score to metadata
-                updated_metadata = original_doc.metadata.copy()
-                updated_metadata["voyage_relevance_score"] = result.relevance_score
-
-                reranked_doc = Document(
-                    page_content=original_doc.page_content, metadata=updated_metadata
-                )
-                reranked_docs.append(reranked_doc)
-
-            # Add metadata for LangSmith visibility
-            if reranked_docs:
-                reranked_docs[0].metadata.update(
-                    {
-                        "reranking_info": {
-                            "model": self.model,
-                            "input_count": input_count,
-                            "output_count": len(reranked_docs),
-                            "compression_ratio": round(
-                                len(reranked_docs) / input_count, 2
-                            ),
-                        }
-                    }
-                )
-
-            return reranked_docs
+            results = [(r.index, r.relevance_score) for r in response.results]
+            self._store_results(query, hashes, results)
+            return self._apply_rerank(documents, results, input_count)
 
         except Exception as e:
             logger.warning(f"VoyageCompressor failed: {e}")
@@ -127,9 +231,48 @@ class BatchVoyageCompressor(BaseDocumentCompressor):
         query: str,
         callbacks: Optional[CallbackManagerForRetrieverRun] = None,
     ) -> List[Document]:
-        """Async version of compress_documents"""
-        import asyncio
+        """Async version of compress_documents using the native Voyage async client.
 
-        return await asyncio.to_thread(
-            self.compress_documents, documents, query, callbacks
-        )
+        Requests share one pooled aiohttp session per event loop and are capped
+        by a per-loop semaphore (VOYAGE_RERANK_MAX_CONCURRENCY).
+        """
+        if not documents:
+            return []
+
+        input_count = len(documents)
+
+        if len(documents) == 1:
+            logger.info(f"VoyageCompressor: Single document, skipping rerank - 0.000s")
+            return documents
+
+        hashes = [_candidate_hash(doc) for doc in documents]
+        cached = self._cached_results(query, hashes)
+        if cached is not None:
+            return self._apply_rerank(documents, cached, input_count)
+
+        doc_texts = [doc.page_content for doc in documents]
+
+        try:
+            session, semaphore = _get_loop_resources()
+            async with semaphore:
+                # voyageai picks up the session from this ContextVar instead of
+                # opening (and tearing down) a new one per request
+                token = voyageai.aiosession.set(session)
+                try:
+                    response = await avoyage_rerank(
+                        self._async_client,
+                        query=query,
+                        documents=doc_texts,
+                        model=self.model,
+                        top_k=min(self.top_k, len(documents)),
+                    )
+                finally:
+                    voyageai.aiosession.reset(token)
+            results = [(r.index, r.relevance_score) for r in response.results]
+            self._store_results(query, hashes, results)
+            return self._apply_rerank(documents, results, input_count)
+
+        except Exception as e:
+            logger.warning(f"VoyageCompressor failed: {e}")
+            # Fallback: return original documents
+            return documents[: self.top_k]
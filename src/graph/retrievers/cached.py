@@ -0,0 +1,87 @@
+"""
+Result cache in front of a retriever.
+
+Keys combine the corpus version, the normalized query and the retriever's
+parameters, so a document sync/upload/update/delete (which bumps the corpus
+version) invalidates every previously cached result at once.
+
+With ``reranked=True`` only reranked results are stored: when the reranker
+fails, the compressor falls back to the un-reranked head of the candidates,
+and that degraded result must not be served for the cache's whole TTL.
+"""
+
+from __future__ import annotations
+
+from typing import Hashable, List, Tuple
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForRetrieverRun,
+    CallbackManagerForRetrieverRun,
+)
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from pydantic import ConfigDict
+
+from src.services.cache.keys import normalize_query
+from src.services.cache.ttl_lru import TTLLRUCache
+from src.services.corpus_version import get_corpus_version
+
+
+def _copy(docs: List[Document]) -> List[Document]:
+    # Callers annotate metadata in place; never hand out the cached objects
+    return [Document(page_content=d.page_content, metadata=dict(d.metadata)) for d in docs]
+
+
+class CachedRetriever(BaseRetriever):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    retriever: BaseRetriever
+    cache: TTLLRUCache
+    # Retrieval parameters that change results (top_k, fusion weights, ...)
+    params: Tuple[Hashable, ...] = ()
+    # Only store results carrying a rerank score (skip reranker fallbacks)
+    reranked: bool = False
+
+    def _key(self, query: str) -> tuple:
+        return (get_corpus_version(), normalize_query(query), self.params)
+
+    def _store(self, key: tuple, docs: List[Document]) -> None:
+        if self.reranked and not any(
+            "voyage_relevance_score" in (d.metadata or {}) for d in docs
+        ):
+            return
+        self.cache.set(key, _copy(docs))
+
+    def _get_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun,
+    ) -> List[Document]:
+        key = self._key(query)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return _copy(cached)
+        docs = self.retriever.invoke(query, config={"callbacks": run_manager.get_child()})
+        # Key was taken before retrieval: a concurrent bump makes this entry unreachable
+        self._store(key, docs)
+        return docs
+
+    async def _aget_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: AsyncCallbackManagerForRetrieverRun,
+    ) -> List[Document]:
+        key = self._key(query)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return _copy(cached)
+        docs = await self.retriever.ainvoke(
+            query, config={"callbacks": run_manager.get_child()}
+        )
+        self._store(key, docs)
+        return docs
+
+
+__all__ = ["CachedRetriever"]
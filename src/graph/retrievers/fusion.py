@@ -0,0 +1,89 @@
+"""
+Reciprocal Rank Fusion (RRF) for hybrid retrieval.
+
+Fuses ranked runs from several retrievers (dense, sparse, ...) in a single pass.
+Documents are keyed per chunk, so different chunks of the same S3 object keep
+their own slot instead of collapsing onto the shared ``doc_id``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+from typing import Hashable, List, Optional, Sequence
+
+from langchain_core.documents import Document
+
+DEFAULT_RRF_K = 60
+
+
+def chunk_key(doc: Document) -> Hashable:
+    """Return a stable identity for a retrieved chunk.
+
+    Preference order:
+    - ``(doc_id, etag, chunk_number)`` as written by the ingestion splitter.
+      Both legs carry these, including vectors ingested before ``chunk_id``
+      existed, so dense and sparse hits of one chunk always merge.
+    - explicit ``chunk_id`` metadata
+    - explicit vector ``id`` metadata
+    - a content hash (scoped by ``doc_id``/``source`` when available)
+    """
+    meta = doc.metadata or {}
+    doc_id = meta.get("doc_id")
+    chunk_number = meta.get("chunk_number")
+    if doc_id and chunk_number is not None:
+        return (doc_id, meta.get("etag"), chunk_number)
+    chunk_id = meta.get("chunk_id")
+    if chunk_id:
+        return chunk_id
+    vector_id = meta.get("id")
+    if vector_id:
+        return vector_id
+    scope = doc_id or meta.get("source") or ""
+    digest = hashlib.sha1(doc.page_content.encode("utf-8")).hexdigest()
+    return (scope, digest)
+
+
+def weighted_rrf(
+    runs: Sequence[Sequence[Document]],
+    *,
+    weights: Optional[Sequence[float]] = None,
+    k: int = DEFAULT_RRF_K,
+    limit: Optional[int] = None,
+) -> List[Document]:
+    """Fuse ranked runs with (weighted) Reciprocal Rank Fusion.
+
+    score(chunk) = sum_over_runs(weight_run / (k + rank + 1))
+
+    Runs in O(total candidates) plus O(n log limit) for selecting the output.
+    The first occurrence of a chunk (in run order) is the Document returned.
+    Ties are broken by first-seen order so results are deterministic.
+    """
+    if weights is None:
+        weights = [1.0] * len(runs)
+    if len(weights) != len(runs):
+        raise ValueError("weights must have the same length as runs")
+    if k < 0:
+        raise ValueError("k must be non-negative")
+
+    scores: dict[Hashable, float] = {}
+    first_seen: dict[Hashable, tuple[int, Document]] = {}
+    for run, weight in zip(runs, weights):
+        if not weight:
+            continue
+        for rank, doc in enumerate(run):
+            key = chunk_key(doc)
+            scores[key] = scores.get(key, 0.0) + weight / (k + rank + 1)
+            if key not in first_seen:
+                first_seen[key] = (len(first_seen), doc)
+
+    if limit is None or limit >= len(scores):
+        ranked = sorted(scores, key=lambda key: (-scores[key], first_seen[key][0]))
+    else:
+        ranked = heapq.nsmallest(
+            limit, scores, key=lambda key: (-scores[key], first_seen[key][0])
+        )
+    return [first_seen[key][1] for key in ranked]
+
+
+__all__ = ["DEFAULT_RRF_K", "chunk_key", "weighted_rrf"]
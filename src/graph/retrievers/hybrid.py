@@ -1,19 +1,66 @@
 from __future__ import annotations
-from typing import List, Optional, Any
+from typing import List, Optional
 from langchain_core.documents import Document
 from langchain_core.retrievers import BaseRetriever
 from langchain_core.callbacks import CallbackManagerForRetrieverRun
 from pydantic import Field
 import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from src.env import int_env
+from src.graph.retrievers.fusion import DEFAULT_RRF_K
+from src.graph.retrievers.timing_tracker import track_component_timing
 from src.graph.tracing.langsmith_spans import rrf_fuse
 from langchain.retrievers.document_compressors.base import BaseDocumentCompressor
 
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_retrieval_executor() -> ThreadPoolExecutor:
+    """Shared, bounded pool for running retrieval legs on the sync path."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=int_env("RAG_RETRIEVAL_MAX_WORKERS", 8),
+                    thread_name_prefix="hybrid-retrieval",
+                )
+    return _executor
+
+
+def _timed_leg(
+    leg: str, retriever: BaseRetriever, query: str, callbacks
+) -> List[Document]:
+    metadata = {}
+    with track_component_timing(f"{leg}_retriever", "retrieve", metadata):
+        docs = retriever.get_relevant_documents(query, callbacks=callbacks)
+        metadata["num_docs"] = len(docs)
+    return docs
+
 
 class CustomHybridRetriever(BaseRetriever):
     dense_retriever: BaseRetriever
     sparse_retriever: BaseRetriever
     compressor: BaseDocumentCompressor
     top_k: int = 5
+    # RRF parameters: smoothing constant and per-source weights
+    rrf_k: int = DEFAULT_RRF_K
+    dense_weight: float = 1.0
+    sparse_weight: float = 1.0
+
+    def _fuse(
+        self, dense_docs: List[Document], sparse_docs: List[Document]
+    ) -> List[Document]:
+        return rrf_fuse(
+            dense_docs,
+            sparse_docs,
+            self.top_k,
+            k=self.rrf_k,
+            weights=(self.dense_weight, self.sparse_weight),
+        )
 
     def _get_relevant_documents(
         self,
@@ -21,16 +68,26 @@ class CustomHybridRetriever(BaseRetriever):
         *,
         run_manager: CallbackManagerForRetrieverRun,
     ) -> List[Document]:
-        # Steps 1 & 2: Dense and Sparse Retrieval (auto-traced by LangChain)
-        dense_docs = self.dense_retriever.get_relevant_documents(
-            query, callbacks=run_manager.get_child()
+        # Steps 1 & 2: Dense and Sparse Retrieval (in parallel on the shared pool).
+        # Each leg runs in a copy of the caller's context so tracing parents and
+        # other context variables carry over to the worker thread.
+        executor = get_retrieval_executor()
+        dense_future = executor.submit(
+            contextvars.copy_context().run,
+            _timed_leg,
+            "dense",
+            self.dense_retriever,
+            query,
+            run_manager.get_child(),
         )
-        sparse_docs = self.sparse_retriever.get_relevant_documents(
-            query, callbacks=run_manager.get_child()
+        # The sparse leg runs on the calling thread; only dense needs the pool
+        sparse_docs = contextvars.copy_context().run(
+            _timed_leg, "sparse", self.sparse_retriever, query, run_manager.get_child()
         )
+        dense_docs = dense_future.result()
 
         # Step 3: RRF Fusion (custom traceable span)
-        fused_docs = rrf_fuse(dense_docs, sparse_docs, self.top_k)
+        fused_docs = self._fuse(dense_docs, sparse_docs)
 
         # Step 4: Compression (auto-traced by LangChain)
         compressed_docs = self.compressor.compress_documents(
@@ -46,20 +103,27 @@ class CustomHybridRetriever(BaseRetriever):
         run_manager: CallbackManagerForRetrieverRun,
     ) -> List[Document]:
         # Steps 1 & 2: Dense and Sparse Retrieval (in parallel)
-        async def _aget(ret, _callbacks):
-            if hasattr(ret, "aget_relevant_documents"):
-                return await ret.aget_relevant_documents(query, callbacks=_callbacks)
-            return await asyncio.to_thread(
-                ret.get_relevant_documents, query, callbacks=_callbacks
-            )
+        async def _aget(leg, ret, _callbacks):
+            metadata = {}
+            with track_component_timing(f"{leg}_retriever", "retrieve", metadata):
+                if hasattr(ret, "aget_relevant_documents"):
+                    docs = await ret.aget_relevant_documents(
+                        query, callbacks=_callbacks
+                    )
+                else:
+                    docs = await asyncio.to_thread(
+                        ret.get_relevant_documents, query, callbacks=_callbacks
+                    )
+                metadata["num_docs"] = len(docs)
+            return docs
 
         dense_docs, sparse_docs = await asyncio.gather(
-            _aget(self.dense_retriever, run_manager.get_child()),
-            _aget(self.sparse_retriever, run_manager.get_child()),
+            _aget("dense", self.dense_retriever, run_manager.get_child()),
+            _aget("sparse", self.sparse_retriever, run_manager.get_child()),
         )
 
         # Step 3: RRF Fusion
-        fused_docs = rrf_fuse(dense_docs, sparse_docs, self.top_k)
+        fused_docs = self._fuse(dense_docs, sparse_docs)
 
         # Step 4: Compression
         compressed_docs = await self.compressor.acompress_documents(
@@ -0,0 +1,50 @@
+"""
+Retriever proxy whose target is built on first use.
+
+Lets tools be created at import time (so the graph module stays cheap to
+import) while the expensive retrieval stack is built by a warmup hook or,
+failing that, by the first query.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Callable, List
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForRetrieverRun,
+    CallbackManagerForRetrieverRun,
+)
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+
+class LazyRetriever(BaseRetriever):
+    # Returns the (cached) target retriever, building it if needed
+    factory: Callable[[], BaseRetriever]
+    # True once the factory can return without building (skips the thread hop)
+    is_ready: Callable[[], bool] = lambda: False
+
+    def _get_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun,
+    ) -> List[Document]:
+        return self.factory().invoke(query, config={"callbacks": run_manager.get_child()})
+
+    async def _aget_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: AsyncCallbackManagerForRetrieverRun,
+    ) -> List[Document]:
+        if self.is_ready():
+            target = self.factory()
+        else:
+            # Building does blocking network I/O; keep it off the event loop
+            target = await asyncio.to_thread(self.factory)
+        return await target.ainvoke(query, config={"callbacks": run_manager.get_child()})
+
+
+__all__ = ["LazyRetriever"]
@@ -0,0 +1,150 @@
+"""
+Lazily-built hybrid retrieval stack behind the ``retrieve_rag_docs`` tool.
+
+Nothing here touches the network at import time. The stack (Pinecone service,
+BM25 index, Voyage compressor) is built by ``warmup_retrieval_stack`` during
+app startup, with the independent components built concurrently, or on the
+first query otherwise.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+
+from langchain_core.retrievers import BaseRetriever
+
+from src.env import float_env, int_env
+from src.graph.retrievers.cached import CachedRetriever
+from src.graph.retrievers.hybrid import CustomHybridRetriever
+from src.services.cache.ttl_lru import TTLLRUCache
+
+_cache_ttl = float_env("RETRIEVAL_CACHE_TTL_SECONDS", 300)
+# Cache results per (corpus version, normalized query, parameters)
+retrieval_cache = TTLLRUCache(
+    maxsize=int_env("RETRIEVAL_CACHE_SIZE", 256),
+    ttl_seconds=_cache_ttl if _cache_ttl > 0 else None,
+)
+
+_lock = threading.Lock()
+_retriever: Optional[BaseRetriever] = None
+
+
+def _build_dense():
+    from src.services.vectorstores.backend import get_vector_store_service
+
+    return get_vector_store_service().get_retriever()
+
+
+def _build_sparse():
+    from src.services.sparse.bm25_service import get_bm25_service
+
+    return get_bm25_service().get_retriever()
+
+
+def _build_compressor():
+    from src.graph.retrievers.factory import build_batch_voyage_compressor
+
+    return build_batch_voyage_compressor()
+
+
+def _assemble(dense_retriever, sparse_retriever, compressor) -> BaseRetriever:
+    # Handle case where BM25 is not available (no documents)
+    if sparse_retriever is None:
+        print("Warning: BM25 retriever not available (no documents found)")
+        # Fall back to dense-only retrieval
+        from langchain.retrievers import MergerRetriever
+
+        hybrid = MergerRetriever(retrievers=[dense_retriever])
+        params = (type(hybrid).__name__,)
+        reranked = False
+    else:
+        hybrid = CustomHybridRetriever(
+            dense_retriever=dense_retriever,
+            sparse_retriever=sparse_retriever,
+            compressor=compressor,
+            rrf_k=int_env("RAG_RRF_K", 60),
+            dense_weight=float_env("RAG_RRF_DENSE_WEIGHT", 1.0),
+            sparse_weight=float_env("RAG_RRF_SPARSE_WEIGHT", 1.0),
+        )
+        params = (
+            type(hybrid).__name__,
+            hybrid.top_k,
+            hybrid.rrf_k,
+            hybrid.dense_weight,
+            hybrid.sparse_weight,
+        )
+        reranked = True
+    return CachedRetriever(
+        retriever=hybrid, cache=retrieval_cache, params=params, reranked=reranked
+    )
+
+
+def is_retriever_ready() -> bool:
+    return _retriever is not None
+
+
+def get_hybrid_retriever() -> BaseRetriever:
+    """Return the retrieval stack, building it synchronously on first call."""
+    global _retriever
+    if _retriever is None:
+        with _lock:
+            if _retriever is None:
+                start = time.perf_counter()
+                _retriever = _assemble(
+                    _build_dense(), _build_sparse(), _build_compressor()
+                )
+                print(
+                    f"--- Retrieval stack built lazily in "
+                    f"{time.perf_counter() - start:.2f}s ---"
+                )
+    return _retriever
+
+
+async def _timed(name: str, fn, timings: Dict[str, float]):
+    start = time.perf_counter()
+    try:
+        return await asyncio.to_thread(fn)
+    finally:
+        timings[name] = time.perf_counter() - start
+
+
+async def warmup_retrieval_stack() -> Dict[str, float]:
+    """Build the retrieval stack off the event loop, components concurrently.
+
+    Returns per-component build times in seconds. Failures are logged and
+    leave the stack unbuilt, so the first query retries the build.
+    """
+    global _retriever
+    timings: Dict[str, float] = {}
+    if _retriever is not None:
+        return timings
+    start = time.perf_counter()
+    try:
+        dense, sparse, compressor = await asyncio.gather(
+            _timed("dense", _build_dense, timings),
+            _timed("sparse", _build_sparse, timings),
+            _timed("compressor", _build_compressor, timings),
+        )
+        with _lock:
+            if _retriever is None:
+                _retriever = _assemble(dense, sparse, compressor)
+    except Exception as exc:
+        print(f"Warning: retrieval warmup failed, will build on first use: {exc}")
+    timings["total"] = time.perf_counter() - start
+    print(
+        "--- Retrieval warmup: "
+        + ", ".join(f"{k}={v:.2f}s" for k, v in timings.items())
+        + " ---"
+    )
+    return timings
+
+
+__all__ = [
+    "get_hybrid_retriever",
+    "is_retriever_ready",
+    "retrieval_cache",
+    "warmup_retrieval_stack",
+]
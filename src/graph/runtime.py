@@ -1,17 +1,36 @@
+import os
+
 from src.settings import settings
 from src.graph.graph import graph
-from src.db.checkpointer import create_checkpointer_context
+from src.db.checkpointer import (
+    checkpointer_pool_stats,
+    create_checkpointer_context,
+    create_checkpointer_pool,
+    PooledAsyncPostgresSaver,
+)
 from langgraph.checkpoint.memory import MemorySaver
-from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
-from src.db.url import get_libpq_url
 
 # Global compiled app instance
 _compiled_app = None
 _checkpointer_context = None
-_async_checkpointer_context = None
+_async_pool = None
 _async_checkpointer = None
 
 
+def get_checkpoint_durability() -> str:
+    """Checkpoint durability for graph runs (``CHECKPOINT_DURABILITY``).
+
+    - ``sync``: each step's checkpoint is written before the next step starts.
+    - ``async`` (LangGraph's default): written in the background while the next
+      step runs.
+    - ``exit``: only the final state of a run is written, one checkpoint per
+      turn instead of one per step. A run that crashes or is cancelled midway
+      (e.g. the client disconnects) leaves no trace of that turn.
+    """
+    mode = os.getenv("CHECKPOINT_DURABILITY", "async").strip().lower()
+    return mode if mode in ("sync", "async", "exit") else "async"
+
+
 def build_app():
     global _compiled_app, _checkpointer_context
 
@@ -68,16 +87,19 @@ def build_app():
 
 
 async def build_app_async():
-    global _compiled_app, _async_checkpointer_context, _async_checkpointer
+    global _compiled_app, _async_pool, _async_checkpointer
 
     if _compiled_app is None:
         try:
             print(f"🔄 Connecting to database (async): {settings.AWS_DB_URL[:50]}...")
-            # Keep async context alive for app lifetime
-            _async_checkpointer_context = AsyncPostgresSaver.from_conn_string(
-                get_libpq_url()
+            # Pool kept open for the app lifetime; concurrent chats no longer
+            # share (and serialize on) a single connection
+            _async_pool = await create_checkpointer_pool()
+            _async_checkpointer = PooledAsyncPostgresSaver(conn=_async_pool)
+            print(
+                f"✅ Checkpointer pool open "
+                f"(min={_async_pool.min_size}, max={_async_pool.max_size})"
             )
-            _async_checkpointer = await _async_checkpointer_context.__aenter__()
 
             # Setup tables (async if available)
             try:
@@ -94,6 +116,7 @@ async def build_app_async():
             print("✅ Using AsyncPostgresSaver for persistent sessions")
         except Exception as e:
             print(f"❌ Async database connection failed: {e}")
+            await acleanup()
             print("🔄 Falling back to sync builder or MemorySaver")
             # Fallback to sync builder (which may choose MemorySaver)
             return build_app()
@@ -112,12 +135,26 @@ def cleanup():
 
 
 async def acleanup():
-    global _async_checkpointer_context
-    if _async_checkpointer_context:
+    global _async_pool, _async_checkpointer
+    if _async_pool:
         try:
-            await _async_checkpointer_context.__aexit__(None, None, None)
+            await _async_pool.close()
         except:
             pass
+        _async_pool = None
+        _async_checkpointer = None
+
+
+def get_checkpoint_pool():
+    """The async checkpointer pool, or None when not in use."""
+    return _async_pool
+
+
+def get_checkpoint_pool_stats():
+    """Utilization of the async checkpointer pool, or None when not in use."""
+    if _async_pool is None:
+        return None
+    return checkpointer_pool_stats(_async_pool)
 
 
 # For testing the module directly
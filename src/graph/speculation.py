@@ -0,0 +1,125 @@
+"""
+Speculative execution of a call that is usually, but not always, allowed to run.
+
+``speculate(check, speculative, accept)`` starts ``speculative()`` before
+awaiting ``check``. When ``accept(check_result)`` is true, the speculative
+result is used and the time the two overlapped is recorded as saved. Otherwise
+the speculative task is cancelled (or discarded, if it already finished) and
+counted as a wasted call.
+
+Saved latency per accepted run is ``check_ms + speculative_ms - total_ms``,
+i.e. how much shorter the run was than doing the two one after the other.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Optional, Tuple, TypeVar
+
+from src.env import bool_env
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def speculative_routing_enabled() -> bool:
+    return bool_env("GRAPH_SPECULATIVE_ROUTING", False)
+
+
+class SpeculationMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = 0
+            self.accepted = 0
+            self.wasted = 0
+            self.wasted_cancelled = 0
+            self.total_saved_ms = 0.0
+
+    def record_accepted(self, saved_ms: float) -> None:
+        with self._lock:
+            self.started += 1
+            self.accepted += 1
+            self.total_saved_ms += max(saved_ms, 0.0)
+
+    def record_wasted(self, cancelled: bool) -> None:
+        """A rejected run; ``cancelled`` when the speculative call was still in flight."""
+        with self._lock:
+            self.started += 1
+            self.wasted += 1
+            if cancelled:
+                self.wasted_cancelled += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "speculative_runs": self.started,
+                "accepted": self.accepted,
+                "wasted_calls": self.wasted,
+                "wasted_calls_cancelled": self.wasted_cancelled,
+                "wasted_rate": round(self.wasted / self.started, 4) if self.started else 0.0,
+                "latency_saved_ms_total": round(self.total_saved_ms, 2),
+                "latency_saved_ms_avg": (
+                    round(self.total_saved_ms / self.accepted, 2) if self.accepted else 0.0
+                ),
+            }
+
+
+_metrics = SpeculationMetrics()
+
+
+def get_speculation_metrics() -> SpeculationMetrics:
+    return _metrics
+
+
+async def speculate(
+    check: Callable[[], Awaitable[T]],
+    speculative: Callable[[], Awaitable[R]],
+    accept: Callable[[T], bool],
+    *,
+    metrics: Optional[SpeculationMetrics] = None,
+) -> Tuple[T, Optional[R]]:
+    """Run ``check`` and ``speculative`` concurrently; ``None`` result when rejected."""
+    metrics = metrics or get_speculation_metrics()
+    timings: dict = {}
+
+    async def timed() -> Any:
+        started = time.perf_counter()
+        try:
+            return await speculative()
+        finally:
+            timings["speculative_ms"] = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    task = asyncio.ensure_future(timed())
+    try:
+        result = await check()
+        check_ms = (time.perf_counter() - started) * 1000
+        if not accept(result):
+            in_flight = not task.done()
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            metrics.record_wasted(cancelled=in_flight)
+            return result, None
+        value = await task
+    except BaseException:
+        # Check failed or this run was cancelled: never leave the call running
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        raise
+    total_ms = (time.perf_counter() - started) * 1000
+    metrics.record_accepted(check_ms + timings["speculative_ms"] - total_ms)
+    return result, value
+
+
+__all__ = [
+    "SpeculationMetrics",
+    "get_speculation_metrics",
+    "speculate",
+    "speculative_routing_enabled",
+]
@@ -1,7 +1,8 @@
-from langchain_core.vectorstores import InMemoryVectorStore
 from langchain_openai import OpenAIEmbeddings
 from src.graph.ingestion.local_loader_splitter import load_local_documents
 from pathlib import Path
+from src.services.vectorstores.cached_embeddings import CachedEmbeddings
+from src.services.vectorstores.local_service import LocalVectorStoreService
 from src.graph.retrievers.factory import (
     maybe_wrap_with_compression,
     create_standard_retriever_tool,
@@ -10,8 +11,11 @@ from src.graph.retrievers.factory import (
 
 def create_in_memory_retriever_tool():
     """
-    Build and return a LangChain retriever tool using an in-memory vector store
-    over the documents loaded from the local tests/data directory.
+    Build and return a LangChain retriever tool using the local NumPy vector
+    store over the documents loaded from the local tests/data directory.
+
+    Embeddings are persisted under .cache/, so unchanged chunks are not
+    re-embedded on later calls, and chunks no longer in tests/data are deleted.
     """
     project_root = Path(__file__).resolve().parents[3]
     data_dir = project_root / "tests" / "data"
@@ -19,11 +23,16 @@ def create_in_memory_retriever_tool():
     if not docs:
         raise ValueError("No documents loaded from local tests/data directory.")
 
-    vectorStore = InMemoryVectorStore.from_documents(
-        documents=docs, embedding=OpenAIEmbeddings()
+    vector_store = LocalVectorStoreService(
+        CachedEmbeddings(OpenAIEmbeddings(), model="openai-default"),
+        persist_dir=project_root / ".cache" / "in_memory_vectors",
     )
+    ids = vector_store.upsert_documents(docs)
+    # The index persists across runs; drop chunks whose files changed or were removed
+    vector_store.delete_except(ids)
+    vector_store.flush()
 
-    base_retriever = vectorStore.as_retriever(search_kwargs={"k": 5})
+    base_retriever = vector_store.get_retriever(k=5)
 
     retriever = maybe_wrap_with_compression(base_retriever)
 
@@ -0,0 +1 @@
+# Package: services.cache
@@ -0,0 +1,11 @@
+import re
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Canonical form of a user query for cache keys (case/space/punctuation)."""
+    return _WHITESPACE_RE.sub(" ", query).strip().lower().rstrip("?!. ")
+
+
+__all__ = ["normalize_query"]
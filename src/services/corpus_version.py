@@ -0,0 +1,26 @@
+"""
+Process-wide corpus version.
+
+Bumped whenever indexed documents change (upload, update, delete, sync) so
+caches of retrieval results can include it in their keys and never serve
+results computed against an older corpus.
+"""
+
+import threading
+
+_lock = threading.Lock()
+_version = 0
+
+
+def get_corpus_version() -> int:
+    return _version
+
+
+def bump_corpus_version() -> int:
+    global _version
+    with _lock:
+        _version += 1
+        return _version
+
+
+__all__ = ["bump_corpus_version", "get_corpus_version"]
@@ -87,3 +87,13 @@ def get_object_bytes_from_s3(bucket_name: str, key: str) -> bytes:
     """Download and return the raw bytes of an S3 object."""
     response = s3_client.get_object(Bucket=bucket_name, Key=key)
     return response["Body"].read()
+
+
+def get_s3_etag_manifest(bucket_name: str) -> dict[str, str]:
+    """Return {key: etag} for every object in the bucket (paginated listing)."""
+    manifest: dict[str, str] = {}
+    paginator = s3_client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket_name):
+        for obj in page.get("Contents", []):
+            manifest[obj["Key"]] = obj.get("ETag", "").strip('"')
+    return manifest
@@ -0,0 +1,461 @@
+"""
+In-house BM25 engine backed by NumPy.
+
+The corpus is stored as an inverted index in CSR layout (one postings slice per
+term) with IDF and per-chunk length-normalisation arrays precomputed at build
+time. A query only touches the postings of its own terms and selects the top-k
+with ``argpartition``, instead of scoring every chunk in Python.
+
+The CSR base segment is immutable (and may be memory-mapped from disk). Chunks
+added afterwards go to a small in-memory delta segment, removed chunks are
+tombstoned, and :meth:`BM25Index.compact` periodically folds both back into a
+fresh CSR segment.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from array import array
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+DEFAULT_K1 = 1.5
+DEFAULT_B = 0.75
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokenizer shared by indexing and querying."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+@lru_cache(maxsize=4096)
+def _tokenize_query(query: str) -> Tuple[Tuple[str, int], ...]:
+    """Cached query tokenization as (term, query term frequency) pairs."""
+    return tuple(Counter(tokenize(query)).items())
+
+
+class BM25Index:
+    """Okapi BM25 over a CSR inverted index with an incremental delta segment.
+
+    - ``indptr[t]:indptr[t + 1]`` is the base postings slice of term id ``t``
+    - ``postings_docs`` holds chunk indices (ascending within a term)
+    - ``postings_tf`` holds the term frequency of each posting
+
+    Chunk indices ``>= num_base`` belong to the delta segment. All public
+    methods are thread-safe.
+    """
+
+    def __init__(
+        self,
+        *,
+        vocab: Dict[str, int],
+        indptr: np.ndarray,
+        postings_docs: np.ndarray,
+        postings_tf: np.ndarray,
+        doc_len: np.ndarray,
+        texts: Sequence[str],
+        metadatas: Sequence[Dict[str, Any]],
+        k1: float = DEFAULT_K1,
+        b: float = DEFAULT_B,
+        idf: Optional[np.ndarray] = None,
+    ):
+        self.k1 = float(k1)
+        self.b = float(b)
+        self._lock = threading.RLock()
+        self._set_base(
+            vocab=vocab,
+            indptr=indptr,
+            postings_docs=postings_docs,
+            postings_tf=postings_tf,
+            doc_len=doc_len,
+            texts=texts,
+            metadatas=metadatas,
+        )
+        self._refresh_statistics(idf=idf)
+
+    def _set_base(
+        self,
+        *,
+        vocab: Dict[str, int],
+        indptr: np.ndarray,
+        postings_docs: np.ndarray,
+        postings_tf: np.ndarray,
+        doc_len: np.ndarray,
+        texts: Sequence[str],
+        metadatas: Sequence[Dict[str, Any]],
+    ) -> None:
+        self.vocab = vocab
+        self.indptr = indptr
+        self.postings_docs = postings_docs
+        self.postings_tf = postings_tf
+        self.doc_len = doc_len
+        self.texts = texts
+        self.metadatas = metadatas
+        self._num_base = len(doc_len)
+
+        # Incremental state: delta segment, tombstones and live statistics
+        self._delta_texts: List[str] = []
+        self._delta_metadatas: List[Dict[str, Any]] = []
+        self._delta_terms: List[Tuple[int, ...]] = []
+        self._delta_postings: Dict[int, Tuple[array, array]] = {}
+        self._live = np.ones(len(doc_len), dtype=bool)
+        self._num_tombstones = 0
+        self._df = np.zeros(len(vocab), dtype=np.float64)
+        self._df[: len(indptr) - 1] = np.diff(indptr)
+        self._total_len = float(np.sum(doc_len, dtype=np.float64))
+        self._doc_chunks: Optional[Dict[str, List[int]]] = None
+        self._stats_dirty = False
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: Iterable[str],
+        metadatas: Optional[Iterable[Dict[str, Any]]] = None,
+        *,
+        k1: float = DEFAULT_K1,
+        b: float = DEFAULT_B,
+    ) -> "BM25Index":
+        texts = list(texts)
+        metadatas = (
+            [dict(m or {}) for m in metadatas]
+            if metadatas is not None
+            else [{} for _ in texts]
+        )
+        if len(metadatas) != len(texts):
+            raise ValueError("metadatas must have the same length as texts")
+
+        vocab: Dict[str, int] = {}
+        term_ids = array("i")
+        doc_ids = array("i")
+        tfs = array("f")
+        doc_len = np.zeros(len(texts), dtype=np.float32)
+
+        for doc_idx, text in enumerate(texts):
+            tokens = tokenize(text)
+            doc_len[doc_idx] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                term_ids.append(vocab.setdefault(term, len(vocab)))
+                doc_ids.append(doc_idx)
+                tfs.append(tf)
+
+        indptr, postings_docs, postings_tf = _to_csr(
+            np.frombuffer(term_ids, dtype=np.int32),
+            np.frombuffer(doc_ids, dtype=np.int32),
+            np.frombuffer(tfs, dtype=np.float32),
+            len(vocab),
+        )
+        return cls(
+            vocab=vocab,
+            indptr=indptr,
+            postings_docs=postings_docs,
+            postings_tf=postings_tf,
+            doc_len=doc_len,
+            texts=texts,
+            metadatas=metadatas,
+            k1=k1,
+            b=b,
+        )
+
+    @classmethod
+    def from_documents(cls, documents: Iterable[Document], **kwargs) -> "BM25Index":
+        documents = list(documents)
+        return cls.from_texts(
+            (d.page_content for d in documents),
+            (d.metadata for d in documents),
+            **kwargs,
+        )
+
+    def _refresh_statistics(self, idf: Optional[np.ndarray] = None) -> None:
+        """Recompute IDF (unless given) and length normalisation."""
+        n_live = len(self._live) - self._num_tombstones
+        if idf is None:
+            df = self._df
+            # Lucene-style IDF: always positive, even for terms in most chunks
+            idf = np.log1p((n_live - df + 0.5) / (df + 0.5)).astype(np.float32)
+        self.idf = idf
+        avgdl = self._total_len / n_live if n_live else 0.0
+        self.avgdl = avgdl
+        if avgdl > 0:
+            self.norm = (
+                self.k1 * (1.0 - self.b + self.b * self.doc_len / avgdl)
+            ).astype(np.float32)
+        else:
+            self.norm = np.full(len(self.doc_len), self.k1, dtype=np.float32)
+        self._stats_dirty = False
+
+    def __len__(self) -> int:
+        """Number of live chunks."""
+        return len(self._live) - self._num_tombstones
+
+    @property
+    def num_base(self) -> int:
+        return self._num_base
+
+    @property
+    def num_delta(self) -> int:
+        return len(self._delta_texts)
+
+    @property
+    def num_tombstones(self) -> int:
+        return self._num_tombstones
+
+    @property
+    def has_pending_changes(self) -> bool:
+        return bool(self._delta_texts) or self._num_tombstones > 0
+
+    def needs_compaction(self, ratio: float = 0.2) -> bool:
+        """True once delta chunks plus tombstones exceed ``ratio`` of all slots."""
+        slots = len(self._live)
+        if not slots:
+            return False
+        return (self.num_delta + self._num_tombstones) / slots > ratio
+
+    def get_scores(self, query: str) -> np.ndarray:
+        """Return the BM25 score of every chunk slot for ``query``.
+
+        Tombstoned slots score 0.
+        """
+        with self._lock:
+            if self._stats_dirty:
+                self._refresh_statistics()
+            scores = np.zeros(len(self._live), dtype=np.float32)
+            num_base_terms = len(self.indptr) - 1
+            for term, qtf in _tokenize_query(query):
+                term_id = self.vocab.get(term)
+                if term_id is None:
+                    continue
+                weight = qtf * self.idf[term_id]
+                if term_id < num_base_terms:
+                    start, end = self.indptr[term_id], self.indptr[term_id + 1]
+                    if start != end:
+                        self._accumulate(
+                            scores,
+                            self.postings_docs[start:end],
+                            self.postings_tf[start:end],
+                            weight,
+                        )
+                delta = self._delta_postings.get(term_id)
+                if delta is not None:
+                    self._accumulate(
+                        scores,
+                        np.frombuffer(delta[0], dtype=np.int32),
+                        np.frombuffer(delta[1], dtype=np.float32),
+                        weight,
+                    )
+            if self._num_tombstones:
+                scores[~self._live] = 0.0
+            return scores
+
+    def _accumulate(
+        self, scores: np.ndarray, docs: np.ndarray, tf: np.ndarray, weight: float
+    ) -> None:
+        # Chunk indices are unique within a postings slice, so a fancy-index
+        # add is safe (no np.add.at needed)
+        scores[docs] += weight * (tf * (self.k1 + 1.0) / (tf + self.norm[docs]))
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[int, float]]:
+        """Return up to ``k`` (chunk index, score) pairs with a positive score."""
+        with self._lock:
+            if k <= 0 or not len(self):
+                return []
+            scores = self.get_scores(query)
+            if k < len(scores):
+                candidates = np.argpartition(-scores, k - 1)[:k]
+            else:
+                candidates = np.arange(len(scores))
+            candidates = candidates[scores[candidates] > 0]
+            # Highest score first, lower chunk index wins ties
+            order = np.lexsort((candidates, -scores[candidates]))
+            return [(int(i), float(scores[i])) for i in candidates[order]]
+
+    def search_documents(self, query: str, k: int = 5) -> List[Document]:
+        """Search and materialise hits atomically (safe against compaction)."""
+        with self._lock:
+            return [self.get_document(i) for i, _ in self.search(query, k)]
+
+    def get_document(self, idx: int) -> Document:
+        with self._lock:
+            if idx < self._num_base:
+                text, meta = self.texts[idx], self.metadatas[idx]
+            else:
+                text = self._delta_texts[idx - self._num_base]
+                meta = self._delta_metadatas[idx - self._num_base]
+            return Document(page_content=text, metadata=dict(meta))
+
+    def _metadata_at(self, idx: int) -> Dict[str, Any]:
+        if idx < self._num_base:
+            return self.metadatas[idx]
+        return self._delta_metadatas[idx - self._num_base]
+
+    def _chunks_by_doc_id(self) -> Dict[str, List[int]]:
+        if self._doc_chunks is None:
+            mapping: Dict[str, List[int]] = {}
+            for idx in range(len(self._live)):
+                doc_id = self._metadata_at(idx).get("doc_id")
+                if doc_id is not None:
+                    mapping.setdefault(doc_id, []).append(idx)
+            self._doc_chunks = mapping
+        return self._doc_chunks
+
+    def add_documents(self, documents: Iterable[Document]) -> int:
+        """Append chunks to the delta segment; returns the number added."""
+        added = 0
+        with self._lock:
+            doc_chunks = self._chunks_by_doc_id()
+            new_lengths = []
+            for doc in documents:
+                idx = len(self._live) + added
+                tokens = tokenize(doc.page_content)
+                term_ids = []
+                for term, tf in Counter(tokens).items():
+                    term_id = self.vocab.get(term)
+                    if term_id is None:
+                        term_id = self.vocab[term] = len(self.vocab)
+                    term_ids.append(term_id)
+                    postings = self._delta_postings.get(term_id)
+                    if postings is None:
+                        postings = self._delta_postings[term_id] = (
+                            array("i"),
+                            array("f"),
+                        )
+                    postings[0].append(idx)
+                    postings[1].append(tf)
+                if len(self.vocab) > len(self._df):
+                    self._df = np.concatenate(
+                        [self._df, np.zeros(len(self.vocab) - len(self._df))]
+                    )
+                self._df[term_ids] += 1
+                meta = dict(doc.metadata or {})
+                self._delta_texts.append(doc.page_content)
+                self._delta_metadatas.append(meta)
+                self._delta_terms.append(tuple(term_ids))
+                if meta.get("doc_id") is not None:
+                    doc_chunks.setdefault(meta["doc_id"], []).append(idx)
+                new_lengths.append(len(tokens))
+                added += 1
+            if added:
+                self.doc_len = np.concatenate(
+                    [self.doc_len, np.asarray(new_lengths, dtype=np.float32)]
+                )
+                self._live = np.concatenate([self._live, np.ones(added, dtype=bool)])
+                self._total_len += float(sum(new_lengths))
+                self._stats_dirty = True
+        return added
+
+    def remove_by_doc_id(self, doc_id: str) -> int:
+        """Tombstone every live chunk of ``doc_id``; returns the number removed."""
+        with self._lock:
+            indices = [
+                i for i in self._chunks_by_doc_id().pop(doc_id, []) if self._live[i]
+            ]
+            if not indices:
+                return 0
+            idx = np.asarray(indices, dtype=np.int64)
+            live = self._live.copy()
+            live[idx] = False
+
+            # Keep document frequencies exact for the chunks being removed
+            base_idx = idx[idx < self._num_base]
+            if len(base_idx):
+                positions = np.flatnonzero(np.isin(self.postings_docs, base_idx))
+                terms = np.searchsorted(self.indptr, positions, side="right") - 1
+                np.subtract.at(self._df, terms, 1)
+            for i in idx[idx >= self._num_base]:
+                self._df[list(self._delta_terms[i - self._num_base])] -= 1
+
+            self._live = live
+            self._num_tombstones += len(idx)
+            self._total_len -= float(np.sum(self.doc_len[idx], dtype=np.float64))
+            self._stats_dirty = True
+            return len(idx)
+
+    def compact(self) -> None:
+        """Fold the delta segment and tombstones into a new CSR base segment."""
+        with self._lock:
+            if not self.has_pending_changes:
+                return
+            live = self._live
+            remap = np.cumsum(live, dtype=np.int64) - 1
+
+            num_base_terms = len(self.indptr) - 1
+            base_terms = np.repeat(
+                np.arange(num_base_terms, dtype=np.int32), np.diff(self.indptr)
+            )
+            keep = live[self.postings_docs]
+            term_parts = [base_terms[keep]]
+            doc_parts = [remap[self.postings_docs[keep]]]
+            tf_parts = [np.asarray(self.postings_tf)[keep]]
+            for term_id, (docs, tfs) in self._delta_postings.items():
+                docs = np.frombuffer(docs, dtype=np.int32)
+                tfs = np.frombuffer(tfs, dtype=np.float32)
+                keep = live[docs]
+                term_parts.append(np.full(int(keep.sum()), term_id, dtype=np.int32))
+                doc_parts.append(remap[docs[keep]])
+                tf_parts.append(tfs[keep])
+
+            indptr, postings_docs, postings_tf = _to_csr(
+                np.concatenate(term_parts),
+                np.concatenate(doc_parts).astype(np.int32),
+                np.concatenate(tf_parts),
+                len(self.vocab),
+            )
+            live_idx = np.flatnonzero(live)
+            texts = []
+            metadatas = []
+            for i in live_idx:
+                i = int(i)
+                if i < self._num_base:
+                    texts.append(self.texts[i])
+                    metadatas.append(self.metadatas[i])
+                else:
+                    texts.append(self._delta_texts[i - self._num_base])
+                    metadatas.append(self._delta_metadatas[i - self._num_base])
+
+            self._set_base(
+                vocab=self.vocab,
+                indptr=indptr,
+                postings_docs=postings_docs,
+                postings_tf=postings_tf,
+                doc_len=np.asarray(self.doc_len)[live_idx].astype(np.float32),
+                texts=texts,
+                metadatas=metadatas,
+            )
+            self._refresh_statistics()
+
+
+def _to_csr(
+    term_ids: np.ndarray, doc_ids: np.ndarray, tfs: np.ndarray, vocab_size: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Group COO postings by term (chunk order preserved within a term)."""
+    order = np.argsort(term_ids, kind="stable")
+    counts = np.bincount(term_ids, minlength=vocab_size)
+    indptr = np.zeros(vocab_size + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    return indptr, doc_ids[order].astype(np.int32), tfs[order].astype(np.float32)
+
+
+class BM25SparseRetriever(BaseRetriever):
+    """LangChain retriever over a :class:`BM25Index` (drop-in for BM25Retriever)."""
+
+    index: Any
+    k: int = 5
+
+    def _get_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun,
+    ) -> List[Document]:
+        return self.index.search_documents(query, self.k)
+
+
+__all__ = ["BM25Index", "BM25SparseRetriever", "tokenize"]
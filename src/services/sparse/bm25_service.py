@@ -1,24 +1,172 @@
+import os
+import threading
+import time
+from pathlib import Path
 from typing import Optional, Sequence
-from langchain_community.retrievers import BM25Retriever
+
+from langchain_core.documents import Document
+
+from src.env import float_env
 from src.graph.ingestion.s3_loader import load_s3_documents
+from src.services.sparse.bm25_engine import BM25Index, BM25SparseRetriever
+from src.services.sparse.bm25_store import load_index, save_index
+from src.settings import settings
+
+_DEFAULT_INDEX_DIR = Path(__file__).resolve().parents[3] / ".cache" / "bm25"
+
+
+def get_bm25_index_dir() -> Path:
+    """Directory of the persisted BM25 index (BM25_INDEX_DIR overrides)."""
+    return Path(os.getenv("BM25_INDEX_DIR", str(_DEFAULT_INDEX_DIR)))
+
+
+def _compaction_ratio() -> float:
+    return float_env("BM25_COMPACTION_RATIO", 0.2)
+
+
+def _current_s3_manifest() -> Optional[dict[str, str]]:
+    """Return {key: etag} for the RAG bucket, or None if S3 is unreachable."""
+    from src.services.s3_service import get_s3_etag_manifest
+
+    try:
+        return get_s3_etag_manifest(settings.AWS_S3_RAG_DOCUMENTS_BUCKET)
+    except Exception as exc:
+        print(f"Warning: could not list S3 bucket for BM25 manifest: {exc}")
+        return None
 
 
 class BM25Service:
-    def __init__(self, documents: Optional[Sequence] = None):
-        # Load documents from S3 if not provided
-        self._documents = (
-            list(documents) if documents is not None else load_s3_documents()
-        )
-        
+    def __init__(
+        self,
+        documents: Optional[Sequence] = None,
+        *,
+        index_dir: Optional[os.PathLike] = None,
+    ):
+        self._index_dir = Path(index_dir) if index_dir else get_bm25_index_dir()
+        # Serialises updates and persistence; queries only take the index lock
+        self._update_lock = threading.Lock()
+        self._compacting = False
+        # S3 key -> ETag of what the index currently holds (None: not persisted)
+        self._manifest: Optional[dict[str, str]] = None
+        if documents is not None:
+            # Explicit documents: build in memory, do not touch the on-disk index
+            self._index = self._build(list(documents))
+        else:
+            self._index = self._load_or_build_from_s3()
+
+    def _build(self, documents: list) -> Optional[BM25Index]:
         # Handle empty documents gracefully
-        if not self._documents:
+        if not documents:
             print("Warning: No documents available for BM25 retriever")
-            self._retriever = None
+            return None
+        return BM25Index.from_documents(documents)
+
+    def _load_or_build_from_s3(self) -> Optional[BM25Index]:
+        """Open the persisted index if it matches the bucket; rebuild otherwise."""
+        start = time.perf_counter()
+        manifest = _current_s3_manifest()
+        if manifest is None:
+            # S3 unreachable: serve whatever was persisted last (possibly stale)
+            index = load_index(self._index_dir)
         else:
-            self._retriever = BM25Retriever.from_documents(self._documents)
+            index = load_index(self._index_dir, expected_source_manifest=manifest)
+        if index is not None:
+            self._manifest = manifest
+            print(
+                f"--- BM25 index loaded from {self._index_dir} "
+                f"({len(index)} chunks, {time.perf_counter() - start:.3f}s) ---"
+            )
+            return index
+
+        print("--- BM25 index missing or stale; rebuilding from S3 ---")
+        index = self._build(load_s3_documents())
+        if index is not None and manifest is not None:
+            self._manifest = manifest
+            try:
+                save_index(index, self._index_dir, source_manifest=manifest)
+            except OSError as exc:
+                print(f"Warning: could not persist BM25 index: {exc}")
+        return index
 
-    def get_retriever(self, k: int = 5) -> Optional[BM25Retriever]:
-        if self._retriever is None:
+    def get_retriever(self, k: int = 5) -> Optional[BM25SparseRetriever]:
+        if self._index is None:
             return None
-        self._retriever.k = k
-        return self._retriever
+        return BM25SparseRetriever(index=self._index, k=k)
+
+    def upsert_document(self, doc_id: str, etag: str, chunks: Sequence[Document]) -> None:
+        """Replace all chunks of `doc_id` in place (no full rebuild)."""
+        with self._update_lock:
+            if self._index is None:
+                if not chunks:
+                    return
+                self._index = BM25Index.from_documents(chunks)
+            else:
+                self._index.remove_by_doc_id(doc_id)
+                self._index.add_documents(chunks)
+            if self._manifest is not None:
+                self._manifest[doc_id] = etag
+        self._maybe_compact()
+
+    def remove_document(self, doc_id: str) -> None:
+        """Tombstone all chunks of `doc_id`."""
+        with self._update_lock:
+            if self._index is None:
+                return
+            self._index.remove_by_doc_id(doc_id)
+            if self._manifest is not None:
+                self._manifest.pop(doc_id, None)
+        self._maybe_compact()
+
+    def get_indexed_etags(self) -> Optional[dict[str, str]]:
+        """Return {doc_id: etag} held by the index, if known."""
+        with self._update_lock:
+            return dict(self._manifest) if self._manifest is not None else None
+
+    def _maybe_compact(self) -> None:
+        index = self._index
+        if index is None or not index.needs_compaction(_compaction_ratio()):
+            return
+        with self._update_lock:
+            if self._compacting:
+                return
+            self._compacting = True
+        threading.Thread(
+            target=self.compact_and_persist, name="bm25-compaction", daemon=True
+        ).start()
+
+    def compact_and_persist(self) -> None:
+        """Fold pending changes into a new base segment and persist it."""
+        try:
+            with self._update_lock:
+                if self._index is None:
+                    return
+                start = time.perf_counter()
+                self._index.compact()
+                if self._manifest is not None:
+                    try:
+                        save_index(
+                            self._index, self._index_dir, source_manifest=self._manifest
+                        )
+                    except OSError as exc:
+                        print(f"Warning: could not persist BM25 index: {exc}")
+                print(
+                    f"--- BM25 index compacted ({len(self._index)} chunks, "
+                    f"{time.perf_counter() - start:.3f}s) ---"
+                )
+        finally:
+            self._compacting = False
+
+
+_service: Optional[BM25Service] = None
+
+
+def get_bm25_service() -> BM25Service:
+    global _service
+    if _service is None:
+        _service = BM25Service()
+    return _service
+
+
+def peek_bm25_service() -> Optional[BM25Service]:
+    """Return the BM25 service if it was already built (never triggers a build)."""
+    return _service
@@ -0,0 +1,177 @@
+"""
+On-disk format for :class:`BM25Index`.
+
+An index is a directory containing:
+
+- ``manifest.json``: format version, BM25 parameters, counts and the source
+  manifest (S3 key -> ETag) the index was built from
+- ``vocab.json``: terms in term-id order
+- ``indptr.npy``, ``postings_docs.npy``, ``postings_tf.npy``: CSR postings
+- ``doc_len.npy``, ``idf.npy``: per-chunk lengths and per-term IDF
+- ``text_offsets.npy`` + ``texts.bin``: UTF-8 chunk texts and their byte offsets
+- ``metadata.json``: per-chunk metadata
+
+Arrays and texts are opened with mmap, so loading costs little more than
+opening the files; chunk texts are decoded only for returned hits.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+from src.services.sparse.bm25_engine import BM25Index
+
+INDEX_FORMAT_VERSION = 2
+
+_ARRAYS = ("indptr", "postings_docs", "postings_tf", "doc_len", "idf")
+
+
+class MappedTexts(Sequence[str]):
+    """Read-only sequence of UTF-8 strings backed by a memory-mapped blob."""
+
+    def __init__(self, blob_path: Path, offsets: np.ndarray):
+        self._offsets = offsets
+        self._file = open(blob_path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._blob = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        )
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        start, end = int(self._offsets[idx]), int(self._offsets[idx + 1])
+        return self._blob[start:end].decode("utf-8")
+
+
+def _write_texts(texts: Sequence[str], blob_path: Path) -> np.ndarray:
+    offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+    with open(blob_path, "wb") as fh:
+        position = 0
+        for i, text in enumerate(texts):
+            data = text.encode("utf-8")
+            fh.write(data)
+            position += len(data)
+            offsets[i + 1] = position
+    return offsets
+
+
+def save_index(
+    index: BM25Index,
+    directory: os.PathLike | str,
+    *,
+    source_manifest: Optional[Mapping[str, str]] = None,
+) -> Path:
+    """Atomically write ``index`` to ``directory`` (replacing any previous one).
+
+    Pending delta chunks and tombstones are compacted first, since only the
+    CSR base segment is persisted.
+    """
+    index.compact()
+    target = Path(directory)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{target.name}-", dir=target.parent))
+    try:
+        for name in _ARRAYS:
+            np.save(staging / f"{name}.npy", np.ascontiguousarray(getattr(index, name)))
+        np.save(staging / "text_offsets.npy", _write_texts(index.texts, staging / "texts.bin"))
+
+        terms = [""] * len(index.vocab)
+        for term, term_id in index.vocab.items():
+            terms[term_id] = term
+        (staging / "vocab.json").write_text(json.dumps(terms), encoding="utf-8")
+        (staging / "metadata.json").write_text(
+            json.dumps(list(index.metadatas), default=str), encoding="utf-8"
+        )
+        manifest = {
+            "format_version": INDEX_FORMAT_VERSION,
+            "created_at": time.time(),
+            "k1": index.k1,
+            "b": index.b,
+            "num_chunks": len(index),
+            "vocab_size": len(index.vocab),
+            "source_manifest": dict(source_manifest or {}),
+        }
+        (staging / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+
+        # Swap directories so readers never observe a half-written index
+        backup = None
+        if target.exists():
+            backup = target.with_name(f".{target.name}-old-{os.getpid()}")
+            os.replace(target, backup)
+        os.replace(staging, target)
+        if backup is not None:
+            shutil.rmtree(backup, ignore_errors=True)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return target
+
+
+def read_manifest(directory: os.PathLike | str) -> Optional[Dict[str, Any]]:
+    """Return the manifest of an on-disk index, or None if absent/unreadable."""
+    try:
+        return json.loads((Path(directory) / "manifest.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def load_index(
+    directory: os.PathLike | str,
+    *,
+    expected_source_manifest: Optional[Mapping[str, str]] = None,
+) -> Optional[BM25Index]:
+    """Open an index with mmap.
+
+    Returns None when no index exists, the format version differs, or
+    ``expected_source_manifest`` is given and does not match the stored one.
+    """
+    path = Path(directory)
+    manifest = read_manifest(path)
+    if manifest is None or manifest.get("format_version") != INDEX_FORMAT_VERSION:
+        return None
+    if expected_source_manifest is not None and dict(
+        expected_source_manifest
+    ) != manifest.get("source_manifest"):
+        return None
+
+    arrays = {name: np.load(path / f"{name}.npy", mmap_mode="r") for name in _ARRAYS}
+    terms = json.loads((path / "vocab.json").read_text(encoding="utf-8"))
+    metadatas = json.loads((path / "metadata.json").read_text(encoding="utf-8"))
+    texts = MappedTexts(path / "texts.bin", np.load(path / "text_offsets.npy", mmap_mode="r"))
+
+    return BM25Index(
+        vocab={term: i for i, term in enumerate(terms)},
+        indptr=arrays["indptr"],
+        postings_docs=arrays["postings_docs"],
+        postings_tf=arrays["postings_tf"],
+        doc_len=arrays["doc_len"],
+        texts=texts,
+        metadatas=metadatas,
+        k1=manifest.get("k1", 1.5),
+        b=manifest.get("b", 0.75),
+        idf=arrays["idf"],
+    )
+
+
+__all__ = [
+    "INDEX_FORMAT_VERSION",
+    "MappedTexts",
+    "load_index",
+    "read_manifest",
+    "save_index",
+]
@@ -0,0 +1,44 @@
+import os
+
+
+def get_vector_store_service():
+    """Return the dense vector store selected by VECTOR_STORE_BACKEND.
+
+    ``pinecone`` (default) or ``local`` (NumPy store, for small corpora and
+    offline runs). Both expose the same ingestion/retrieval/sync surface.
+    """
+    backend = os.getenv("VECTOR_STORE_BACKEND", "pinecone").lower()
+    if backend == "local":
+        from src.services.vectorstores.local_service import get_local_vector_service
+
+        return get_local_vector_service()
+    if backend != "pinecone":
+        raise ValueError(f"Unknown VECTOR_STORE_BACKEND: {backend!r}")
+    from src.services.vectorstores.pinecone_service import get_pinecone_service
+
+    return get_pinecone_service()
+
+
+def peek_vector_store_service():
+    """Return the selected vector store if it was already built (never triggers a build)."""
+    backend = os.getenv("VECTOR_STORE_BACKEND", "pinecone").lower()
+    if backend == "local":
+        from src.services.vectorstores.local_service import peek_local_vector_service
+
+        return peek_local_vector_service()
+    from src.services.vectorstores.pinecone_service import peek_pinecone_service
+
+    return peek_pinecone_service()
+
+
+def get_embedding_cache_stats():
+    """Embedding cache counters of the vector store, or None before it is built."""
+    service = peek_vector_store_service()
+    return service.embedding_cache_stats() if service is not None else None
+
+
+__all__ = [
+    "get_embedding_cache_stats",
+    "get_vector_store_service",
+    "peek_vector_store_service",
+]
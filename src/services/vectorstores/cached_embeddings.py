@@ -0,0 +1,132 @@
+"""
+Caching wrapper around a LangChain ``Embeddings`` object.
+
+Vectors are cached in an in-memory LRU and, optionally, on disk as float32
+``.npy`` files keyed by model name + input kind + text hash. Query and document
+embeddings share the same store but use different keys, since embedding models
+such as Pinecone's may encode queries and passages differently.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.services.cache.ttl_lru import TTLLRUCache
+
+
+class CachedEmbeddings(Embeddings):
+    def __init__(
+        self,
+        underlying: Embeddings,
+        *,
+        model: str,
+        maxsize: int = 4096,
+        cache_dir: Optional[os.PathLike] = None,
+    ):
+        self.underlying = underlying
+        self.model = model
+        self.cache = TTLLRUCache(maxsize=maxsize)
+        self.cache_dir = Path(cache_dir) / _safe_name(model) if cache_dir else None
+        self.disk_hits = 0
+
+    def _key(self, kind: str, text: str) -> str:
+        raw = f"{self.model}\x00{kind}\x00{text}".encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    def _lookup(self, key: str) -> Optional[np.ndarray]:
+        vector = self.cache.get(key)
+        if vector is not None or self.cache_dir is None:
+            return vector
+        path = self.cache_dir / f"{key}.npy"
+        try:
+            vector = np.load(path)
+        except (OSError, ValueError):
+            return None
+        self.disk_hits += 1
+        self.cache.set(key, vector)
+        return vector
+
+    def _store(self, key: str, values: List[float]) -> None:
+        vector = np.asarray(values, dtype=np.float32)
+        self.cache.set(key, vector)
+        if self.cache_dir is None:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename so concurrent readers never see a partial file
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as fh:
+                np.save(fh, vector)
+            os.replace(tmp, self.cache_dir / f"{key}.npy")
+        except OSError as exc:
+            print(f"Warning: could not persist embedding to {self.cache_dir}: {exc}")
+
+    def _partition(self, texts: List[str]):
+        keys = [self._key("document", t) for t in texts]
+        vectors: List[Optional[np.ndarray]] = [self._lookup(k) for k in keys]
+        # Deduplicate misses so repeated chunks are embedded once per call
+        missing: dict[str, str] = {}
+        for key, text, vector in zip(keys, texts, vectors):
+            if vector is None:
+                missing.setdefault(key, text)
+        return keys, vectors, missing
+
+    def _merge(self, keys, vectors, missing, embedded) -> List[List[float]]:
+        fresh = dict(zip(missing.keys(), embedded))
+        for key, values in fresh.items():
+            self._store(key, values)
+        return [
+            v.tolist() if v is not None else list(fresh[k])
+            for k, v in zip(keys, vectors)
+        ]
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._key("query", text)
+        vector = self._lookup(key)
+        if vector is not None:
+            return vector.tolist()
+        values = self.underlying.embed_query(text)
+        self._store(key, values)
+        return list(values)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        key = self._key("query", text)
+        vector = self._lookup(key)
+        if vector is not None:
+            return vector.tolist()
+        values = await self.underlying.aembed_query(text)
+        self._store(key, values)
+        return list(values)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, vectors, missing = self._partition(texts)
+        embedded = (
+            self.underlying.embed_documents(list(missing.values())) if missing else []
+        )
+        return self._merge(keys, vectors, missing, embedded)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, vectors, missing = self._partition(texts)
+        embedded = (
+            await self.underlying.aembed_documents(list(missing.values()))
+            if missing
+            else []
+        )
+        return self._merge(keys, vectors, missing, embedded)
+
+    def stats(self) -> dict:
+        return {**self.cache.stats(), "disk_hits": self.disk_hits}
+
+
+def _safe_name(model: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in model)
+
+
+__all__ = ["CachedEmbeddings"]
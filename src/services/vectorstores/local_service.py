@@ -0,0 +1,606 @@
+"""
+NumPy-backed local vector store with the ``PineconeVectorStoreService`` surface.
+
+Vectors live in one contiguous, L2-normalised matrix per namespace, so a query
+(or a batch of queries) is a single matrix multiply followed by an
+``argpartition`` top-k. Storage can be float32, float16 or int8 (symmetric
+per-row scale). Deletes swap the last row into the hole to stay contiguous.
+
+Used as an offline stand-in for Pinecone (benchmarks, local evals) and as a
+low-latency backend for small corpora (VECTOR_STORE_BACKEND=local).
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForRetrieverRun,
+    CallbackManagerForRetrieverRun,
+)
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
+from pydantic import ConfigDict
+
+from src.env import float_env, int_env
+
+DTYPES = ("float32", "float16", "int8")
+
+_INITIAL_CAPACITY = 64
+_UPCAST_BLOCK = 2048
+
+
+def _content_id(doc: Document) -> str:
+    meta = doc.metadata or {}
+    if meta.get("chunk_id"):
+        return str(meta["chunk_id"])
+    raw = f"{meta.get('doc_id') or meta.get('source') or ''}\x00{doc.page_content}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _matches(meta: Mapping[str, Any], flt: Mapping[str, Any]) -> bool:
+    """Evaluate a Pinecone-style metadata filter ($eq/$ne/$in/$nin/$and/$or)."""
+    for field, cond in flt.items():
+        if field == "$and":
+            if not all(_matches(meta, sub) for sub in cond):
+                return False
+            continue
+        if field == "$or":
+            if not any(_matches(meta, sub) for sub in cond):
+                return False
+            continue
+        value = meta.get(field)
+        if not isinstance(cond, Mapping):
+            cond = {"$eq": cond}
+        for op, target in cond.items():
+            if op == "$eq" and value != target:
+                return False
+            if op == "$ne" and value == target:
+                return False
+            if op == "$in" and value not in target:
+                return False
+            if op == "$nin" and value in target:
+                return False
+    return True
+
+
+class LocalVectorIndex:
+    """Contiguous vector matrix plus ids, texts and metadata for one namespace."""
+
+    def __init__(self, dim: Optional[int] = None, *, dtype: str = "float32"):
+        if dtype not in DTYPES:
+            raise ValueError(f"dtype must be one of {DTYPES}, got {dtype!r}")
+        self.dtype = dtype
+        self.dim = dim
+        self._size = 0
+        self._vectors: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None  # int8 only
+        self.ids: List[str] = []
+        self.texts: List[str] = []
+        self.metadatas: List[Dict[str, Any]] = []
+        self._row: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, vector_id: str) -> bool:
+        return vector_id in self._row
+
+    def text_of(self, vector_id: str) -> Optional[str]:
+        row = self._row.get(vector_id)
+        return None if row is None else self.texts[row]
+
+    def update_metadata(self, vector_id: str, metadata: Mapping[str, Any]) -> bool:
+        """Replace the metadata of an existing vector; False if the id is unknown."""
+        row = self._row.get(vector_id)
+        if row is None:
+            return False
+        self.metadatas[row] = dict(metadata)
+        return True
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._size + extra
+        capacity = 0 if self._vectors is None else len(self._vectors)
+        if needed <= capacity:
+            return
+        new_capacity = max(_INITIAL_CAPACITY, capacity * 2, needed)
+        vectors = np.zeros((new_capacity, self.dim), dtype=np.dtype(self.dtype))
+        scales = np.ones(new_capacity, dtype=np.float32)
+        if self._vectors is not None:
+            vectors[: self._size] = self._vectors[: self._size]
+            scales[: self._size] = self._scales[: self._size]
+        self._vectors, self._scales = vectors, scales
+
+    def _encode(self, matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if self.dtype == "int8":
+            scales = np.abs(matrix).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            return np.round(matrix / scales[:, None]).astype(np.int8), scales.astype(
+                np.float32
+            )
+        return matrix.astype(self.dtype), np.ones(len(matrix), dtype=np.float32)
+
+    def upsert(
+        self,
+        ids: Sequence[str],
+        vectors: np.ndarray,
+        texts: Sequence[str],
+        metadatas: Sequence[Mapping[str, Any]],
+    ) -> None:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2 or len(matrix) != len(ids):
+            raise ValueError("vectors must be a (len(ids), dim) matrix")
+        if not len(ids):
+            return
+        if self.dim is None:
+            self.dim = matrix.shape[1]
+        elif matrix.shape[1] != self.dim:
+            raise ValueError(f"expected dimension {self.dim}, got {matrix.shape[1]}")
+        norms = np.linalg.norm(matrix, axis=1)
+        norms[norms == 0] = 1.0
+        encoded, scales = self._encode(matrix / norms[:, None])
+
+        self._reserve(len(ids))
+        for i, vector_id in enumerate(ids):
+            row = self._row.get(vector_id)
+            if row is None:
+                row = self._size
+                self._size += 1
+                self._row[vector_id] = row
+                self.ids.append(vector_id)
+                self.texts.append(texts[i])
+                self.metadatas.append(dict(metadatas[i]))
+            else:
+                self.texts[row] = texts[i]
+                self.metadatas[row] = dict(metadatas[i])
+            self._vectors[row] = encoded[i]
+            self._scales[row] = scales[i]
+
+    def delete(self, ids: Sequence[str]) -> int:
+        removed = 0
+        for vector_id in ids:
+            row = self._row.pop(vector_id, None)
+            if row is None:
+                continue
+            last = self._size - 1
+            if row != last:
+                # Move the last row into the hole to keep the matrix contiguous
+                self._vectors[row] = self._vectors[last]
+                self._scales[row] = self._scales[last]
+                self.ids[row] = self.ids[last]
+                self.texts[row] = self.texts[last]
+                self.metadatas[row] = self.metadatas[last]
+                self._row[self.ids[row]] = row
+            self.ids.pop()
+            self.texts.pop()
+            self.metadatas.pop()
+            self._size -= 1
+            removed += 1
+        return removed
+
+    def ids_where(self, flt: Mapping[str, Any]) -> List[str]:
+        return [i for i, meta in zip(self.ids, self.metadatas) if _matches(meta, flt)]
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int,
+        *,
+        filter: Optional[Mapping[str, Any]] = None,
+    ) -> List[List[Tuple[int, float]]]:
+        """Top-k (row, cosine score) per query row, best first."""
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        if not self._size or k <= 0:
+            return [[] for _ in range(len(queries))]
+        norms = np.linalg.norm(queries, axis=1)
+        norms[norms == 0] = 1.0
+        queries = queries / norms[:, None]
+
+        vectors = self._vectors[: self._size]
+        if self.dtype == "float32":
+            scores = queries @ vectors.T
+        else:
+            # Upcast compact storage block by block so the float32 copy stays
+            # cache-sized instead of materialising the whole matrix per query
+            scores = np.empty((len(queries), self._size), dtype=np.float32)
+            for start in range(0, self._size, _UPCAST_BLOCK):
+                block = vectors[start : start + _UPCAST_BLOCK].astype(np.float32)
+                scores[:, start : start + len(block)] = queries @ block.T
+            if self.dtype == "int8":
+                scores *= self._scales[: self._size]
+
+        if filter:
+            allowed = np.fromiter(
+                (_matches(meta, filter) for meta in self.metadatas),
+                dtype=bool,
+                count=self._size,
+            )
+            scores[:, ~allowed] = -np.inf
+            k = min(k, int(allowed.sum()))
+            if k == 0:
+                return [[] for _ in range(len(queries))]
+        k = min(k, self._size)
+
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for q, rows in enumerate(top):
+            row_scores = scores[q, rows]
+            order = np.argsort(-row_scores, kind="stable")
+            results.append([(int(rows[i]), float(row_scores[i])) for i in order])
+        return results
+
+    def document(self, row: int, score: Optional[float] = None) -> Document:
+        metadata = dict(self.metadatas[row])
+        if score is not None:
+            metadata["score"] = score
+        return Document(id=self.ids[row], page_content=self.texts[row], metadata=metadata)
+
+    def save(self, directory: os.PathLike | str) -> None:
+        target = Path(directory)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{target.name}-", dir=target.parent))
+        try:
+            if self._vectors is not None:
+                np.save(staging / "vectors.npy", self._vectors[: self._size])
+                np.save(staging / "scales.npy", self._scales[: self._size])
+            (staging / "records.json").write_text(
+                json.dumps(
+                    {
+                        "dim": self.dim,
+                        "dtype": self.dtype,
+                        "ids": self.ids,
+                        "texts": self.texts,
+                        "metadatas": self.metadatas,
+                    },
+                    default=str,
+                ),
+                encoding="utf-8",
+            )
+            # Swap directories so readers never observe a half-written index
+            if target.exists():
+                os.replace(target, target.with_name(f".{target.name}-old-{os.getpid()}"))
+            os.replace(staging, target)
+            for old in target.parent.glob(f".{target.name}-old-*"):
+                shutil.rmtree(old, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    @classmethod
+    def load(cls, directory: os.PathLike | str) -> Optional["LocalVectorIndex"]:
+        path = Path(directory)
+        if not path.exists():
+            # A crash between the two renames in save() leaves only the backup
+            backups = sorted(path.parent.glob(f".{path.name}-old-*"))
+            if backups:
+                path = backups[-1]
+        try:
+            records = json.loads((path / "records.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        index = cls(records["dim"], dtype=records["dtype"])
+        index.ids = list(records["ids"])
+        index.texts = list(records["texts"])
+        index.metadatas = list(records["metadatas"])
+        index._row = {vector_id: i for i, vector_id in enumerate(index.ids)}
+        index._size = len(index.ids)
+        if index._size:
+            index._vectors = np.load(path / "vectors.npy")
+            index._scales = np.load(path / "scales.npy")
+        return index
+
+
+class LocalVectorRetriever(BaseRetriever):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    service: Any
+    k: int = 5
+    namespace: Optional[str] = None
+    filter: Optional[Dict[str, Any]] = None
+
+    def _get_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun,
+    ) -> List[Document]:
+        vector = self.service.embedding.embed_query(query)
+        return self.service.search_by_vectors(
+            [vector], k=self.k, namespace=self.namespace, filter=self.filter
+        )[0]
+
+    async def _aget_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: AsyncCallbackManagerForRetrieverRun,
+    ) -> List[Document]:
+        vector = await self.service.embedding.aembed_query(query)
+        return self.service.search_by_vectors(
+            [vector], k=self.k, namespace=self.namespace, filter=self.filter
+        )[0]
+
+
+class LocalVectorStoreService:
+    """
+    Local drop-in for ``PineconeVectorStoreService``.
+
+    - Same ingestion/sync surface (upsert, delete_by_doc_id, snapshots)
+    - Batched matrix-multiply search with metadata filters
+    - Optional persistence of vectors under ``persist_dir`` (one subdirectory
+      per namespace), so a restart does not re-embed the corpus. Mutations
+      only mark a namespace dirty; it is written by :meth:`flush`, or once no
+      mutation has happened for ``persist_delay_seconds`` (``None`` disables
+      the timer). A sync of N documents therefore writes each namespace once
+      instead of N times.
+    """
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        *,
+        dtype: str = "float32",
+        persist_dir: Optional[os.PathLike] = None,
+        persist_delay_seconds: Optional[float] = 2.0,
+    ):
+        self.embedding = embedding
+        self.dtype = dtype
+        self.persist_dir = Path(persist_dir) if persist_dir else None
+        self.persist_delay_seconds = persist_delay_seconds
+        self._lock = threading.RLock()
+        self._indexes: Dict[str, LocalVectorIndex] = {}
+        self._dirty: set = set()
+        self._timer: Optional[threading.Timer] = None
+        if self.persist_dir is not None and self.persist_dir.is_dir():
+            names = set()
+            for child in self.persist_dir.iterdir():
+                if not child.is_dir():
+                    continue
+                if not child.name.startswith("."):
+                    names.add(child.name)
+                elif "-old-" in child.name:
+                    # Only the backup is left if save() stopped between its renames
+                    names.add(child.name[1:].rsplit("-old-", 1)[0])
+            for name in sorted(names):
+                index = LocalVectorIndex.load(self.persist_dir / name)
+                if index is not None:
+                    self._indexes[_namespace_from_dir(name)] = index
+
+    def embedding_cache_stats(self) -> Optional[dict]:
+        stats = getattr(self.embedding, "stats", None)
+        return stats() if callable(stats) else None
+
+    def _index(self, namespace: Optional[str]) -> LocalVectorIndex:
+        ns = "" if namespace is None else namespace
+        index = self._indexes.get(ns)
+        if index is None:
+            index = self._indexes[ns] = LocalVectorIndex(dtype=self.dtype)
+        return index
+
+    def _mark_dirty(self, namespace: Optional[str]) -> None:
+        if self.persist_dir is None:
+            return
+        self._dirty.add("" if namespace is None else namespace)
+        if self.persist_delay_seconds is None:
+            return
+        # Debounce: restart the timer on every mutation
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.persist_delay_seconds, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self) -> None:
+        """Write every namespace changed since the last flush."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self.persist_dir is None:
+                return
+            while self._dirty:
+                ns = self._dirty.pop()
+                try:
+                    self._indexes[ns].save(self.persist_dir / _namespace_dir(ns))
+                except Exception:
+                    self._dirty.add(ns)
+                    raise
+
+    def get_retriever(self, k: int = 5, *, filter: Optional[Dict[str, Any]] = None):
+        return LocalVectorRetriever(service=self, k=k, filter=filter)
+
+    def get_retriever_tool(self):
+        # Imported here: the factory needs app settings, the store itself does not
+        from src.graph.retrievers.factory import create_standard_retriever_tool
+
+        return create_standard_retriever_tool(self.get_retriever())
+
+    def search_by_vectors(
+        self,
+        vectors: Sequence[Sequence[float]],
+        *,
+        k: int = 5,
+        namespace: Optional[str] = None,
+        filter: Optional[Mapping[str, Any]] = None,
+    ) -> List[List[Document]]:
+        """Batched search: one result list per query vector."""
+        with self._lock:
+            index = self._index(namespace)
+            hits = index.search(np.asarray(vectors, dtype=np.float32), k, filter=filter)
+            return [[index.document(row, score) for row, score in run] for run in hits]
+
+    def similarity_search(
+        self, query: str, k: int = 5, *, filter: Optional[Mapping[str, Any]] = None
+    ) -> List[Document]:
+        return self.search_by_vectors(
+            [self.embedding.embed_query(query)], k=k, filter=filter
+        )[0]
+
+    def upsert_documents(
+        self,
+        docs: Sequence,
+        *,
+        ids: Optional[Sequence[str]] = None,
+        namespace: Optional[str] = None,
+    ) -> List[str]:
+        """Add or update documents; unchanged (id, text) pairs are not re-embedded.
+
+        Returns the vector ids, in the order of ``docs``.
+        """
+        docs = list(docs)
+        ids = list(ids) if ids is not None else [_content_id(d) for d in docs]
+        with self._lock:
+            index = self._index(namespace)
+            pending = [
+                (vector_id, doc)
+                for vector_id, doc in zip(ids, docs)
+                if index.text_of(vector_id) != doc.page_content
+            ]
+            unchanged = [
+                (vector_id, doc)
+                for vector_id, doc in zip(ids, docs)
+                if index.text_of(vector_id) == doc.page_content
+            ]
+        if pending:
+            vectors = self.embedding.embed_documents([d.page_content for _, d in pending])
+        with self._lock:
+            index = self._index(namespace)
+            if pending:
+                index.upsert(
+                    [vector_id for vector_id, _ in pending],
+                    np.asarray(vectors, dtype=np.float32),
+                    [d.page_content for _, d in pending],
+                    [d.metadata or {} for _, d in pending],
+                )
+            # Metadata may change without the text changing (e.g. a new etag)
+            for vector_id, doc in unchanged:
+                index.update_metadata(vector_id, doc.metadata or {})
+            self._mark_dirty(namespace)
+        return ids
+
+    def delete_by_ids(self, ids: Sequence[str], *, namespace: Optional[str] = None):
+        with self._lock:
+            self._index(namespace).delete(list(ids))
+            self._mark_dirty(namespace)
+
+    def delete_except(self, ids: Sequence[str], *, namespace: Optional[str] = None) -> int:
+        """Delete every vector whose id is not in ``ids``; returns how many were removed."""
+        keep = set(ids)
+        with self._lock:
+            index = self._index(namespace)
+            removed = index.delete([i for i in index.ids if i not in keep])
+            if removed:
+                self._mark_dirty(namespace)
+        return removed
+
+    def delete_by_doc_id(self, doc_id: str, *, namespace: Optional[str] = None):
+        with self._lock:
+            index = self._index(namespace)
+            index.delete(index.ids_where({"doc_id": doc_id}))
+            self._mark_dirty(namespace)
+
+    def get_vector_counts(
+        self, doc_id: str, etag: Optional[str] = None
+    ) -> Tuple[int, int]:
+        with self._lock:
+            index = self._index(None)
+            count_doc = len(index.ids_where({"doc_id": doc_id}))
+            if etag is None:
+                return count_doc, 0
+            return count_doc, len(index.ids_where({"doc_id": doc_id, "etag": etag}))
+
+    def compute_index_snapshot(
+        self, *, namespace: Optional[str] = None
+    ) -> tuple[set[str], dict[str, int], dict[tuple[str, str], int]]:
+        unique_doc_ids: set[str] = set()
+        doc_id_to_count: dict[str, int] = {}
+        doc_id_etag_to_count: dict[tuple[str, str], int] = {}
+        with self._lock:
+            metadatas = list(self._index(namespace).metadatas)
+        for meta in metadatas:
+            did = meta.get("doc_id")
+            et = meta.get("etag")
+            if isinstance(did, str) and did:
+                unique_doc_ids.add(did)
+                doc_id_to_count[did] = doc_id_to_count.get(did, 0) + 1
+                if isinstance(et, str) and et:
+                    key = (did, et)
+                    doc_id_etag_to_count[key] = doc_id_etag_to_count.get(key, 0) + 1
+        return unique_doc_ids, doc_id_to_count, doc_id_etag_to_count
+
+    def get_all_indexed_doc_ids(self, *, namespace: Optional[str] = None) -> list[str]:
+        unique_doc_ids, _, _ = self.compute_index_snapshot(namespace=namespace)
+        return list(unique_doc_ids)
+
+    def get_sync_status(self, doc_id: str, etag: Optional[str]) -> str:
+        count_doc, count_both = self.get_vector_counts(doc_id, etag)
+        if count_doc == 0:
+            return "not_indexed"
+        if count_both > 0:
+            return "in_sync"
+        return "stale"
+
+
+def _namespace_dir(namespace: str) -> str:
+    return f"ns-{namespace.encode('utf-8').hex()}" if namespace else "default"
+
+
+def _namespace_from_dir(name: str) -> str:
+    if name.startswith("ns-"):
+        return bytes.fromhex(name[3:]).decode("utf-8")
+    return ""
+
+
+_DEFAULT_PERSIST_DIR = Path(__file__).resolve().parents[3] / ".cache" / "vectors"
+
+_service: Optional[LocalVectorStoreService] = None
+
+
+def get_local_vector_service() -> LocalVectorStoreService:
+    global _service
+    if _service is None:
+        from langchain_pinecone import PineconeEmbeddings
+
+        from src.services.vectorstores.cached_embeddings import CachedEmbeddings
+        from src.settings import settings
+
+        print("--- Initializing LocalVectorStoreService ---")
+        _service = LocalVectorStoreService(
+            CachedEmbeddings(
+                PineconeEmbeddings(model=settings.PINECONE_EMBEDDINGS_MODEL),
+                model=settings.PINECONE_EMBEDDINGS_MODEL,
+                maxsize=int_env("EMBEDDING_CACHE_SIZE", 4096),
+                cache_dir=os.getenv("EMBEDDING_CACHE_DIR") or None,
+            ),
+            dtype=os.getenv("LOCAL_VECTOR_DTYPE", "float32"),
+            persist_dir=os.getenv("LOCAL_VECTOR_DIR", str(_DEFAULT_PERSIST_DIR)),
+            persist_delay_seconds=float_env("LOCAL_VECTOR_PERSIST_DELAY_SECONDS", 2),
+        )
+        # Pending changes reach disk even if the debounce timer has not fired
+        atexit.register(_service.flush)
+    return _service
+
+
+def peek_local_vector_service() -> Optional[LocalVectorStoreService]:
+    """Return the local service if it was already built (never triggers a build)."""
+    return _service
+
+
+__all__ = [
+    "DTYPES",
+    "LocalVectorIndex",
+    "LocalVectorRetriever",
+    "LocalVectorStoreService",
+    "get_local_vector_service",
+    "peek_local_vector_service",
+]
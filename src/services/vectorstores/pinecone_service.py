@@ -1,11 +1,14 @@
 from typing import Optional, Sequence, Tuple
 import ast
+import os
 
 from langchain_pinecone import PineconeVectorStore, PineconeEmbeddings
+from src.env import int_env
 from src.graph.retrievers.factory import (
     maybe_wrap_with_compression,
     create_standard_retriever_tool,
 )
+from src.services.vectorstores.cached_embeddings import CachedEmbeddings
 from src.settings import settings
 
 
@@ -20,12 +23,21 @@ class PineconeVectorStoreService:
 
     def __init__(self):
         print("--- Initializing PineconeVectorStoreService ---")
-        self._embedding = PineconeEmbeddings(model=settings.PINECONE_EMBEDDINGS_MODEL)
+        # Repeated questions and unchanged chunks are served from the cache
+        self._embedding = CachedEmbeddings(
+            PineconeEmbeddings(model=settings.PINECONE_EMBEDDINGS_MODEL),
+            model=settings.PINECONE_EMBEDDINGS_MODEL,
+            maxsize=int_env("EMBEDDING_CACHE_SIZE", 4096),
+            cache_dir=os.getenv("EMBEDDING_CACHE_DIR") or None,
+        )
         self._vectorstore = PineconeVectorStore(
             index_name=settings.PINECONE_INDEX,
             embedding=self._embedding,
         )
 
+    def embedding_cache_stats(self) -> dict:
+        return self._embedding.stats()
+
     def _resolve_namespace(self, namespace: Optional[str]) -> str:
         """Normalize namespace to empty-string when None is provided."""
         resolved = "" if namespace is None else namespace
@@ -75,10 +87,22 @@ class PineconeVectorStoreService:
         retriever = self.get_retriever()
         return create_standard_retriever_tool(retriever)
 
-    def upsert_documents(self, docs: Sequence, *, namespace: Optional[str] = None):
-        """Add or update documents in the Pinecone index."""
+    def upsert_documents(
+        self,
+        docs: Sequence,
+        *,
+        ids: Optional[Sequence[str]] = None,
+        namespace: Optional[str] = None,
+    ):
+        """Add or update documents in the Pinecone index.
+
+        Pass ``ids`` (e.g. registry chunk ids) to make re-upserts idempotent.
+        """
         ns = self._resolve_namespace(namespace)
-        self._vectorstore.add_documents(docs, namespace=ns)
+        if ids is not None:
+            self._vectorstore.add_documents(docs, ids=list(ids), namespace=ns)
+        else:
+            self._vectorstore.add_documents(docs, namespace=ns)
 
     def delete_by_ids(self, ids: Sequence[str], *, namespace: Optional[str] = None):
         """Delete vectors by their document IDs."""
@@ -314,3 +338,8 @@ def get_pinecone_service() -> PineconeVectorStoreService:
     if _service is None:
         _service = PineconeVectorStoreService()
     return _service
+
+
+def peek_pinecone_service() -> Optional[PineconeVectorStoreService]:
+    """Return the Pinecone service if it was already built (never triggers a build)."""
+    return _service
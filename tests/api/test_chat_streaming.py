@@ -0,0 +1,164 @@
+import asyncio
+import json
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, ToolMessage
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from src.app.features.chat.metrics import ChatRunMetrics
+from src.app.features.chat.streaming import (
+    STREAM_MODES,
+    encode_part,
+    stream_graph_events,
+    summarize_update,
+)
+
+
+def _parse(frames):
+    events = []
+    for frame in frames:
+        lines = frame.strip().split("\n")
+        event = lines[0][len("event: "):]
+        events.append((event, json.loads(lines[1][len("data: "):])))
+    return events
+
+
+def _graph():
+    model = GenericFakeChatModel(messages=iter([AIMessage(content="hello there world")]))
+
+    async def tools(state):
+        return {
+            "messages": [
+                ToolMessage(content="x" * 10_000, name="retrieve_rag_docs", tool_call_id="1")
+            ]
+        }
+
+    async def generate_answer(state):
+        return {"messages": [await model.ainvoke(state["messages"])]}
+
+    graph = StateGraph(MessagesState)
+    graph.add_node("tools", tools)
+    graph.add_node("generate_answer", generate_answer)
+    graph.add_edge(START, "tools")
+    graph.add_edge("tools", "generate_answer")
+    graph.add_edge("generate_answer", END)
+    return graph.compile()
+
+
+def test_tokens_and_compact_node_events():
+    async def run():
+        frames = []
+        async for mode, chunk in _graph().astream(
+            {"messages": [("user", "hi")]}, stream_mode=STREAM_MODES
+        ):
+            frames.extend(encode_part(mode, chunk))
+        return frames
+
+    frames = asyncio.run(run())
+    events = _parse(frames)
+
+    tokens = [data["text"] for event, data in events if event == "token"]
+    assert len(tokens) > 1
+    assert "".join(tokens) == "hello there world"
+    assert all(data["node"] == "generate_answer" for e, data in events if e == "token")
+
+    nodes = [data for event, data in events if event == "node"]
+    assert [n["node"] for n in nodes] == ["tools", "generate_answer"]
+    assert nodes[0]["messages"] == [
+        {"type": "tool", "name": "retrieve_rag_docs", "status": "success"}
+    ]
+    # Tool output never reaches the wire
+    assert sum(len(f) for f in frames) < 1000
+
+
+def test_summarize_update_keeps_scalars_and_counts():
+    update = {
+        "messages": [AIMessage(content="", tool_calls=[{"name": "t", "args": {}, "id": "1"}])],
+        "blocked_by_guardrail": False,
+        "retrieved_context": ["a", "b"],
+    }
+    assert summarize_update("generate_answer_or_rag", update) == {
+        "node": "generate_answer_or_rag",
+        "messages": [{"type": "ai", "tool_calls": ["t"]}],
+        "blocked_by_guardrail": False,
+        "retrieved_context": {"count": 2},
+    }
+
+
+def test_custom_parts_are_forwarded_as_progress():
+    (frame,) = encode_part("custom", {"stage": "rerank", "ms": 12})
+    assert _parse([frame]) == [("progress", {"stage": "rerank", "ms": 12})]
+
+
+def _slow_graph(state_log):
+    async def slow_node(state):
+        state_log.append("started")
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            state_log.append("cancelled")
+            raise
+        return {}
+
+    graph = StateGraph(MessagesState)
+    graph.add_node("tools", slow_node)
+    graph.add_edge(START, "tools")
+    graph.add_edge("tools", END)
+    return graph.compile()
+
+
+def test_disconnect_cancels_graph_run():
+    log = []
+    metrics = ChatRunMetrics()
+    metrics.record_started()
+    metrics.record_completed(tokens=40)
+
+    async def disconnected():
+        return "started" in log
+
+    async def run():
+        frames = [
+            f
+            async for f in stream_graph_events(
+                _slow_graph(log),
+                {"messages": [("user", "hi")]},
+                {},
+                disconnected,
+                poll_seconds=0.05,
+                metrics=metrics,
+            )
+        ]
+        return frames
+
+    frames = asyncio.run(asyncio.wait_for(run(), 5))
+    assert frames == []
+    assert log == ["started", "cancelled"]
+    snap = metrics.snapshot()
+    assert snap["runs_cancelled"] == 1
+    assert snap["runs_cancelled_before_first_token"] == 1
+    assert snap["estimated_tokens_saved"] == 40
+    assert snap["in_flight"] == 0
+
+
+def test_closing_the_stream_cancels_graph_run():
+    log = []
+    metrics = ChatRunMetrics()
+
+    async def never():
+        return False
+
+    async def run():
+        gen = stream_graph_events(
+            _slow_graph(log), {"messages": [("user", "hi")]}, {}, never, metrics=metrics
+        )
+        task = asyncio.ensure_future(gen.__anext__())
+        while "started" not in log:
+            await asyncio.sleep(0.01)
+        # What the server does when the response task is cancelled
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await gen.aclose()
+
+    asyncio.run(asyncio.wait_for(run(), 5))
+    assert log == ["started", "cancelled"]
+    assert metrics.snapshot()["runs_cancelled"] == 1
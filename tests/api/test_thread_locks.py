@@ -0,0 +1,95 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from src.app.features.chat.thread_locks import ThreadLockRegistry, advisory_key
+
+
+async def _run(registry, thread_id, log, name, delay=0.02):
+    async with registry.hold(thread_id):
+        log.append(("in", name))
+        await asyncio.sleep(delay)
+        log.append(("out", name))
+
+
+def test_same_thread_runs_one_at_a_time():
+    registry = ThreadLockRegistry()
+    log = []
+
+    async def main():
+        await asyncio.gather(*[_run(registry, "t1", log, i) for i in range(3)])
+
+    asyncio.run(main())
+    # No interleaving: every "in" is followed by its own "out"
+    assert [e for e, _ in log] == ["in", "out"] * 3
+    stats = registry.stats()
+    assert stats["acquisitions"] == 3
+    assert stats["contended"] == 2
+    assert stats["max_queue_depth"] == 3
+    assert stats["max_wait_ms"] >= 30
+    assert stats["active_threads"] == 0 and stats["waiting"] == 0
+
+
+def test_different_threads_run_concurrently():
+    registry = ThreadLockRegistry()
+    log = []
+
+    async def main():
+        await asyncio.gather(_run(registry, "a", log, "a"), _run(registry, "b", log, "b"))
+
+    asyncio.run(main())
+    assert [e for e, _ in log] == ["in", "in", "out", "out"]
+    assert registry.stats()["contended"] == 0
+
+
+def test_cancelled_waiter_leaves_queue():
+    registry = ThreadLockRegistry()
+    log = []
+
+    async def main():
+        first = asyncio.create_task(_run(registry, "t", log, 1, delay=0.05))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(_run(registry, "t", log, 2))
+        await asyncio.sleep(0.01)
+        assert registry.queue_depth("t") == 2
+        second.cancel()
+        await asyncio.gather(first, second, return_exceptions=True)
+
+    asyncio.run(main())
+    assert log == [("in", 1), ("out", 1)]
+    assert registry.stats()["waiting"] == 0
+    assert registry.queue_depth("t") == 0
+
+
+def test_advisory_mode_wraps_run_and_survives_failures():
+    events = []
+
+    @asynccontextmanager
+    async def fake_advisory(thread_id):
+        events.append(("lock", thread_id))
+        yield
+        events.append(("unlock", thread_id))
+
+    @asynccontextmanager
+    async def broken_advisory(thread_id):
+        raise OSError("db down")
+        yield
+
+    async def main(registry):
+        async with registry.hold("t"):
+            events.append(("run", "t"))
+
+    asyncio.run(main(ThreadLockRegistry(mode="advisory", advisory_lock=fake_advisory)))
+    assert events == [("lock", "t"), ("run", "t"), ("unlock", "t")]
+
+    events.clear()
+    registry = ThreadLockRegistry(mode="advisory", advisory_lock=broken_advisory)
+    asyncio.run(main(registry))
+    assert events == [("run", "t")]
+    assert registry.stats()["advisory_failures"] == 1
+
+
+def test_advisory_key_is_stable_signed_bigint():
+    key = advisory_key("session-123")
+    assert key == advisory_key("session-123")
+    assert key != advisory_key("session-124")
+    assert -(2**63) <= key < 2**63
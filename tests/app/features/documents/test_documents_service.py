@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from src.app.features.documents import service
+
+
+class FailingVectorStore:
+    def delete_by_doc_id(self, key):
+        raise RuntimeError("pinecone unavailable")
+
+
+class FakeBM25:
+    def __init__(self, etags=None):
+        self.removed = []
+        self.upserted = []
+        self.etags = etags
+
+    def remove_document(self, key):
+        self.removed.append(key)
+
+    def upsert_document(self, key, etag, chunks):
+        self.upserted.append((key, etag))
+
+    def get_indexed_etags(self):
+        return self.etags
+
+
+def test_bm25_removal_runs_when_vector_delete_fails(monkeypatch):
+    bm25 = FakeBM25()
+    bumps = []
+    monkeypatch.setattr(service, "get_vector_store_service", FailingVectorStore)
+    monkeypatch.setattr(service, "peek_bm25_service", lambda: bm25)
+    monkeypatch.setattr(service, "bump_corpus_version", lambda: bumps.append(1))
+
+    with pytest.raises(RuntimeError):
+        service._delete_key_from_pinecone("docs/a.txt")
+
+    assert bm25.removed == ["docs/a.txt"]
+    assert bumps == [1]
+
+
+class InSyncVectorStore:
+    def compute_index_snapshot(self):
+        return {"a.txt", "b.txt"}, {"a.txt": 1, "b.txt": 1}, {
+            ("a.txt", "e1"): 1,
+            ("b.txt", "e2"): 1,
+        }
+
+
+def test_sync_reindexes_only_documents_bm25_holds_at_another_etag(monkeypatch):
+    bm25 = FakeBM25(etags={"a.txt": "e1", "b.txt": "old"})
+    fetched = []
+    monkeypatch.setattr(
+        service,
+        "get_s3_bucket_contents",
+        lambda _bucket: [{"Key": "a.txt", "ETag": '"e1"'}, {"Key": "b.txt", "ETag": '"e2"'}],
+    )
+    monkeypatch.setattr(service, "get_vector_store_service", InSyncVectorStore)
+    monkeypatch.setattr(service, "peek_bm25_service", lambda: bm25)
+    monkeypatch.setattr(service, "bump_corpus_version", lambda: None)
+    monkeypatch.setattr(
+        service,
+        "get_object_bytes_from_s3",
+        lambda _bucket, key: fetched.append(key) or b"some text",
+    )
+    monkeypatch.setattr(service, "split_text", lambda text, doc_id, etag: [text])
+
+    result = asyncio.run(service.sync_documents())
+
+    assert result["synced"] == 2 and result["updated"] == 0
+    assert fetched == ["b.txt"]
+    assert bm25.upserted == [("b.txt", "e2")]
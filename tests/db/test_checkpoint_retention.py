@@ -0,0 +1,90 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from src.db import checkpoint_retention as retention
+from src.db.checkpoint_retention import (
+    PruneResult,
+    RetentionMetrics,
+    RetentionPolicy,
+    prune_checkpoints,
+)
+
+
+class FakeCursor:
+    def __init__(self, rows=None, rowcount=0):
+        self.rows = rows or []
+        self.rowcount = rowcount
+
+    async def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    """Scripted connection: SELECTs pop row batches, DELETEs report 3 rows."""
+
+    def __init__(self, idle_batches, overfull_batches):
+        self.idle_batches = list(idle_batches)
+        self.overfull_batches = list(overfull_batches)
+        self.transactions = []
+        self.deletes = []
+
+    async def execute(self, query, params):
+        if query is retention._SELECT_IDLE_THREADS:
+            return FakeCursor(self.idle_batches.pop(0) if self.idle_batches else [])
+        if query is retention._SELECT_OVERFULL_THREADS:
+            return FakeCursor(self.overfull_batches.pop(0) if self.overfull_batches else [])
+        self.deletes.append((query, params))
+        return FakeCursor(rowcount=3)
+
+    @asynccontextmanager
+    async def transaction(self, force_rollback=False):
+        self.transactions.append(force_rollback)
+        yield
+
+
+def test_prunes_in_batches_until_a_short_batch():
+    conn = FakeConnection(
+        idle_batches=[[("a",), ("b",)], [("c",)]],
+        overfull_batches=[[{"thread_id": "d", "checkpoint_ns": ""}, {"thread_id": "d", "checkpoint_ns": "sub"}], []],
+    )
+    policy = RetentionPolicy(keep_last=5, idle_ttl_seconds=60, batch_size=2)
+    result = asyncio.run(prune_checkpoints(conn, policy))
+
+    # Two idle batches (2 + 1 threads), then one trim batch and an empty probe
+    assert result.threads_deleted == 3
+    assert result.batches == 3
+    assert result.checkpoints_deleted == 3 * 3
+    assert result.rows_deleted == 9 * 3
+    assert conn.transactions == [False] * 4
+    trim_params = [p for q, p in conn.deletes if q is retention._DELETE_OLD_CHECKPOINTS]
+    assert trim_params == [{"threads": ["d"], "keep": 5}]
+
+
+def test_ttl_zero_keeps_idle_threads_and_dry_run_rolls_back():
+    conn = FakeConnection(idle_batches=[[("a",)]], overfull_batches=[])
+    policy = RetentionPolicy(keep_last=5, idle_ttl_seconds=0, batch_size=10)
+    result = asyncio.run(prune_checkpoints(conn, policy, dry_run=True))
+    assert result.threads_deleted == 0
+    assert conn.idle_batches == [[("a",)]]
+    assert conn.transactions[0] is True
+
+
+def test_metrics_accumulate_runs():
+    metrics = RetentionMetrics()
+    metrics.record(PruneResult(checkpoints_deleted=4, blobs_deleted=2, batches=1), {"checkpoints": 8192})
+    metrics.record(PruneResult(writes_deleted=1, batches=1))
+    snap = metrics.snapshot()
+    assert snap["runs"] == 2
+    assert snap["totals"]["rows_deleted"] == 7
+    assert snap["last_run"]["writes_deleted"] == 1
+    assert snap["table_sizes_bytes"] == {"checkpoints": 8192}
+
+
+def test_policy_from_env(monkeypatch):
+    monkeypatch.setenv("CHECKPOINT_KEEP_LAST", "10")
+    monkeypatch.setenv("CHECKPOINT_THREAD_TTL_DAYS", "0.5")
+    monkeypatch.setenv("CHECKPOINT_PRUNE_BATCH_SIZE", "0")
+    policy = RetentionPolicy.from_env()
+    assert policy.keep_last == 10
+    assert policy.idle_ttl_seconds == 43200
+    assert policy.batch_size == 1
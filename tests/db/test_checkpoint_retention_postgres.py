@@ -0,0 +1,145 @@
+"""
+Retention against a real Postgres (``TEST_POSTGRES_URL``, set by
+docker-compose.test.yml). Each test runs in its own schema, so the pruning
+queries only ever see the checkpoints written here.
+"""
+
+import asyncio
+import os
+import uuid
+
+import pytest
+
+psycopg = pytest.importorskip("psycopg")
+from psycopg.conninfo import make_conninfo
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+from langgraph.graph import START, MessagesState, StateGraph
+
+from src.db.checkpoint_retention import RetentionPolicy, prune_checkpoints
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+pytestmark = pytest.mark.skipif(
+    not TEST_POSTGRES_URL, reason="TEST_POSTGRES_URL not set (see docker-compose.test.yml)"
+)
+
+
+def _graph():
+    def answer(state):
+        return {"messages": [AIMessage(content=f"answer {len(state['messages'])}")]}
+
+    graph = StateGraph(MessagesState)
+    graph.add_node("answer", answer)
+    graph.add_edge(START, "answer")
+    return graph
+
+
+async def _run(test):
+    schema = f"retention_{uuid.uuid4().hex[:12]}"
+    admin = await psycopg.AsyncConnection.connect(TEST_POSTGRES_URL, autocommit=True)
+    await admin.execute(f"CREATE SCHEMA {schema}")
+    conninfo = make_conninfo(TEST_POSTGRES_URL, options=f"-c search_path={schema}")
+    try:
+        async with AsyncPostgresSaver.from_conn_string(conninfo) as saver:
+            await saver.setup()
+            async with await psycopg.AsyncConnection.connect(
+                conninfo, autocommit=True
+            ) as conn:
+                await test(saver, conn)
+    finally:
+        await admin.execute(f"DROP SCHEMA {schema} CASCADE")
+        await admin.close()
+
+
+async def _chat(saver, thread_id: str, turns: int) -> dict:
+    app = _graph().compile(checkpointer=saver)
+    config = {"configurable": {"thread_id": thread_id}}
+    for i in range(turns):
+        await app.ainvoke({"messages": [HumanMessage(content=f"question {i}")]}, config)
+    return config
+
+
+async def _message_counts(saver, config) -> dict:
+    """checkpoint_id -> number of messages restored from that checkpoint."""
+    counts = {}
+    async for item in saver.alist(config):
+        loaded = await saver.aget_tuple(
+            {
+                "configurable": {
+                    **config["configurable"],
+                    "checkpoint_ns": "",
+                    "checkpoint_id": item.checkpoint["id"],
+                }
+            }
+        )
+        counts[item.checkpoint["id"]] = len(
+            loaded.checkpoint["channel_values"].get("messages", [])
+        )
+    return counts
+
+
+async def _count(conn, table: str, thread_id: str) -> int:
+    cur = await conn.execute(f"SELECT count(*) FROM {table} WHERE thread_id = %s", (thread_id,))
+    return (await cur.fetchone())[0]
+
+
+def test_keep_last_prunes_old_checkpoints_and_kept_ones_still_load():
+    async def test(saver, conn):
+        config = await _chat(saver, "busy", turns=4)
+        before = await _message_counts(saver, config)
+        blobs_before = await _count(conn, "checkpoint_blobs", "busy")
+        assert len(before) > 3
+
+        policy = RetentionPolicy(keep_last=3, idle_ttl_seconds=0, batch_size=10)
+        dry = await prune_checkpoints(conn, policy, dry_run=True)
+        assert dry.checkpoints_deleted == len(before) - 3
+        assert await _count(conn, "checkpoints", "busy") == len(before)
+
+        result = await prune_checkpoints(conn, policy)
+        assert result.checkpoints_deleted == len(before) - 3
+        assert result.blobs_deleted > 0
+        assert await _count(conn, "checkpoint_blobs", "busy") < blobs_before
+
+        after = await _message_counts(saver, config)
+        # The newest three survive, and each restores exactly the messages it had
+        newest = sorted(before, reverse=True)[:3]
+        assert sorted(after) == sorted(newest)
+        assert after == {cid: before[cid] for cid in newest}
+        latest = await saver.aget_tuple(config)
+        assert len(latest.checkpoint["channel_values"]["messages"]) == 8
+
+        # The thread keeps working after pruning
+        await _chat(saver, "busy", turns=1)
+        latest = await saver.aget_tuple(config)
+        assert len(latest.checkpoint["channel_values"]["messages"]) == 10
+
+        # Nothing left to prune beyond the new turn's checkpoints
+        await prune_checkpoints(conn, policy)
+        assert await _count(conn, "checkpoints", "busy") == 3
+
+    asyncio.run(_run(test))
+
+
+def test_idle_threads_are_deleted_entirely():
+    async def test(saver, conn):
+        await _chat(saver, "idle", turns=2)
+        active = await _chat(saver, "active", turns=2)
+        active_before = await _message_counts(saver, active)
+        await conn.execute(
+            """
+            UPDATE checkpoints
+            SET checkpoint = jsonb_set(checkpoint, '{ts}', '"2000-01-01T00:00:00+00:00"')
+            WHERE thread_id = 'idle'
+            """
+        )
+
+        policy = RetentionPolicy(keep_last=100, idle_ttl_seconds=86400, batch_size=10)
+        result = await prune_checkpoints(conn, policy)
+
+        assert result.threads_deleted == 1
+        for table in ("checkpoints", "checkpoint_blobs", "checkpoint_writes"):
+            assert await _count(conn, table, "idle") == 0
+        assert await _message_counts(saver, active) == active_before
+
+    asyncio.run(_run(test))
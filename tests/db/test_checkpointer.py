@@ -0,0 +1,70 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from psycopg_pool import AsyncConnectionPool
+
+from src.db.checkpointer import (
+    PooledAsyncPostgresSaver,
+    checkpointer_pool_stats,
+    get_checkpoint_pool_settings,
+)
+
+
+class FakeConnection:
+    @asynccontextmanager
+    async def cursor(self, **kwargs):
+        yield object()
+
+
+class FakePool(AsyncConnectionPool):
+    def __init__(self):
+        super().__init__("", min_size=0, max_size=4, open=False)
+        self.active = 0
+        self.peak = 0
+
+    @asynccontextmanager
+    async def connection(self, timeout=None):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            yield FakeConnection()
+        finally:
+            self.active -= 1
+
+
+def test_pooled_saver_does_not_serialize_cursors():
+    async def main():
+        pool = FakePool()
+        saver = PooledAsyncPostgresSaver(conn=pool)
+
+        async def use():
+            async with saver._cursor() as cur:
+                assert cur is not None
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*[use() for _ in range(4)])
+        return pool.peak
+
+    assert asyncio.run(main()) == 4
+
+
+def test_pool_settings_from_env(monkeypatch):
+    monkeypatch.setenv("CHECKPOINT_POOL_MIN_SIZE", "5")
+    monkeypatch.setenv("CHECKPOINT_POOL_MAX_SIZE", "3")
+    monkeypatch.setenv("CHECKPOINT_POOL_CHECK", "false")
+    settings = get_checkpoint_pool_settings()
+    # max is never below min
+    assert settings["min_size"] == 5 and settings["max_size"] == 5
+    assert settings["check"] is False
+
+
+def test_pool_stats_report_utilization():
+    class StubPool:
+        max_size = 10
+
+        def get_stats(self):
+            return {"pool_size": 6, "pool_available": 2, "requests_waiting": 0}
+
+    stats = checkpointer_pool_stats(StubPool())
+    assert stats["in_use"] == 4
+    assert stats["utilization"] == 0.4
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.graph.guardrails.batching import GuardrailBatcher
+
+
+class RecordingClassifier:
+    def __init__(self, delay=0.0):
+        self.calls = []
+        self.threads = set()
+        self.delay = delay
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        return ["bad" not in t for t in texts]
+
+
+def test_concurrent_texts_share_one_classifier_call_off_loop():
+    classifier = RecordingClassifier()
+    batcher = GuardrailBatcher(classifier, max_batch_size=8, max_wait_ms=20)
+
+    async def main():
+        return await asyncio.gather(*[batcher.classify(f"text {i}") for i in range(5)])
+
+    verdicts = asyncio.run(main())
+    assert verdicts == [True] * 5
+    assert classifier.calls == [[f"text {i}" for i in range(5)]]
+    assert classifier.threads and all(n.startswith("guardrail") for n in classifier.threads)
+    stats = batcher.stats()
+    assert stats["batches"] == 1 and stats["avg_batch_size"] == 5
+
+
+def test_batches_are_capped_and_full_batches_do_not_wait():
+    classifier = RecordingClassifier()
+    batcher = GuardrailBatcher(classifier, max_batch_size=2, max_wait_ms=10_000)
+
+    async def main():
+        texts = ["a", "bad b", "c", "d"]
+        return await asyncio.wait_for(
+            asyncio.gather(*[batcher.classify(t) for t in texts]), 5
+        )
+
+    assert asyncio.run(main()) == [True, False, True, True]
+    assert [len(c) for c in classifier.calls] == [2, 2]
+    assert batcher.stats()["max_batch_size"] == 2
+
+
+def test_errors_reach_every_caller_in_the_batch():
+    def broken(texts):
+        raise RuntimeError("model not loaded")
+
+    batcher = GuardrailBatcher(broken, max_wait_ms=1)
+
+    async def main():
+        return await asyncio.gather(
+            batcher.classify("x"), batcher.classify("y"), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert batcher.stats()["errors"] == 1
+
+
+def test_cancelled_callers_are_skipped():
+    classifier = RecordingClassifier()
+    batcher = GuardrailBatcher(classifier, max_wait_ms=20)
+
+    async def main():
+        gone = asyncio.ensure_future(batcher.classify("gone"))
+        kept = asyncio.ensure_future(batcher.classify("kept"))
+        await asyncio.sleep(0)
+        gone.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await gone
+        return await kept
+
+    assert asyncio.run(main()) is True
+    assert classifier.calls == [["kept"]]
+
+
+def test_unclassified_texts_stay_none():
+    batcher = GuardrailBatcher(lambda texts: [True, None], max_wait_ms=20)
+
+    async def main():
+        return await asyncio.gather(batcher.classify("ok"), batcher.classify("broken"))
+
+    assert asyncio.run(main()) == [True, None]
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+topic_restriction = pytest.importorskip("src.graph.guardrails.topic_restriction")
+
+from guardrails.errors import ValidationError
+from langchain_core.messages import HumanMessage
+
+from src.graph.guardrails.batching import GuardrailBatcher
+from src.graph.guardrails.verdict_cache import GuardrailVerdictCache
+from src.services.cache.ttl_lru import TTLLRUCache
+
+TEXTS = [
+    "Is my graphics card compatible with this motherboard?",
+    "Where is my order? It has not arrived yet",
+    "Can I return a product I bought last week?",
+    "What is the best recipe for lasagna?",
+    "Explain how the human heart pumps blood",
+    "Hello there",
+]
+
+
+def test_batched_verdicts_match_unbatched_ones():
+    unbatched = [topic_restriction._validate_one(text) for text in TEXTS]
+    batcher = GuardrailBatcher(
+        topic_restriction.classify_topics, max_batch_size=len(TEXTS), max_wait_ms=50
+    )
+
+    async def main():
+        return await asyncio.gather(*[batcher.classify(text) for text in TEXTS])
+
+    assert asyncio.run(main()) == unbatched
+    assert batcher.stats()["batches"] == 1
+
+
+class FakeGuard:
+    def validate(self, text):
+        if "broken" in text:
+            raise RuntimeError("model not loaded")
+        if "lasagna" in text:
+            raise ValidationError("No valid topic was found.")
+
+
+def test_validation_errors_block_and_failures_are_not_cached(monkeypatch):
+    monkeypatch.setattr(topic_restriction, "_guard", FakeGuard())
+    assert topic_restriction.classify_topics(["gpu", "lasagna", "broken"]) == [
+        True,
+        False,
+        None,
+    ]
+
+    cache = GuardrailVerdictCache(TTLLRUCache(maxsize=8), "v1")
+    monkeypatch.setattr(topic_restriction, "_verdict_cache", cache)
+    monkeypatch.setattr(topic_restriction, "_batcher", None)
+    monkeypatch.setattr(topic_restriction, "lexical_fast_path_enabled", lambda: False)
+
+    def run(text):
+        state = {"messages": [HumanMessage(content=text)]}
+        return asyncio.run(topic_restriction.topic_guardrail(state))
+
+    assert run("lasagna please") == {"blocked_by_guardrail": True}
+    assert cache.get("lasagna please") is False
+    assert run("broken again") == {"blocked_by_guardrail": True}
+    assert cache.get("broken again") is None
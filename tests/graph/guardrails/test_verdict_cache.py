@@ -0,0 +1,48 @@
+from src.graph.guardrails.verdict_cache import GuardrailVerdictCache, guardrail_version
+from src.services.cache.ttl_lru import TTLLRUCache
+
+
+def test_normalized_text_hits_and_misses_are_counted():
+    cache = GuardrailVerdictCache(TTLLRUCache(maxsize=8), "v1")
+    assert cache.get("Hello!") is None
+    cache.set("Hello!", True)
+    cache.set("buy me a sandwich", False)
+    assert cache.get("  hello  ") is True
+    assert cache.get("Buy me a   sandwich?") is False
+    stats = cache.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 1
+    assert stats["hit_rate"] == round(2 / 3, 4)
+
+
+def test_version_changes_with_topics_or_threshold():
+    base = guardrail_version(["orders", "warranty"], [], 0.5, "mnli")
+    assert base == guardrail_version(["warranty", "orders"], [], 0.5, "mnli")
+    assert base != guardrail_version(["orders"], [], 0.5, "mnli")
+    assert base != guardrail_version(["orders", "warranty"], [], 0.6, "mnli")
+    assert base != guardrail_version(["orders", "warranty"], ["politics"], 0.5, "mnli")
+    assert base != guardrail_version(["orders", "warranty"], [], 0.5, "other-mnli")
+
+    shared = TTLLRUCache(maxsize=8)
+    GuardrailVerdictCache(shared, base).set("hi", True)
+    assert GuardrailVerdictCache(shared, "other").get("hi") is None
+
+
+def test_failed_checks_are_not_stored():
+    cache = GuardrailVerdictCache(TTLLRUCache(maxsize=8), "v1")
+    cache.set("hi", None)
+    assert cache.get("hi") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_disabled_cache_never_stores():
+    cache = GuardrailVerdictCache(TTLLRUCache(maxsize=0), "v1")
+    cache.set("hi", True)
+    assert cache.get("hi") is None
+
+
+def test_expired_verdicts_are_reclassified():
+    now = [0.0]
+    cache = GuardrailVerdictCache(TTLLRUCache(maxsize=8, ttl_seconds=10, clock=lambda: now[0]), "v1")
+    cache.set("hi", True)
+    now[0] = 11
+    assert cache.get("hi") is None
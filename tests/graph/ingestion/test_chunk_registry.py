@@ -0,0 +1,68 @@
+import re
+
+from src.graph.ingestion.chunk_registry import chunk_text, make_chunk_id
+from src.graph.retrievers.fusion import chunk_key
+
+
+TEXT = "alpha beta gamma delta epsilon zeta eta theta iota kappa lambda mu"
+
+
+class WordEncoding:
+    """Stand-in for a tiktoken encoding (no download): one token per word."""
+
+    def __init__(self):
+        self.encoded = 0
+
+    def encode(self, text, disallowed_special=()):
+        self.encoded += 1
+        self.tokens = re.findall(r"\s*\S+", text)
+        return list(range(len(self.tokens)))
+
+    def decode_with_offsets(self, ids):
+        offsets, position = [], 0
+        for i in ids:
+            offsets.append(position)
+            position += len(self.tokens[i])
+        return "".join(self.tokens[i] for i in ids), offsets
+
+
+def _chunks(encoding=None):
+    return chunk_text(
+        TEXT,
+        "docs/a.txt",
+        "e1",
+        chunk_size=5,
+        chunk_overlap=2,
+        encoding=encoding or WordEncoding(),
+    )
+
+
+def test_chunk_records_carry_ids_offsets_and_token_counts():
+    encoding = WordEncoding()
+    records = _chunks(encoding)
+
+    assert [r.chunk_number for r in records] == list(range(1, len(records) + 1))
+    for r in records:
+        assert TEXT[r.start : r.end] == r.text
+        assert r.token_count == len(r.text.split())
+        assert r.chunk_id == make_chunk_id("docs/a.txt", "e1", r.chunk_number)
+    # 12 tokens in windows of 5 that overlap by 2
+    assert [r.text.split()[0] for r in records] == ["alpha", "delta", "eta", "kappa"]
+    assert [r.token_count for r in records] == [5, 5, 5, 3]
+    assert records[0].text.split()[-2:] == records[1].text.split()[:2]
+    # The text is tokenized once, not again per chunk
+    assert encoding.encoded == 1
+
+
+def test_empty_text_has_no_chunks():
+    assert chunk_text("", "docs/a.txt", "e1", encoding=WordEncoding()) == []
+    assert chunk_text("  \n ", "docs/a.txt", "e1", encoding=WordEncoding()) == []
+
+
+def test_documents_fed_to_both_legs_fuse_as_one_chunk():
+    records = _chunks()
+    dense = records[0].to_document()
+    sparse = records[0].to_document()
+    assert dense.metadata["chunk_id"] == make_chunk_id("docs/a.txt", "e1", 1)
+    assert chunk_key(dense) == chunk_key(sparse)
+    assert chunk_key(dense) != chunk_key(records[1].to_document())
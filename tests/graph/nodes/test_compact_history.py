@@ -0,0 +1,87 @@
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from src.graph.nodes.compact_history import STUB_PREFIX, compact_messages
+
+
+def words(text: str) -> int:
+    return len(text.split())
+
+
+def make_thread(turns: int, tool_words: int = 200):
+    messages = [SystemMessage(content="be nice", id="sys")]
+    for i in range(turns):
+        messages += [
+            HumanMessage(content=f"question {i}", id=f"h{i}"),
+            AIMessage(
+                content="",
+                id=f"call{i}",
+                tool_calls=[{"name": "retrieve_rag_docs", "args": {}, "id": f"t{i}"}],
+            ),
+            ToolMessage(
+                content="ctx " * tool_words,
+                id=f"tool{i}",
+                tool_call_id=f"t{i}",
+                name="retrieve_rag_docs",
+            ),
+            AIMessage(content=f"answer {i}", id=f"a{i}"),
+        ]
+    # Current turn: question only, tools not called yet
+    messages.append(HumanMessage(content="latest", id="now"))
+    return messages
+
+
+def compact(messages, **kwargs):
+    options = {"max_turns": 8, "max_tokens": 100_000, "keep_tool_turns": 1}
+    options.update(kwargs)
+    return compact_messages(messages, counter=words, **options)
+
+
+def test_old_tool_outputs_are_stubbed_in_the_copy_only():
+    messages = make_thread(3)
+    original = [m.model_copy() for m in messages]
+    result = compact(messages)
+    assert [m.id for m in result] == [m.id for m in messages]
+    tools = [m for m in result if isinstance(m, ToolMessage)]
+    assert all(t.content.startswith(STUB_PREFIX) for t in tools)
+    assert tools[0].tool_call_id == "t0" and tools[0].name == "retrieve_rag_docs"
+    # The thread's own messages are untouched
+    assert messages == original
+    # Compacting again is a no-op
+    assert compact(result) == result
+
+
+def test_rolling_window_drops_whole_turns_and_keeps_system():
+    messages = make_thread(5)
+    result = compact(messages, max_turns=3, keep_tool_turns=3)
+    ids = [m.id for m in result]
+    assert ids[0] == "sys"
+    assert "h2" not in ids and "tool2" not in ids
+    assert ids[1:] == ["h3", "call3", "tool3", "a3", "h4", "call4", "tool4", "a4", "now"]
+    # Recent tool outputs within keep_tool_turns stay intact
+    assert not result[3].content.startswith(STUB_PREFIX)
+
+
+def test_token_budget_bounds_history_but_keeps_current_turn():
+    messages = make_thread(6, tool_words=500)
+    result = compact(messages, max_tokens=60, keep_tool_turns=10)
+    assert [m.id for m in result] == ["sys", "now"]
+
+    result = compact(messages, max_tokens=60)
+    # With old tool outputs stubbed, several turns fit the same budget
+    kept = [m.id for m in result if isinstance(m, HumanMessage)]
+    assert kept[-1] == "now" and len(kept) > 1
+
+
+def test_only_the_kept_window_is_tokenized():
+    calls = []
+
+    def counting(text):
+        calls.append(text)
+        return words(text)
+
+    messages = make_thread(200)
+    result = compact_messages(
+        messages, max_turns=3, max_tokens=100_000, keep_tool_turns=1, counter=counting
+    )
+    assert [m.id for m in result if isinstance(m, HumanMessage)] == ["h198", "h199", "now"]
+    # Only the three kept turns are costed, not all 201
+    assert len(calls) < 3 * 5
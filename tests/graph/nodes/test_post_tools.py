@@ -0,0 +1,36 @@
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from src.graph.nodes.extract_context import extract_context
+from src.graph.nodes.post_tools import post_tools
+from src.graph.routing.source_router import source_router
+
+
+def _turn(question, tool_name, content, i):
+    return [
+        HumanMessage(content=question),
+        AIMessage(content="", tool_calls=[{"name": tool_name, "args": {}, "id": f"t{i}"}]),
+        ToolMessage(content=content, name=tool_name, tool_call_id=f"t{i}"),
+    ]
+
+
+def test_post_tools_matches_separate_nodes_on_a_single_turn():
+    state = {"messages": _turn("What is your warranty policy?", "retrieve_rag_docs", "2 years", 0)}
+    assert post_tools(state) == {**extract_context(state), **source_router(state)}
+    assert post_tools(state)["docs_importance"] == "high"
+
+
+def test_post_tools_only_uses_current_turn():
+    messages = _turn("list categories", "list_product_categories", "gpus, cpus", 0)
+    messages.append(AIMessage(content="We sell gpus and cpus."))
+    messages += _turn("how do I reseat my gpu?", "retrieve_rag_docs", "unplug first", 1)
+
+    update = post_tools({"messages": messages})
+    assert update["current_question"] == "how do I reseat my gpu?"
+    # The separate nodes would also have picked up the earlier turn's output
+    assert extract_context({"messages": messages})["retrieved_context"] == [
+        "unplug first",
+        "gpus, cpus",
+    ]
+    assert update["retrieved_context"] == ["unplug first"]
+    assert update["source_docs"] is True
+    assert update["source_db"] is False
@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.tools import tool
+
+from src.graph.nodes.tool_node import tool_node
+
+
+@tool
+async def slow_docs(query: str) -> str:
+    """Slow retrieval stand-in."""
+    await asyncio.sleep(0.2)
+    return f"docs for {query}"
+
+
+@tool
+async def slow_products(query: str) -> list:
+    """Slow product query stand-in."""
+    await asyncio.sleep(0.2)
+    return [{"name": query}]
+
+
+@tool
+async def hangs(query: str) -> str:
+    """Never finishes in time."""
+    await asyncio.sleep(5)
+    return "late"
+
+
+def _state(*calls):
+    ai = AIMessage(
+        content="",
+        tool_calls=[{"name": n, "args": {"query": q}, "id": i} for n, q, i in calls],
+    )
+    return {"messages": [HumanMessage(content="hi"), ai]}
+
+
+def test_tool_calls_run_concurrently_in_call_order():
+    run = tool_node([slow_docs, slow_products])
+    state = _state(("slow_products", "gpu", "b"), ("slow_docs", "refunds", "a"), ("unknown", "x", "c"))
+
+    start = time.perf_counter()
+    out = asyncio.run(run(state))
+    elapsed = time.perf_counter() - start
+
+    tool_msgs = out["messages"]
+    assert elapsed < 0.35
+    assert [m.tool_call_id for m in tool_msgs] == ["b", "a"]
+    assert tool_msgs[0].content == '[{"name": "gpu"}]'
+    assert tool_msgs[1].response_metadata["latency_ms"] >= 200
+
+
+def test_timeouts_and_concurrency_limit():
+    run = tool_node([slow_docs, hangs], max_concurrency=1, timeouts={"hangs": 0.05})
+    state = _state(("hangs", "x", "h"), ("slow_docs", "a", "d1"), ("slow_docs", "b", "d2"))
+
+    start = time.perf_counter()
+    out = asyncio.run(run(state))
+    elapsed = time.perf_counter() - start
+
+    timed_out, first, second = out["messages"]
+    assert timed_out.status == "error" and "timed out" in timed_out.content
+    assert first.content == "docs for a" and second.content == "docs for b"
+    # One at a time: the two slow calls are serialised
+    assert elapsed >= 0.4
+
+
+def test_returns_only_new_named_tool_messages_for_long_threads():
+    from langgraph.graph import END, START, StateGraph
+
+    from src.graph.routing.source_router import source_router
+    from src.graph.state import CustomMessagesState
+
+    history = []
+    for i in range(300):
+        history.append(HumanMessage(content=f"q{i}", id=f"h{i}"))
+        history.append(AIMessage(content=f"a{i}", id=f"a{i}"))
+    state = _state(("slow_docs", "refunds", "t1"))
+    state["messages"] = history + state["messages"]
+
+    update = asyncio.run(tool_node([slow_docs])(state))
+
+    (msg,) = update["messages"]
+    assert msg.name == "slow_docs" and msg.tool_call_id == "t1"
+
+    graph = StateGraph(CustomMessagesState)
+    graph.add_node("tools", tool_node([slow_docs]))
+    graph.add_edge(START, "tools")
+    graph.add_edge("tools", END)
+    out = asyncio.run(graph.compile().ainvoke(state))
+    assert len(out["messages"]) == len(state["messages"]) + 1
+
+    assert asyncio.run(tool_node([])({"messages": [HumanMessage(content="x")]})) == {}
+    # A retrieve_rag_docs result is detectable by name
+    rag_state = {"messages": [*state["messages"], msg.model_copy(update={"name": "retrieve_rag_docs"})]}
+    assert source_router(rag_state)["source_docs"] is True
@@ -0,0 +1,87 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+import voyageai
+from langchain_core.documents import Document
+
+from src.graph.retrievers import batch_voyage_compressor as mod
+from src.graph.retrievers.batch_voyage_compressor import BatchVoyageCompressor
+
+
+@pytest.fixture(autouse=True)
+def _fresh_rerank_cache(monkeypatch):
+    monkeypatch.setattr(mod, "_rerank_cache", None)
+
+
+class _FakeSyncClient:
+    def __init__(self):
+        self.calls = 0
+
+    def rerank(self, *, query, documents, model, top_k):
+        self.calls += 1
+        results = [SimpleNamespace(index=i, relevance_score=1.0 - i / 10) for i in (1, 0)]
+        return SimpleNamespace(results=results[:top_k])
+
+
+class _FakeAsyncClient:
+    def __init__(self):
+        self.sessions = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def rerank(self, *, query, documents, model, top_k):
+        self.sessions.add(id(voyageai.aiosession.get()))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        results = [SimpleNamespace(index=i, relevance_score=1.0 - i / 10) for i in (1, 0)]
+        return SimpleNamespace(results=results[:top_k])
+
+
+def test_async_rerank_shares_session_and_limits_concurrency(monkeypatch):
+    monkeypatch.setenv("VOYAGE_RERANK_MAX_CONCURRENCY", "2")
+    compressor = BatchVoyageCompressor(voyage_api_key="test", top_k=2)
+    fake = _FakeAsyncClient()
+    compressor._async_client = fake
+    docs = [Document(page_content="a", metadata={"n": 0}), Document(page_content="b", metadata={"n": 1})]
+
+    async def run():
+        try:
+            return await asyncio.gather(
+                *(compressor.acompress_documents(docs, "q") for _ in range(6))
+            )
+        finally:
+            await mod.aclose_voyage_sessions()
+
+    results = asyncio.run(run())
+
+    assert fake.max_in_flight == 2
+    assert len(fake.sessions) == 1 and id(None) not in fake.sessions
+    first = results[0]
+    assert [d.metadata["n"] for d in first] == [1, 0]
+    assert first[0].metadata["voyage_relevance_score"] == 0.9
+    assert voyageai.aiosession.get() is None
+
+
+def test_rerank_cache_hits_normalized_query_and_misses_on_resynced_chunk():
+    compressor = BatchVoyageCompressor(voyage_api_key="test", top_k=2)
+    fake = _FakeSyncClient()
+    compressor._client = fake
+    docs = [
+        Document(page_content="a", metadata={"doc_id": "x", "etag": "1", "chunk_number": 1}),
+        Document(page_content="b", metadata={"doc_id": "y", "etag": "1", "chunk_number": 1}),
+    ]
+
+    first = compressor.compress_documents(docs, "What is your return policy?")
+    # Same candidates in another order and a trivially different query: cache hit
+    again = compressor.compress_documents(docs[::-1], "  what is your RETURN policy ")
+    assert fake.calls == 1
+    assert [d.page_content for d in again] == [d.page_content for d in first]
+    assert again[0].metadata["voyage_relevance_score"] == 0.9
+
+    resynced = [docs[0], Document(page_content="b", metadata={**docs[1].metadata, "etag": "2"})]
+    compressor.compress_documents(resynced, "what is your return policy")
+    assert fake.calls == 2
+    assert mod.get_rerank_cache().stats()["hits"] == 1
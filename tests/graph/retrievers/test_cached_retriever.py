@@ -0,0 +1,61 @@
+from typing import List
+
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from src.graph.retrievers.cached import CachedRetriever
+from src.services.cache.ttl_lru import TTLLRUCache
+from src.services.corpus_version import bump_corpus_version
+
+
+class _CountingRetriever(BaseRetriever):
+    calls: int = 0
+
+    def _get_relevant_documents(self, query, *, run_manager) -> List[Document]:
+        self.calls += 1
+        return [Document(page_content=f"answer {self.calls}", metadata={"n": self.calls})]
+
+
+def test_cache_hits_normalized_query_until_corpus_changes():
+    inner = _CountingRetriever()
+    cache = TTLLRUCache(maxsize=8)
+    retriever = CachedRetriever(retriever=inner, cache=cache, params=("k", 5))
+
+    first = retriever.invoke("What is your return policy?")
+    first[0].metadata["mutated"] = True
+    second = retriever.invoke("what is your  return policy")
+
+    assert inner.calls == 1
+    assert second[0].metadata == {"n": 1}
+
+    bump_corpus_version()
+    third = retriever.invoke("what is your return policy")
+
+    assert inner.calls == 2 and third[0].metadata == {"n": 2}
+    assert cache.stats()["hits"] == 1
+
+
+class _RerankingRetriever(BaseRetriever):
+    calls: int = 0
+    fail: bool = True
+
+    def _get_relevant_documents(self, query, *, run_manager) -> List[Document]:
+        self.calls += 1
+        if self.fail:
+            # Reranker fallback: candidates without a rerank score
+            return [Document(page_content="unranked", metadata={})]
+        return [Document(page_content="ranked", metadata={"voyage_relevance_score": 0.9})]
+
+
+def test_reranker_fallback_results_are_not_cached():
+    inner = _RerankingRetriever()
+    retriever = CachedRetriever(retriever=inner, cache=TTLLRUCache(maxsize=8), reranked=True)
+
+    retriever.invoke("gpu drivers")
+    retriever.invoke("gpu drivers")
+    assert inner.calls == 2
+
+    inner.fail = False
+    retriever.invoke("gpu drivers")
+    assert retriever.invoke("gpu drivers")[0].page_content == "ranked"
+    assert inner.calls == 3
@@ -0,0 +1,74 @@
+from langchain_core.documents import Document
+
+from src.graph.retrievers.fusion import chunk_key, weighted_rrf
+
+
+def _chunk(doc_id: str, n: int, etag: str = "e1", text: str = None) -> Document:
+    return Document(
+        page_content=text or f"{doc_id}#{n}",
+        metadata={"doc_id": doc_id, "etag": etag, "chunk_number": n},
+    )
+
+
+def test_chunks_of_same_object_keep_separate_slots():
+    dense = [_chunk("policy.txt", 1), _chunk("policy.txt", 2)]
+    sparse = [_chunk("policy.txt", 3), _chunk("policy.txt", 1)]
+
+    fused = weighted_rrf([dense, sparse])
+
+    # Three distinct chunks survive; the one found by both legs ranks first
+    assert [d.metadata["chunk_number"] for d in fused] == [1, 3, 2]
+
+
+def test_chunk_key_distinguishes_etag_and_falls_back_to_content_hash():
+    assert chunk_key(_chunk("a", 1, etag="v1")) != chunk_key(_chunk("a", 1, etag="v2"))
+
+    no_ids_a = Document(page_content="same text", metadata={"source": "s3://b/a"})
+    no_ids_b = Document(page_content="same text", metadata={"source": "s3://b/a"})
+    other = Document(page_content="other text", metadata={"source": "s3://b/a"})
+    assert chunk_key(no_ids_a) == chunk_key(no_ids_b)
+    assert chunk_key(no_ids_a) != chunk_key(other)
+
+
+def test_weights_and_limit():
+    dense = [_chunk("d", 1), _chunk("d", 2)]
+    sparse = [_chunk("s", 1), _chunk("s", 2)]
+
+    # Heavier sparse weight puts the sparse leg first
+    fused = weighted_rrf([dense, sparse], weights=[1.0, 2.0])
+    assert [d.metadata["doc_id"] for d in fused] == ["s", "s", "d", "d"]
+
+    # Zero weight drops a leg entirely; limit caps the output
+    assert weighted_rrf([dense, sparse], weights=[1.0, 0.0], limit=1) == [dense[0]]
+
+
+def test_ties_keep_first_seen_order():
+    dense = [_chunk("a", 1)]
+    sparse = [_chunk("b", 1)]
+
+    fused = weighted_rrf([dense, sparse], k=10)
+
+    assert [d.metadata["doc_id"] for d in fused] == ["a", "b"]
+
+
+def test_legacy_vectors_without_chunk_id_fuse_with_sparse_chunks():
+    # Vectors ingested before chunk ids existed (Pinecone returns numbers as floats)
+    dense = [
+        Document(
+            page_content="warranty text",
+            metadata={"doc_id": "policy.txt", "etag": "e1", "chunk_number": 2.0},
+        )
+    ]
+    sparse = [
+        Document(
+            page_content="warranty text",
+            metadata={
+                "chunk_id": "abc123",
+                "doc_id": "policy.txt",
+                "etag": "e1",
+                "chunk_number": 2,
+            },
+        )
+    ]
+    assert chunk_key(dense[0]) == chunk_key(sparse[0])
+    assert len(weighted_rrf([dense, sparse])) == 1
@@ -0,0 +1,47 @@
+import time
+from typing import List
+
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from langchain.retrievers.document_compressors.base import BaseDocumentCompressor
+
+from src.graph.retrievers.hybrid import CustomHybridRetriever
+from src.graph.retrievers.timing_tracker import start_query_tracking, timing_tracker
+
+
+class _SlowRetriever(BaseRetriever):
+    name: str
+    delay: float = 0.2
+
+    def _get_relevant_documents(self, query, *, run_manager) -> List[Document]:
+        time.sleep(self.delay)
+        return [
+            Document(
+                page_content=f"{self.name} hit",
+                metadata={"chunk_id": self.name},
+            )
+        ]
+
+
+class _Passthrough(BaseDocumentCompressor):
+    def compress_documents(self, documents, query, callbacks=None):
+        return list(documents)
+
+
+def test_sync_legs_run_concurrently_and_are_timed():
+    retriever = CustomHybridRetriever(
+        dense_retriever=_SlowRetriever(name="dense"),
+        sparse_retriever=_SlowRetriever(name="sparse"),
+        compressor=_Passthrough(),
+    )
+    start_query_tracking("q")
+
+    start = time.perf_counter()
+    docs = retriever.invoke("q")
+    elapsed = time.perf_counter() - start
+
+    assert {d.metadata["chunk_id"] for d in docs} == {"dense", "sparse"}
+    assert elapsed < 0.35
+    legs = {t["component"]: t for t in timing_tracker.timings if t["type"] == "timing"}
+    assert legs["dense_retriever"]["metadata"] == {"num_docs": 1}
+    assert legs["sparse_retriever"]["duration"] >= 0.2
@@ -0,0 +1,40 @@
+import asyncio
+import time
+from typing import List
+
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from src.graph.retrievers import provider
+from src.graph.retrievers.lazy import LazyRetriever
+
+
+class _StaticRetriever(BaseRetriever):
+    def _get_relevant_documents(self, query, *, run_manager) -> List[Document]:
+        return [Document(page_content=query)]
+
+
+def _slow(value):
+    def build():
+        time.sleep(0.2)
+        return value
+
+    return build
+
+
+def test_warmup_builds_components_concurrently_and_lazy_tool_uses_it(monkeypatch):
+    monkeypatch.setattr(provider, "_retriever", None)
+    monkeypatch.setattr(provider, "_build_dense", _slow(_StaticRetriever()))
+    monkeypatch.setattr(provider, "_build_sparse", _slow(None))  # dense-only fallback
+    monkeypatch.setattr(provider, "_build_compressor", _slow(None))
+    lazy = LazyRetriever(
+        factory=provider.get_hybrid_retriever, is_ready=provider.is_retriever_ready
+    )
+    assert not provider.is_retriever_ready()
+
+    timings = asyncio.run(provider.warmup_retrieval_stack())
+
+    assert set(timings) == {"dense", "sparse", "compressor", "total"}
+    assert timings["total"] < 0.5
+    assert provider.is_retriever_ready()
+    assert lazy.invoke("gpu")[0].page_content == "gpu"
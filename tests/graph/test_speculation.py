@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from src.graph.speculation import SpeculationMetrics, speculate
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_accepted_run_overlaps_and_records_saved_latency():
+    metrics = SpeculationMetrics()
+
+    async def check():
+        await asyncio.sleep(0.05)
+        return {"blocked": False}
+
+    async def call():
+        await asyncio.sleep(0.05)
+        return "answer"
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        result = await speculate(check, call, lambda v: not v["blocked"], metrics=metrics)
+        return result, loop.time() - started
+
+    (verdict, answer), elapsed = _run(main())
+    assert verdict == {"blocked": False} and answer == "answer"
+    assert elapsed < 0.09
+    snapshot = metrics.snapshot()
+    assert snapshot["accepted"] == 1 and snapshot["wasted_calls"] == 0
+    assert snapshot["latency_saved_ms_avg"] > 30
+
+
+def test_rejected_run_cancels_in_flight_call():
+    metrics = SpeculationMetrics()
+    state = {"finished": False, "cancelled": False}
+
+    async def check():
+        await asyncio.sleep(0.01)
+        return {"blocked": True}
+
+    async def call():
+        try:
+            await asyncio.sleep(1)
+            state["finished"] = True
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+
+    verdict, answer = _run(speculate(check, call, lambda v: not v["blocked"], metrics=metrics))
+    assert answer is None and verdict == {"blocked": True}
+    assert state == {"finished": False, "cancelled": True}
+    snapshot = metrics.snapshot()
+    assert snapshot["wasted_calls"] == 1 and snapshot["wasted_calls_cancelled"] == 1
+    assert snapshot["wasted_rate"] == 1.0
+
+
+def test_speculative_error_ignored_when_rejected_raised_when_accepted():
+    metrics = SpeculationMetrics()
+
+    async def failing():
+        raise RuntimeError("model down")
+
+    async def blocked():
+        await asyncio.sleep(0.01)
+        return False
+
+    async def allowed():
+        await asyncio.sleep(0.01)
+        return True
+
+    assert _run(speculate(blocked, failing, bool, metrics=metrics)) == (False, None)
+    assert metrics.snapshot()["wasted_calls_cancelled"] == 0
+    with pytest.raises(RuntimeError):
+        _run(speculate(allowed, failing, bool, metrics=metrics))
+
+
+def test_check_failure_cancels_speculative_call():
+    cancelled = []
+
+    async def check():
+        await asyncio.sleep(0.01)
+        raise ValueError("guardrail")
+
+    async def call():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    with pytest.raises(ValueError):
+        _run(speculate(check, call, bool, metrics=SpeculationMetrics()))
+    assert cancelled == [True]
@@ -54,49 +54,51 @@ def test_create_in_memory_retriever_tool_happy_path(monkeypatch):
         pass
 
     class FakeVectorStore:
-        def __init__(self, docs, embedding):
-            self.docs = docs
+        def __init__(self, embedding, persist_dir=None):
             self.embedding = embedding
+            self.persist_dir = persist_dir
+            self.docs = []
 
-        @classmethod
-        def from_documents(cls, documents, embedding):
-            return cls(documents, embedding)
+        def upsert_documents(self, docs):
+            self.docs.extend(docs)
+            return [str(i) for i in range(len(docs))]
 
-        def as_retriever(self, search_kwargs=None):
-            return SimpleNamespace(invoke=lambda _q: [fake_doc])
+        def delete_except(self, ids):
+            self.kept = list(ids)
+            return 0
 
-    # Stub reranker to return a simple identity compressor
-    class FakeReranker:
-        def __init__(self, *args, **kwargs):
+        def flush(self):
             pass
 
-    # Fake contextual compression retriever that just stores inputs
-    class FakeCCR:
-        def __init__(self, base_compressor, base_retriever):
-            self.base_compressor = base_compressor
-            self.base_retriever = base_retriever
+        def get_retriever(self, k=5):
+            return SimpleNamespace(invoke=lambda _q: self.docs[:k])
+
+    # Fake compression wrapper that just stores its input
+    def fake_maybe_wrap_with_compression(base_retriever):
+        return SimpleNamespace(base_retriever=base_retriever)
 
     # Capture the tool creation args
-    created = {"name": None, "description": None, "retriever": None}
+    created = {"retriever": None}
 
-    def fake_create_retriever_tool(retriever, name, description):
-        created["name"] = name
-        created["description"] = description
+    def fake_create_standard_retriever_tool(retriever):
         created["retriever"] = retriever
-        return SimpleNamespace(name=name, description=description, retriever=retriever)
+        return SimpleNamespace(name="retrieve_rag_docs", retriever=retriever)
 
     monkeypatch.setattr(mod, "OpenAIEmbeddings", FakeEmbeddings, raising=True)
-    monkeypatch.setattr(mod, "InMemoryVectorStore", FakeVectorStore, raising=True)
-    monkeypatch.setattr(mod, "VoyageAIRerank", FakeReranker, raising=True)
-    monkeypatch.setattr(mod, "ContextualCompressionRetriever", FakeCCR, raising=True)
+    monkeypatch.setattr(mod, "LocalVectorStoreService", FakeVectorStore, raising=True)
+    monkeypatch.setattr(
+        mod, "maybe_wrap_with_compression", fake_maybe_wrap_with_compression, raising=True
+    )
     monkeypatch.setattr(
-        mod, "create_retriever_tool", fake_create_retriever_tool, raising=True
+        mod,
+        "create_standard_retriever_tool",
+        fake_create_standard_retriever_tool,
+        raising=True,
     )
 
     tool, retriever = mod.create_in_memory_retriever_tool()
 
     assert tool.name == "retrieve_rag_docs"
-    assert "Search Aetherix Dynamics" in tool.description
-    assert created["retriever"] is not None
+    assert created["retriever"] is retriever
     # sanity check retriever behavior
     assert retriever.base_retriever.invoke("q")[0] is fake_doc
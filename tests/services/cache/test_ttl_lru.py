@@ -0,0 +1,32 @@
+from src.services.cache.ttl_lru import TTLLRUCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction_ttl_expiry_and_counters():
+    clock = _Clock()
+    cache = TTLLRUCache(maxsize=2, ttl_seconds=10, clock=clock)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" becomes most recent
+    cache.set("c", 3)  # evicts "b"
+    assert cache.get("b") is None
+
+    clock.now = 11
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["expirations"]) == (1, 2, 1, 1)
+
+
+def test_zero_size_disables_cache():
+    cache = TTLLRUCache(maxsize=0)
+    cache.set("a", 1)
+    assert not cache.enabled and cache.get("a") is None and len(cache) == 0
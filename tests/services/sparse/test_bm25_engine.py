@@ -0,0 +1,86 @@
+import math
+
+from langchain_core.documents import Document
+
+from src.services.sparse.bm25_engine import BM25Index, BM25SparseRetriever
+
+
+DOCS = [
+    Document(page_content="Return policy: 30 days for unopened items.", metadata={"doc_id": "policy"}),
+    Document(page_content="GPU installation guide. Seat the GPU firmly.", metadata={"doc_id": "gpu"}),
+    Document(page_content="PSU wattage calculator for your build.", metadata={"doc_id": "psu"}),
+]
+
+
+def _reference_scores(texts, query, k1=1.5, b=0.75):
+    """Straightforward per-chunk BM25 used as an oracle."""
+    tokenized = [t.lower().replace(".", " ").replace(":", " ").split() for t in texts]
+    n = len(tokenized)
+    avgdl = sum(len(t) for t in tokenized) / n
+    scores = []
+    for tokens in tokenized:
+        score = 0.0
+        for term in query.lower().split():
+            df = sum(1 for t in tokenized if term in t)
+            if not df:
+                continue
+            idf = math.log1p((n - df + 0.5) / (df + 0.5))
+            tf = tokens.count(term)
+            score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(tokens) / avgdl))
+        scores.append(score)
+    return scores
+
+
+def test_scores_match_reference_bm25():
+    index = BM25Index.from_documents(DOCS)
+    query = "gpu return policy"
+
+    got = index.get_scores(query)
+    expected = _reference_scores([d.page_content for d in DOCS], query)
+
+    assert [round(float(x), 5) for x in got] == [round(x, 5) for x in expected]
+
+
+def test_search_orders_by_score_and_skips_non_matching_chunks():
+    index = BM25Index.from_documents(DOCS)
+
+    hits = index.search("GPU", k=3)
+
+    assert [i for i, _ in hits] == [1]
+    assert index.search("unknown words", k=3) == []
+
+
+def test_retriever_returns_documents_with_metadata():
+    index = BM25Index.from_documents(DOCS)
+    retriever = BM25SparseRetriever(index=index, k=2)
+
+    docs = retriever.invoke("psu build")
+
+    assert docs[0].metadata == {"doc_id": "psu"}
+    assert docs[0].page_content.startswith("PSU wattage")
+
+
+def test_incremental_updates_match_full_rebuild():
+    index = BM25Index.from_documents(DOCS)
+    added = Document(page_content="GPU fan warranty: two years.", metadata={"doc_id": "warranty"})
+
+    index.add_documents([added])
+    index.remove_by_doc_id("psu")
+    expected = _reference_scores(
+        [DOCS[0].page_content, DOCS[1].page_content, added.page_content], "gpu warranty"
+    )
+
+    slots = index.num_base + index.num_delta
+    live = [i for i in range(slots) if index.get_document(i).metadata["doc_id"] != "psu"]
+    assert [round(float(index.get_scores("gpu warranty")[i]), 5) for i in live] == [
+        round(x, 5) for x in expected
+    ]
+    assert index.search("psu build", k=3) == []
+
+    index.compact()
+
+    assert not index.has_pending_changes and len(index) == 3
+    assert [round(float(x), 5) for x in index.get_scores("gpu warranty")] == [
+        round(x, 5) for x in expected
+    ]
+    assert index.search_documents("warranty", k=1)[0].metadata == {"doc_id": "warranty"}
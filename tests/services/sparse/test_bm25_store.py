@@ -0,0 +1,33 @@
+import numpy as np
+from langchain_core.documents import Document
+
+from src.services.sparse.bm25_engine import BM25Index
+from src.services.sparse.bm25_store import load_index, save_index
+
+
+DOCS = [
+    Document(page_content="Warranty covers GPU fans for two years.", metadata={"doc_id": "warranty"}),
+    Document(page_content="Café returns: refunds within 30 días.", metadata={"doc_id": "returns"}),
+]
+
+
+def test_round_trip_is_memory_mapped_and_scores_identically(tmp_path):
+    index = BM25Index.from_documents(DOCS)
+    save_index(index, tmp_path / "bm25", source_manifest={"warranty": "e1"})
+
+    loaded = load_index(tmp_path / "bm25", expected_source_manifest={"warranty": "e1"})
+
+    assert isinstance(loaded.postings_docs, np.memmap)
+    assert np.allclose(loaded.get_scores("gpu refunds"), index.get_scores("gpu refunds"))
+    hit = loaded.get_document(loaded.search("días", k=1)[0][0])
+    assert hit.page_content == DOCS[1].page_content
+    assert hit.metadata == {"doc_id": "returns"}
+
+
+def test_changed_manifest_requires_rebuild(tmp_path):
+    save_index(BM25Index.from_documents(DOCS), tmp_path / "bm25", source_manifest={"a": "1"})
+
+    assert load_index(tmp_path / "bm25", expected_source_manifest={"a": "2"}) is None
+    assert load_index(tmp_path / "missing") is None
+    # Without an expected manifest the persisted index is served as-is
+    assert load_index(tmp_path / "bm25") is not None
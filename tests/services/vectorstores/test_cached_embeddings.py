@@ -0,0 +1,42 @@
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.services.vectorstores.cached_embeddings import CachedEmbeddings
+
+
+class _CountingEmbeddings(Embeddings):
+    def __init__(self):
+        self.query_calls = 0
+        self.document_texts = []
+
+    def embed_query(self, text):
+        self.query_calls += 1
+        return [float(len(text)), 1.0]
+
+    def embed_documents(self, texts):
+        self.document_texts.extend(texts)
+        return [[float(len(t)), 0.0] for t in texts]
+
+
+def test_query_and_documents_are_cached_separately_and_batched():
+    inner = _CountingEmbeddings()
+    cached = CachedEmbeddings(inner, model="m")
+
+    assert cached.embed_query("refunds") == cached.embed_query("refunds") == [7.0, 1.0]
+    assert inner.query_calls == 1
+
+    # Same text as a document uses the passage encoding, not the query one
+    assert cached.embed_documents(["refunds", "gpu", "gpu"]) == [[7.0, 0.0], [3.0, 0.0], [3.0, 0.0]]
+    cached.embed_documents(["gpu", "psu"])
+    assert inner.document_texts == ["refunds", "gpu", "psu"]
+
+
+def test_disk_cache_survives_new_instance(tmp_path):
+    CachedEmbeddings(_CountingEmbeddings(), model="org/model", cache_dir=tmp_path).embed_query("hi")
+    inner = _CountingEmbeddings()
+    reloaded = CachedEmbeddings(inner, model="org/model", cache_dir=tmp_path)
+
+    assert reloaded.embed_query("hi") == [2.0, 1.0]
+    assert inner.query_calls == 0 and reloaded.disk_hits == 1
+    (stored,) = (tmp_path / "org_model").glob("*.npy")
+    assert np.load(stored).dtype == np.float32
@@ -0,0 +1,155 @@
+import os
+import time
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from src.services.vectorstores.local_service import LocalVectorIndex, LocalVectorStoreService
+
+TOPICS = ["refund", "gpu", "psu", "shipping"]
+
+
+class _KeywordEmbeddings(Embeddings):
+    """One dimension per topic keyword; counts documents embedded."""
+
+    def __init__(self):
+        self.embedded = 0
+
+    def _vec(self, text):
+        return [float(text.lower().count(t)) + 0.01 for t in TOPICS]
+
+    def embed_documents(self, texts):
+        self.embedded += len(texts)
+        return [self._vec(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._vec(text)
+
+
+def _doc(text, doc_id, etag="e1"):
+    return Document(page_content=text, metadata={"doc_id": doc_id, "etag": etag})
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16", "int8"])
+def test_search_ranks_by_cosine_and_applies_filters(dtype):
+    index = LocalVectorIndex(dtype=dtype)
+    vectors = np.array([[1, 0, 0], [0.9, 0.1, 0], [0, 1, 0]], dtype=np.float32)
+    index.upsert(["a", "b", "c"], vectors, ["A", "B", "C"], [{"k": 1}, {"k": 2}, {"k": 1}])
+
+    (hits,) = index.search(np.array([[1, 0, 0]]), k=2)
+    assert [index.ids[row] for row, _ in hits] == ["a", "b"]
+    (filtered,) = index.search(np.array([[1, 0, 0]]), k=3, filter={"k": {"$ne": 1}})
+    assert [index.ids[row] for row, _ in filtered] == ["b"]
+
+
+def test_service_mirrors_pinecone_surface_and_persists(tmp_path):
+    emb = _KeywordEmbeddings()
+    service = LocalVectorStoreService(emb, persist_dir=tmp_path, persist_delay_seconds=None)
+    service.upsert_documents(
+        [_doc("refund policy", "policy"), _doc("gpu install gpu", "gpu"), _doc("psu sizing", "psu")]
+    )
+    # Same texts again: nothing is re-embedded, metadata still updated
+    service.upsert_documents([_doc("refund policy", "policy", etag="e2")])
+    assert emb.embedded == 3
+    assert service.get_sync_status("policy", "e2") == "in_sync"
+
+    service.delete_by_doc_id("psu")
+    doc_ids, counts, _ = service.compute_index_snapshot()
+    assert doc_ids == {"policy", "gpu"} and counts == {"policy": 1, "gpu": 1}
+    service.flush()
+
+    reloaded = LocalVectorStoreService(_KeywordEmbeddings(), persist_dir=tmp_path)
+    docs = reloaded.get_retriever(k=1).invoke("GPU help")
+    assert docs[0].metadata["doc_id"] == "gpu"
+    assert set(reloaded.get_all_indexed_doc_ids()) == {"policy", "gpu"}
+
+
+def test_update_metadata_only_touches_known_ids():
+    index = LocalVectorIndex()
+    index.upsert(["a"], np.array([[1.0, 0.0]]), ["A"], [{"etag": "e1"}])
+    assert index.update_metadata("a", {"etag": "e2"})
+    assert not index.update_metadata("missing", {"etag": "e2"})
+    assert index.metadatas == [{"etag": "e2"}] and len(index) == 1
+
+
+def test_delete_except_drops_vectors_no_longer_loaded(tmp_path):
+    emb = _KeywordEmbeddings()
+    service = LocalVectorStoreService(emb, persist_dir=tmp_path, persist_delay_seconds=None)
+    service.upsert_documents([_doc("gpu guide", "gpu"), _doc("psu guide", "psu")])
+    service.flush()
+
+    # Next run: the psu file was removed and the gpu file edited
+    rerun = LocalVectorStoreService(emb, persist_dir=tmp_path, persist_delay_seconds=None)
+    ids = rerun.upsert_documents([_doc("gpu guide, revised", "gpu")])
+    assert rerun.delete_except(ids) == 2
+    assert rerun.delete_except(ids) == 0
+    docs = rerun.get_retriever(k=5).invoke("gpu")
+    assert [d.page_content for d in docs] == ["gpu guide, revised"]
+
+
+def test_mutations_are_persisted_once_per_flush(tmp_path, monkeypatch):
+    saves = []
+    original_save = LocalVectorIndex.save
+    monkeypatch.setattr(
+        LocalVectorIndex,
+        "save",
+        lambda self, directory: (saves.append(directory), original_save(self, directory)),
+    )
+    service = LocalVectorStoreService(
+        _KeywordEmbeddings(), persist_dir=tmp_path, persist_delay_seconds=None
+    )
+    for i in range(5):
+        service.upsert_documents([_doc(f"gpu doc {i}", f"d{i}")])
+    service.delete_by_doc_id("d0")
+    assert saves == [] and not any(tmp_path.iterdir())
+
+    service.flush()
+    service.flush()
+    assert len(saves) == 1
+    reloaded = LocalVectorStoreService(_KeywordEmbeddings(), persist_dir=tmp_path)
+    assert len(reloaded.get_all_indexed_doc_ids()) == 4
+
+
+def test_debounced_flush_writes_after_quiet_period(tmp_path):
+    service = LocalVectorStoreService(
+        _KeywordEmbeddings(), persist_dir=tmp_path, persist_delay_seconds=0.05
+    )
+    service.upsert_documents([_doc("gpu doc", "gpu")])
+    deadline = time.monotonic() + 2
+    # Wait for the installed index, not the staging directory written before it
+    while not (tmp_path / "default").exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    reloaded = LocalVectorStoreService(_KeywordEmbeddings(), persist_dir=tmp_path)
+    assert reloaded.get_all_indexed_doc_ids() == ["gpu"]
+
+
+def test_failed_swap_keeps_the_previous_index(tmp_path, monkeypatch):
+    target = tmp_path / "default"
+    index = LocalVectorIndex(dtype="float32")
+    index.upsert(["a"], np.eye(2)[:1], ["first"], [{}])
+    index.save(target)
+
+    index.upsert(["b"], np.eye(2)[1:], ["second"], [{}])
+    real_replace = os.replace
+
+    def crash_on_install(src, dst):
+        if str(dst) == str(target):
+            raise OSError("disk full")
+        real_replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", crash_on_install)
+    with pytest.raises(OSError):
+        index.save(target)
+    monkeypatch.setattr(os, "replace", real_replace)
+
+    # The old index was moved aside, not deleted, and is still what loads
+    assert not target.exists()
+    assert LocalVectorIndex.load(target).ids == ["a"]
+    service = LocalVectorStoreService(_KeywordEmbeddings(), persist_dir=tmp_path)
+    assert service._index(None).ids == ["a"]
+
+    index.save(target)
+    assert LocalVectorIndex.load(target).ids == ["a", "b"]
+    assert [p.name for p in tmp_path.iterdir()] == ["default"]
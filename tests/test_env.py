@@ -0,0 +1,23 @@
+from src.env import bool_env, float_env, int_env
+
+
+def test_env_helpers_parse_values(monkeypatch):
+    monkeypatch.setenv("SOME_INT", "12")
+    monkeypatch.setenv("SOME_FLOAT", "0.25")
+    monkeypatch.setenv("SOME_FLAG", " Yes ")
+    assert int_env("SOME_INT", 3) == 12
+    assert float_env("SOME_FLOAT", 1.0) == 0.25
+    assert bool_env("SOME_FLAG", False) is True
+    monkeypatch.setenv("SOME_FLAG", "off")
+    assert bool_env("SOME_FLAG", True) is False
+
+
+def test_env_helpers_fall_back_to_default(monkeypatch):
+    monkeypatch.delenv("SOME_INT", raising=False)
+    monkeypatch.delenv("SOME_FLAG", raising=False)
+    monkeypatch.setenv("SOME_FLOAT", "soon")
+    assert int_env("SOME_INT", 3) == 3
+    assert float_env("SOME_FLOAT", 1.0) == 1.0
+    assert bool_env("SOME_FLAG", True) is True
+    monkeypatch.setenv("SOME_INT", "")
+    assert int_env("SOME_INT", 3) == 3